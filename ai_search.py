@@ -2,6 +2,16 @@ import subprocess
 import json
 import glob
 import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+
+import db
+import scraper
+from ai_workers import TIMEOUT_ERROR
 
 CLAUDE_BINARY_PATTERN = os.path.expanduser(
     "~/.vscode/extensions/anthropic.claude-code-*/resources/native-binary/claude"
@@ -53,19 +63,251 @@ JSON_SCHEMA = json.dumps({
 })
 
 
+# 질의 캐시 (QueryCache). None이면 항상 CLI를 호출한다. app.py가 설정한다.
+query_cache = None
+# 미리 띄워 둔 CLI 프로세스 풀 (ai_workers.InterpreterPool). None이면 질의마다 CLI를 새로 실행한다.
+interpreter_pool = None
+
+# CLI 한 번의 제한 시간 (초)
+CLI_TIMEOUT = 30
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """캐시 키용 질의 정규화: NFKC(한글 자모 조합 포함), 소문자, 문장부호/기호 → 공백, 공백 접기.
+
+    "서울  환경 봉사!", "서울 환경 봉사" 는 같은 키가 된다.
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = "".join(" " if unicodedata.category(ch)[0] in "PS" else ch for ch in text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class QueryCache:
+    """정규화한 질의 → 검색 파라미터 캐시. 메모리 LRU(max_memory개) 뒤에 SQLite(ai_query_cache)가 있다.
+
+    ttl이 지난 항목은 없는 것으로 본다. 쓰기는 풀의 쓰기 스레드로 보내고 기다리지 않는다.
+    """
+
+    def __init__(self, pool, ttl=timedelta(days=7), max_memory=256):
+        self.pool = pool
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self._memory = OrderedDict()   # 키 -> (파라미터, 저장 시각)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, query):
+        key = normalize_query(query)
+        oldest = datetime.now() - self.ttl
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] >= oldest:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return dict(entry[0])
+                del self._memory[key]
+
+        with self.pool.read() as conn:
+            row = db.get_ai_query(conn, key, oldest.isoformat())
+        with self._lock:
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            params, created_at = row
+            self.stats["db_hits"] += 1
+            self._remember(key, params, datetime.fromisoformat(created_at))
+        return dict(params)
+
+    def put(self, query, params):
+        key = normalize_query(query)
+        now = datetime.now()
+        params = dict(params)   # 호출한 쪽이 나중에 고쳐도 캐시에는 영향이 없게
+        with self._lock:
+            self._remember(key, params, now)
+            self.stats["stores"] += 1
+        self.pool.submit(db.put_ai_query, key, query, params, now.isoformat())
+
+    def _remember(self, key, params, created_at):
+        # _lock 안에서 호출
+        self._memory[key] = (params, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def purge(self, expired_only=False):
+        """캐시를 비운다. expired_only면 ttl이 지난 항목만. DB에서 지운 개수를 반환."""
+        oldest = datetime.now() - self.ttl
+        with self._lock:
+            if expired_only:
+                for key in [k for k, (_, at) in self._memory.items() if at < oldest]:
+                    del self._memory[key]
+            else:
+                self._memory.clear()
+        return self.pool.write(db.purge_ai_queries, oldest.isoformat() if expired_only else None)
+
+    def snapshot(self):
+        with self.pool.read() as conn:
+            stored = db.count_ai_queries(conn)
+        with self._lock:
+            return dict(self.stats, memory_entries=len(self._memory), db_entries=stored,
+                        ttl_days=self.ttl.total_seconds() / 86400)
+
+
+# --- 로컬 해석기 ---
+# 지역/분야/대상/활동구분만 말한 질의는 사전으로 바로 풀고 CLI를 부르지 않는다.
+
+# 이 값 이상이면 로컬 해석 결과를 그대로 쓴다
+LOCAL_CONFIDENCE = 0.8
+# CLI가 실패했을 때 이 값 이상인 로컬 결과만 대신 쓴다 (충돌은 0.3이라 제외)
+FALLBACK_CONFIDENCE = 0.5
+
+# 코드표 이름을 "·"로 나눈 조각 외에 자주 쓰는 말
+CATEGORY_ALIASES = {
+    "환경": "0800", "생태": "0800", "환경보호": "0800", "플로깅": "0800", "쓰레기": "0800",
+    "학습": "0400", "공부": "0400", "멘토": "0300", "상담": "0300",
+    "병원": "0500", "의료": "0500", "보건": "0500", "헌혈": "0500",
+    "집수리": "0200", "주거": "0200", "사무": "0900", "행정": "0900",
+    "방범": "1000", "순찰": "1000", "안전": "1000",
+    "재난": "1200", "재해": "1200", "해외": "1300", "국제": "1300", "기본교육": "1700",
+}
+TARGET_ALIASES = {
+    "어린이": "1", "아이들": "1", "청소년": "1", "아동": "1",
+    "장애": "2", "어르신": "3", "노인": "3", "독거노인": "3", "다문화": "5", "고향": "9",
+}
+ACTIVITY_TYPE_ALIASES = {
+    "온라인": "1", "비대면": "1", "재택": "1",
+    "오프라인": "2", "대면": "2",
+    "온오프라인": "3", "온오프": "3",
+}
+STATUS_ALIASES = {
+    "모집중": "0", "모집중인": "0", "모집완료": "1", "마감": "1", "마감된": "1", "전체": "3",
+}
+
+# 검색 조건이 아닌 말. 남아도 해석에 영향이 없다.
+_FILLERS = {
+    "봉사", "자원봉사", "봉사활동", "활동", "봉사처", "하는", "할", "수", "있는", "곳", "데", "것",
+    "찾아", "찾아줘", "찾기", "알려줘", "보여줘", "추천", "추천해줘", "관련", "관련된", "위한",
+    "대상", "분야", "지역", "싶어", "싶은", "하고", "하고싶어", "모집", "중", "프로그램", "근처", "주변",
+}
+# 말끝에 붙는 조사 (긴 것부터)
+_PARTICLES = sorted(["에서", "에게", "으로", "이랑", "하고", "로", "에", "의", "을", "를",
+                     "은", "는", "이", "가", "와", "과", "도", "만", "랑"], key=len, reverse=True)
+
+
+def _code_pieces(codes, skip=()):
+    # "상담·멘토링" → 상담, 멘토링 (정규화하면 "·"가 공백이 되므로 조각 단위로 맞춘다)
+    terms = {}
+    for code, name in codes.items():
+        for piece in re.split(r"[·+/\s]", name):
+            if len(piece) >= 2 and piece not in skip:
+                terms[piece] = code
+    return terms
+
+
+def _build_terms():
+    regions = {normalize_query(name): code for code, name in scraper.REGION_CODES.items()}
+    regions.update(scraper.REGION_ALIASES)
+    # "환경"은 분야로, "기타"는 어느 쪽인지 알 수 없어 뺀다. "보호"는 너무 흔하다.
+    categories = dict(_code_pieces(scraper.CATEGORY_CODES, skip={"기타", "보호"}), **CATEGORY_ALIASES)
+    targets = dict(_code_pieces(scraper.TARGET_CODES, skip={"기타", "환경"}), **TARGET_ALIASES)
+    terms = {}
+    for field, table in (("region", regions), ("category", categories), ("target", targets),
+                         ("activity_type", ACTIVITY_TYPE_ALIASES), ("status", STATUS_ALIASES)):
+        for term, code in table.items():
+            terms.setdefault(term, (field, code))
+    return terms
+
+
+_TERMS = _build_terms()
+# 긴 말부터 비교해야 "주거환경"이 "환경"으로, "온오프라인"이 "온라인"으로 잘리지 않는다
+_TERM_RE = re.compile("|".join(re.escape(t) for t in sorted(_TERMS, key=len, reverse=True)))
+
+
+def _strip_particle(word):
+    for particle in _PARTICLES:
+        if word.endswith(particle) and len(word) > len(particle):
+            return word[:-len(particle)]
+    return word
+
+
+def _is_filler(piece):
+    return not piece or piece in _FILLERS or piece in _PARTICLES or _strip_particle(piece) in _FILLERS
+
+
+def interpret_locally(query):
+    """사전과 별칭으로 질의를 해석한다 → (parse_natural_query와 같은 모양의 dict, 확신도 0~1).
+
+    알아본 말만으로 질의가 다 설명되면 1.0, 모르는 말이 남으면(키워드일 수도 있다) 0.5,
+    같은 필드에 서로 다른 값이 나오면 0.3, 아무것도 못 알아보면 0.
+    남은 말은 keyword에 넣는다.
+    """
+    params = {"region": "", "district": "", "category": "", "activity_type": "", "target": "",
+              "status": "0", "keyword": ""}
+    found = {}
+    leftovers = []
+    for word in normalize_query(query).split():
+        pieces = []
+        pos = 0
+        for m in _TERM_RE.finditer(word):
+            field, code = _TERMS[m.group()]
+            # 시/도 이름은 낱말 맨 앞에서만 ("해운대구"의 "대구"는 지역이 아니다)
+            if field == "region" and m.start() > 0:
+                continue
+            # 약칭 바로 뒤에 "시"가 오면 같은 이름의 다른 시 ("광주시" = 경기도 광주시).
+            # 낱말을 통째로 남겨 아래에서 시군구 이름으로 찾는다.
+            if field == "region" and word.startswith("시", m.end()):
+                continue
+            pieces.append(word[pos:m.start()])
+            found.setdefault(field, set()).add(code)
+            pos = m.end()
+        pieces.append(word[pos:])
+        for piece in pieces:
+            if not _is_filler(piece):
+                leftovers.append(_strip_particle(piece))
+
+    # 온라인 + 오프라인 → 온라인+오프라인
+    if found.get("activity_type") == {"1", "2"}:
+        found["activity_type"] = {"3"}
+
+    # 남은 말 중 시군구 이름은 지역과 함께 해석한다 ("중구"처럼 겹치면 지역이 있어야 한다)
+    region = next(iter(found["region"])) if len(found.get("region", ())) == 1 else ""
+    for word in list(leftovers):
+        matches = scraper.find_districts(word, region)
+        if len(matches) == 1:
+            found.setdefault("region", set()).add(matches[0][0])
+            found.setdefault("district", set()).add(matches[0][1])
+            leftovers.remove(word)
+
+    if not found:
+        return params, 0.0
+    conflict = False
+    for field, codes in found.items():
+        if len(codes) == 1:
+            params[field] = next(iter(codes))
+        else:
+            conflict = True
+    params["keyword"] = " ".join(leftovers)
+    if conflict:
+        return params, 0.3
+    return params, 0.5 if leftovers else 1.0
+
+
 def find_claude_binary():
+    """AI_SEARCH_CLI 환경변수가 있으면 그 경로, 없으면 VSCode 확장에 포함된 CLI."""
+    override = os.environ.get("AI_SEARCH_CLI")
+    if override:
+        return override
     matches = sorted(glob.glob(CLAUDE_BINARY_PATTERN), reverse=True)
     if matches:
         return matches[0]
     return None
 
 
-def parse_natural_query(query):
-    claude_bin = find_claude_binary()
-    if not claude_bin:
-        return None, "Claude CLI를 찾을 수 없습니다."
-
-    cmd = [
+def build_command(claude_bin):
+    return [
         claude_bin,
         "-p",
         "--model", "haiku",
@@ -76,33 +318,109 @@ def parse_natural_query(query):
         "--dangerously-skip-permissions",
     ]
 
+
+def parse_cli_output(returncode, stdout, stderr):
+    """CLI 실행 결과 → (params, None) 또는 (None, 오류 메시지)."""
+    if returncode != 0:
+        return None, f"Claude CLI 오류: {stderr[:200]}"
+    try:
+        data = json.loads(stdout)
+        params = data.get("structured_output")
+    except (json.JSONDecodeError, AttributeError) as e:
+        return None, f"AI 응답 파싱 오류: {e}"
+    if not params:
+        return None, "AI가 검색 파라미터를 생성하지 못했습니다."
+    return params, None
+
+
+def submit_natural_query(query):
+    """parse_natural_query의 비동기판 → 결과가 (params, error)인 Future.
+
+    캐시나 로컬 해석으로 풀리면 이미 끝난 Future를 반환한다.
+    interpreter_pool이 있으면 CLI 질의를 풀에 넣고 바로 반환하고, 없으면 여기서 CLI를 실행한다.
+    """
+    future = Future()
+    cache = query_cache
+    if cache is not None:
+        params = cache.get(query)
+        if params is not None:
+            future.set_result((params, None))
+            return future
+
+    local, confidence = interpret_locally(query)
+    if confidence >= LOCAL_CONFIDENCE:
+        future.set_result((local, None))
+        return future
+
+    def finish(params, error):
+        # CLI가 성공한 결과만 캐시에 저장한다. 실패하면 충돌 없는 로컬 결과로 대신하되 캐시하지 않는다.
+        if params:
+            if cache is not None:
+                cache.put(query, params)
+            return params, None
+        if confidence >= FALLBACK_CONFIDENCE:
+            print(f"[AI 검색] CLI 실패, 로컬 해석 사용 (확신도 {confidence}): {error}", flush=True)
+            return local, None
+        return None, error
+
+    pool = interpreter_pool
+    if pool is not None:
+        return pool.submit(query, finish=finish)
+    future.set_result(finish(*_ask_claude(query)))
+    return future
+
+
+def cancel_natural_query(future):
+    """submit_natural_query()로 넣은 질의를 취소한다 (풀에서 기다리거나 실행 중일 때만)."""
+    pool = interpreter_pool
+    return pool.cancel(future) if pool is not None else False
+
+
+def parse_natural_query(query):
+    """자연어 질의 → (검색 파라미터 dict, None) 또는 (None, 오류 메시지).
+
+    순서: 질의 캐시 → 로컬 해석기(확신도 LOCAL_CONFIDENCE 이상이면 바로 반환) → CLI.
+    CLI가 성공한 결과만 캐시에 저장한다. CLI가 실패해도 로컬 해석이 뭔가 찾았으면 그것을 쓴다.
+    """
+    future = submit_natural_query(query)
+    try:
+        return future.result(timeout=CLI_TIMEOUT)
+    except FutureTimeoutError:
+        # 풀 큐에서 오래 기다린 경우. 더 기다리지 않고 취소한다.
+        cancel_natural_query(future)
+        return None, TIMEOUT_ERROR
+
+
+def _ask_claude(query):
+    # 풀 없이 CLI를 한 번 실행한다 (매번 프로세스 시작 비용을 치른다)
+    claude_bin = find_claude_binary()
+    if not claude_bin:
+        return None, "Claude CLI를 찾을 수 없습니다."
+
     try:
         result = subprocess.run(
-            cmd,
+            build_command(claude_bin),
             input=query,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=CLI_TIMEOUT,
         )
-
-        if result.returncode != 0:
-            return None, f"Claude CLI 오류: {result.stderr[:200]}"
-
-        data = json.loads(result.stdout)
-        params = data.get("structured_output")
-        if not params:
-            return None, "AI가 검색 파라미터를 생성하지 못했습니다."
-
-        return params, None
-
     except subprocess.TimeoutExpired:
-        return None, "AI 응답 시간이 초과되었습니다."
-    except (json.JSONDecodeError, KeyError) as e:
-        return None, f"AI 응답 파싱 오류: {e}"
+        return None, TIMEOUT_ERROR
+    except OSError as e:
+        return None, f"Claude CLI 실행 오류: {e}"
+    return parse_cli_output(result.returncode, result.stdout, result.stderr)
 
 
 if __name__ == "__main__":
     import sys
+    if len(sys.argv) == 1:
+        for sample in ["서울에서 환경 봉사", "부산 어르신 돌봄", "온라인 교육 봉사 모집중인 것",
+                       "경기 아동 오프라인", "서울에서 주말에 할 수 있는 환경 봉사", "대구 부산 봉사"]:
+            params, confidence = interpret_locally(sample)
+            print(f"{confidence:.1f}  {sample}  →  "
+                  f"{ {k: v for k, v in params.items() if v} }")
+        print()
     query = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else "서울에서 주말에 할 수 있는 환경 봉사"
     print(f"쿼리: {query}")
     params, error = parse_natural_query(query)
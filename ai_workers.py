@@ -0,0 +1,211 @@
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+TIMEOUT_ERROR = "AI 응답 시간이 초과되었습니다."
+CANCELLED_ERROR = "AI 검색이 취소되었습니다."
+BUSY_ERROR = "AI 검색 요청이 많습니다. 잠시 후 다시 시도해 주세요."
+
+
+class InterpreterPool:
+    """미리 띄워 둔 해석기(Claude CLI) 프로세스로 질의를 처리하는 풀.
+
+    CLI는 `-p` 모드에서 표준입력이 닫힐 때까지 기다렸다가 한 번 답하고 끝난다.
+    그래서 워커마다 프로세스를 하나 미리 띄워 두고(시작 비용을 요청 전에 치른다),
+    질의가 오면 표준입력에 쓰고 닫은 뒤 곧바로 다음 프로세스를 띄운다.
+
+    - submit()은 바로 Future를 반환한다. 결과는 항상 (params, error) 튜플.
+    - 요청마다 기한(timeout초)이 있다. 큐에서 기다리다 넘겨도, 실행 중에 넘겨도 타임아웃 오류.
+    - cancel()은 큐에 있으면 빼고, 실행 중이면 프로세스를 죽인다.
+    - 큐는 max_queue개까지. 가득 차면 바로 BUSY_ERROR.
+
+        pool = InterpreterPool(command, parse=parse_output)
+        pool.start()
+        future = pool.submit("서울 환경 봉사")
+        params, error = future.result()
+    """
+
+    def __init__(self, command, size=2, max_queue=20, timeout=30, parse=None):
+        self.command = command
+        self.size = size
+        self.timeout = timeout
+        # (returncode, stdout, stderr) → (params, error)
+        self.parse = parse or (lambda code, out, err: (out, None) if code == 0 else (None, err))
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._running = {}   # Future -> [프로세스, 취소 여부]
+        self._threads = []
+        self._stopped = False
+        self.stats = {"submitted": 0, "completed": 0, "timeouts": 0, "cancelled": 0,
+                      "rejected": 0, "spawned": 0, "spawn_errors": 0}
+
+    def start(self):
+        for i in range(self.size):
+            t = threading.Thread(target=self._work, name=f"ai-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, query, timeout=None, finish=None):
+        """질의를 큐에 넣고 Future를 반환한다. finish(params, error)가 있으면 결과를 그것으로 바꿔 넣는다.
+
+        취소된 질의에는 finish를 부르지 않는다. finish가 예외를 내면 (None, 오류 메시지)로 끝난다.
+        """
+        future = Future()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with self._lock:
+            if self._stopped:
+                future.set_result((None, CANCELLED_ERROR))
+                return future
+            try:
+                self._queue.put_nowait((query, deadline, finish, future))
+            except queue.Full:
+                self.stats["rejected"] += 1
+                future.set_result((None, BUSY_ERROR))
+                return future
+            self.stats["submitted"] += 1
+        return future
+
+    def cancel(self, future):
+        """큐에 있으면 빼고 실행 중이면 프로세스를 죽인다. 이미 끝났으면 False."""
+        if future.cancel():
+            self._count("cancelled")
+            return True
+        with self._lock:
+            running = self._running.get(future)
+            if running is None:
+                return False
+            running[1] = True
+            proc = running[0]
+        proc.kill()
+        return True
+
+    def _spawn(self):
+        try:
+            proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True)
+        except OSError as e:
+            print(f"[AI 워커] 해석기 실행 실패: {e}", flush=True)
+            self._count("spawn_errors")
+            return None
+        self._count("spawned")
+        return proc
+
+    def _work(self):
+        proc = self._spawn()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            query, deadline, finish, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count("timeouts")
+                result = (None, TIMEOUT_ERROR)
+            else:
+                # 기다리는 동안 죽었으면(또는 처음 실행에 실패했으면) 새로 띄운다
+                if proc is None or proc.poll() is not None:
+                    proc = self._spawn()
+                if proc is None:
+                    result = (None, "AI 해석기를 실행할 수 없습니다.")
+                else:
+                    # 이번 질의를 맡기고 다음 질의용 프로세스는 지금 띄워 둔다
+                    current, proc = proc, self._spawn()
+                    result = self._run(current, query, remaining, future)
+            # 취소된 질의는 finish를 거치지 않는다 (로컬 해석 같은 대체 결과로 바뀌면 안 된다)
+            if finish is not None and result[1] != CANCELLED_ERROR:
+                try:
+                    result = finish(*result)
+                except Exception as e:
+                    # 여기서 예외가 새면 워커 스레드가 죽고 Future가 끝나지 않는다
+                    print(f"[AI 워커] 결과 처리 실패: {e}", flush=True)
+                    result = (None, f"AI 결과 처리 오류: {e}")
+            future.set_result(result)
+            self._count("completed")
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+
+    def _run(self, proc, query, remaining, future):
+        with self._lock:
+            self._running[future] = [proc, False]
+        try:
+            out, err = proc.communicate(query, timeout=remaining)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            self._count("timeouts")
+            return None, TIMEOUT_ERROR
+        finally:
+            with self._lock:
+                cancelled = self._running.pop(future)[1]
+        if cancelled:
+            self._count("cancelled")
+            return None, CANCELLED_ERROR
+        return self.parse(proc.returncode, out, err)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, size=self.size, queued=self._queue.qsize(),
+                        running=len(self._running))
+
+    def stop(self, timeout=5):
+        """새 질의를 받지 않고, 큐에 남은 질의는 취소하고, 실행 중인 프로세스를 죽인 뒤 워커를 멈춘다."""
+        with self._lock:
+            self._stopped = True
+            running = [r[0] for r in self._running.values()]
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job[3].set_running_or_notify_cancel():
+                job[3].set_result((None, CANCELLED_ERROR))
+        for proc in running:
+            proc.kill()
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join(timeout)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # 가짜 해석기(bench/fake_claude.py: 시작 1초, 질의당 0.2초)로 매번 새로 띄우는 경우와 비교
+    fake = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "fake_claude.py")
+    os.environ.setdefault("FAKE_CLAUDE_STARTUP", "1.0")
+    os.environ.setdefault("FAKE_CLAUDE_LATENCY", "0.2")
+    command = [sys.executable, fake]
+    queries = ["서울 환경 봉사", "부산 주말 봉사", "온라인 멘토링", "대구 어르신"]
+
+    start = time.perf_counter()
+    for q in queries:
+        subprocess.run(command, input=q, capture_output=True, text=True)
+    print(f"매번 새 프로세스: {time.perf_counter() - start:.2f}초")
+
+    pool = InterpreterPool(command, size=2)
+    pool.start()
+    time.sleep(1.5)   # 미리 띄운 프로세스가 준비될 때까지
+    start = time.perf_counter()
+    for q in queries:
+        pool.submit(q).result()
+        time.sleep(0.8)   # 요청 사이 간격 (그동안 다음 프로세스가 준비된다)
+    print(f"미리 띄운 풀: {time.perf_counter() - start - 0.8 * len(queries):.2f}초 (간격 제외)")
+
+    slow = pool.submit("느린 질의", timeout=0.1)
+    print("기한 초과:", slow.result())
+    pending = [pool.submit(q) for q in queries]
+    print("취소:", pool.cancel(pending[-1]), pending[-1].cancelled())
+    for f in pending[:-1]:
+        f.result()
+    print("통계:", pool.snapshot())
+    pool.stop()
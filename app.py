@@ -1,5 +1,7 @@
 import os
 import json
+import secrets
+import time
 import urllib.parse
 import threading
 from datetime import datetime, timedelta
@@ -7,21 +9,94 @@ from bottle import Bottle, request, response, redirect, static_file, template, T
 
 import db
 import scraper
-from categorizer import compute_group_key, group_activities
+from districts import DistrictStore
+from httpcache import HTTPCache
+import ai_search
 from ai_search import parse_natural_query
+from ai_workers import InterpreterPool
+from prefetch import DetailPrefetcher, PRIORITY_SAVED
+from server import PooledServer
 
 app = Bottle()
 
 BASE_DIR = os.path.dirname(__file__)
 TEMPLATE_PATH.insert(0, os.path.join(BASE_DIR, "views"))
 
-# DB 연결
+# DB 연결 풀: 요청 스레드는 읽기 전용 연결을 빌리고, 쓰기는 풀의 쓰기 스레드로 보낸다
 os.makedirs(os.path.join(BASE_DIR, "data"), exist_ok=True)
-conn = db.get_conn()
-db.init_db(conn)
+pool = db.ConnectionPool()
+pool.write(db.init_db)
 
-# 동기화 상태
-sync_state = {"running": False, "page": 0, "total_pages": 0, "fetched": 0, "error": None}
+
+def _backfill_clusters():
+    """클러스터링 전에 저장된 활동을 조금씩 나눠 처리한다 (쓰기 스레드를 오래 잡지 않게)."""
+    total = 0
+    while True:
+        done = pool.write(db.backfill_clusters)
+        if not done:
+            break
+        total += done
+    if total:
+        print(f"[클러스터] 기존 활동 {total}건 클러스터링 완료", flush=True)
+
+
+# 포털 응답 캐시 (목록 5분, 상세 6시간, 시군구 7일)
+scraper.http_cache = HTTPCache(os.path.join(BASE_DIR, "data", "http_cache"))
+
+# AI 검색 질의 캐시 (정규화한 질의 → 검색 파라미터, 7일)
+ai_search.query_cache = ai_search.QueryCache(pool)
+
+# 진행 중인 AI 검색 작업 (작업 id -> (Future, 시작 시각)). 결과를 가져가면 지운다.
+ai_jobs = {}
+ai_jobs_lock = threading.Lock()
+# 결과를 가져가지 않은 작업은 이 시간(초)이 지나면 버린다
+AI_JOB_TTL = 300
+
+# 시군구 목록 (start_services()에서 DB에서 메모리로 올리고 오래된 시/도는 백그라운드로 갱신)
+district_store = DistrictStore(pool)
+
+# 검색 결과/저장 목록에 보인 활동의 상세 페이지를 미리 받아둔다
+prefetcher = DetailPrefetcher(pool)
+
+
+def start_services():
+    """백그라운드 작업을 시작한다. 요청을 실제로 처리하는 프로세스에서 한 번만 부른다.
+
+    개발 모드(reloader=True)에서는 감시만 하는 부모 프로세스도 이 모듈을 실행하므로,
+    모듈을 읽을 때 바로 띄우면 CLI 프로세스와 포털 요청이 두 벌씩 생긴다.
+    """
+    threading.Thread(target=_backfill_clusters, name="cluster-backfill", daemon=True).start()
+
+    # AI 검색 CLI 프로세스를 미리 띄워 둔다 (AI_SEARCH_WORKERS개, 0이면 질의마다 새로 실행)
+    claude_bin = ai_search.find_claude_binary()
+    ai_workers = int(os.environ.get("AI_SEARCH_WORKERS", "2"))
+    if claude_bin and ai_workers > 0:
+        ai_search.interpreter_pool = InterpreterPool(ai_search.build_command(claude_bin),
+                                                     size=ai_workers, timeout=ai_search.CLI_TIMEOUT,
+                                                     parse=ai_search.parse_cli_output)
+        ai_search.interpreter_pool.start()
+
+    district_store.warm()
+    # 시군구 목록을 올린 뒤에 해야 시군구 코드까지 채워진다 (새로 받는 지역은 DistrictStore.refresh()가 다시 채움)
+    pool.write(db.backfill_region_codes, scraper.resolve_region)
+
+    prefetcher.start()
+    with pool.read() as conn:
+        prefetcher.enqueue([a["program_id"] for a in db.get_saved_activities(conn)
+                            if not a["detail_fetched"]], PRIORITY_SAVED)
+
+# 동기화 상태 (요청 스레드와 동기화 스레드가 함께 쓰므로 sync_lock 안에서만 읽고 쓴다)
+sync_lock = threading.Lock()
+sync_state = {"running": False, "page": 0, "total_pages": 0, "fetched": 0, "error": None,
+              "resumed": False, "skipped_pages": 0, "mode": ""}
+# 동기화 중 한 트랜잭션으로 커밋하는 활동 수
+SYNC_BATCH_SIZE = 200
+# 증분 동기화: 이미 아는 활동만 있는 페이지가 이만큼 연속되면 멈춘다
+INCREMENTAL_STOP_PAGES = 3
+# 마지막 전체 동기화가 이보다 오래되면 증분 대신 전체 동기화 (증분 동기화가 놓친 활동은 여기서 채워진다)
+FULL_SYNC_INTERVAL = timedelta(days=7)
+# 검색 결과의 묶음 카드에 미리 보여줄 멤버 수
+GROUP_PREVIEW = 3
 
 
 # --- 페이지 라우트 ---
@@ -30,7 +105,8 @@ sync_state = {"running": False, "page": 0, "total_pages": 0, "fetched": 0, "erro
 def index():
     today = datetime.now().strftime("%Y-%m-%d")
     end = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
-    sync_stats = db.get_sync_stats(conn)
+    with pool.read() as conn:
+        sync_stats = db.get_sync_stats(conn)
     return template("index",
                      regions=scraper.REGION_CODES,
                      categories=scraper.CATEGORY_CODES,
@@ -40,6 +116,8 @@ def index():
                      groups=None,
                      total=0,
                      page=1,
+                     next_cursor=None,
+                     prev_cursor=None,
                      filters={},
                      today=today,
                      end_date=end,
@@ -58,7 +136,7 @@ def search_page():
     date_start = request.params.get("date_start", "")
     date_end = request.params.get("date_end", "")
     keyword = request.params.get("keyword", "")
-    page = int(request.params.get("page", "1"))
+    cursor = request.params.get("cursor", "")
 
     filters = {
         "region": region, "district": district, "category": category,
@@ -81,9 +159,9 @@ def search_page():
     elif status == "1":
         db_filters["recruit_status"] = "모집완료"
     if region:
-        region_name = scraper.REGION_CODES.get(region, "")
-        if region_name:
-            db_filters["location"] = region_name
+        db_filters["region_code"] = region
+        if district:
+            db_filters["district_code"] = district
     if date_start:
         db_filters["date_start"] = date_start
     if date_end:
@@ -92,19 +170,31 @@ def search_page():
     error = None
     items = []
     total = 0
-    groups = {}
+    page = 1
+    next_cursor = prev_cursor = None
+    members = {}
 
     try:
-        result = db.search_activities(conn, db_filters, page=page, per_page=10)
-        items = result["items"]
+        # 페이지는 묶음(group_key) 10개 단위. 전체 묶음 수는 첫 페이지에서만 세고 이후엔 커서에 담겨 전달된다
+        with pool.read() as conn:
+            result = db.search_groups(conn, db_filters, cursor=cursor or None,
+                                      per_page=10, count_total=True)
+            items = result["items"]
+            members = {g["group_key"]: db.get_group_members(conn, g["group_key"], GROUP_PREVIEW)
+                       for g in items if g["member_count"] > 1}
         total = result["total"]
-        groups = group_activities(items)
+        page = result["page"]
+        next_cursor = result["next_cursor"]
+        prev_cursor = result["prev_cursor"]
+        shown = items + [a for group in members.values() for a in group]
+        prefetcher.enqueue([a["program_id"] for a in shown if not a["detail_fetched"]])
     except Exception as e:
         error = f"검색 중 오류가 발생했습니다: {e}"
 
     today = datetime.now().strftime("%Y-%m-%d")
     end = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
-    sync_stats = db.get_sync_stats(conn)
+    with pool.read() as conn:
+        sync_stats = db.get_sync_stats(conn)
 
     return template("index",
                      regions=scraper.REGION_CODES,
@@ -112,9 +202,11 @@ def search_page():
                      activity_types=scraper.ACTIVITY_TYPE_CODES,
                      targets=scraper.TARGET_CODES,
                      results=items,
-                     groups=groups,
+                     members=members,
                      total=total,
                      page=page,
+                     next_cursor=next_cursor,
+                     prev_cursor=prev_cursor,
                      filters=filters,
                      today=today,
                      end_date=end,
@@ -124,35 +216,33 @@ def search_page():
 
 @app.route("/activity/<program_id>")
 def activity_detail(program_id):
-    # DB에 없으면 빈 레코드 생성
-    now = datetime.now().isoformat()
-    db.ensure_activity_exists(conn, program_id, now)
+    with pool.read() as conn:
+        view = db.get_activity_view(conn, program_id)
+    if view is None:
+        # 목록에서 클릭했지만 DB에 없으면 빈 레코드 생성
+        pool.write(db.ensure_activity_exists, program_id, datetime.now().isoformat())
 
     # 상세 정보를 아직 안 가져왔으면 API 호출
-    activity = db.get_activity(conn, program_id)
     error = None
-    if not activity.get("detail_fetched"):
+    loaded = False
+    if view is None or not view["activity"].get("detail_fetched"):
         try:
-            detail = scraper.fetch_detail(program_id)
-            if detail:
-                db.update_activity_detail(conn, detail)
-                activity = db.get_activity(conn, program_id)
+            # 같은 활동을 동시에 여는 요청/미리받기 워커가 있으면 그 결과를 같이 기다린다
+            loaded = prefetcher.load(program_id)
         except Exception as e:
             error = f"상세 정보 조회 중 오류: {e}"
+    if view is None or loaded:
+        with pool.read() as conn:
+            view = db.get_activity_view(conn, program_id)
 
-    reviews = db.get_reviews(conn, program_id)
-    stats = db.get_review_stats(conn, program_id)
-    saved = db.is_saved(conn, program_id)
-    related = db.get_grouped_activities(conn, activity["group_key"]) if activity.get("group_key") else []
-    related = [r for r in related if r["program_id"] != program_id]
-
-    return template("detail", activity=activity, reviews=reviews, stats=stats,
-                     saved=saved, related=related, error=error)
+    return template("detail", error=error, **view)
 
 
 @app.route("/saved")
 def saved_page():
-    activities = db.get_saved_activities(conn)
+    with pool.read() as conn:
+        activities = db.get_saved_activities(conn)
+    prefetcher.enqueue([a["program_id"] for a in activities if not a["detail_fetched"]], PRIORITY_SAVED)
     return template("saved", activities=activities)
 
 
@@ -169,19 +259,35 @@ def api_review():
         response.status = 400
         return json.dumps({"error": "program_id와 content는 필수입니다."})
 
-    db.add_review(conn, program_id, rating, content, author)
+    pool.write(db.add_review, program_id, rating, content, author)
     redirect(f"/activity/{program_id}")
 
 
 @app.post("/api/save/<program_id>")
 def api_save(program_id):
-    result = db.save_activity(conn, program_id)
+    result = pool.write(db.save_activity, program_id)
+    if result:
+        prefetcher.enqueue([program_id], PRIORITY_SAVED)
     response.content_type = "application/json"
     return json.dumps({"saved": result})
 
 
+def _ai_search_url(params):
+    # 날짜 기본값 추가
+    today = datetime.now().strftime("%Y-%m-%d")
+    end = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
+    params.setdefault("date_start", today)
+    params.setdefault("date_end", end)
+
+    print(f"[AI 검색] 결과: {params}")
+
+    qs = urllib.parse.urlencode({k: v for k, v in params.items() if v})
+    return f"/search?{qs}"
+
+
 @app.post("/api/ai-search")
 def api_ai_search():
+    # 스크립트 없이 폼을 보낸 경우: 결과가 나올 때까지 기다렸다가 리다이렉트
     query = request.forms.getunicode("query", "").strip()
     if not query:
         redirect("/")
@@ -194,39 +300,82 @@ def api_ai_search():
         print(f"[AI 검색] 오류: {error}")
         today = datetime.now().strftime("%Y-%m-%d")
         end = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
-        sync_stats = db.get_sync_stats(conn)
+        with pool.read() as conn:
+            sync_stats = db.get_sync_stats(conn)
         return template("index",
                          regions=scraper.REGION_CODES,
                          categories=scraper.CATEGORY_CODES,
                          activity_types=scraper.ACTIVITY_TYPE_CODES,
                          targets=scraper.TARGET_CODES,
                          results=None, groups=None, total=0, page=1,
+                         next_cursor=None, prev_cursor=None,
                          filters={}, today=today, end_date=end,
                          error=f"AI 검색 오류: {error}",
                          sync_stats=sync_stats)
 
-    # 날짜 기본값 추가
-    today = datetime.now().strftime("%Y-%m-%d")
-    end = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
-    params.setdefault("date_start", today)
-    params.setdefault("date_end", end)
+    redirect(_ai_search_url(params))
 
-    print(f"[AI 검색] 결과: {params}")
 
-    qs = urllib.parse.urlencode({k: v for k, v in params.items() if v})
-    redirect(f"/search?{qs}")
+def _ai_job_result(future):
+    params, error = future.result()
+    if error:
+        print(f"[AI 검색] 오류: {error}")
+        return {"error": f"AI 검색 오류: {error}"}
+    return {"url": _ai_search_url(params)}
+
+
+@app.post("/api/ai-search/start")
+def api_ai_search_start():
+    """질의를 넣고 바로 반환한다. 캐시/로컬 해석으로 풀리면 {"url"}, 아니면 {"job"} → status로 확인."""
+    response.content_type = "application/json"
+    query = request.forms.getunicode("query", "").strip()
+    if not query:
+        return json.dumps({"error": "검색어를 입력하세요."})
+
+    print(f"[AI 검색] 쿼리: {query}")
+    future = ai_search.submit_natural_query(query)
+    if future.done():
+        return json.dumps(_ai_job_result(future))
+
+    job_id = secrets.token_urlsafe(8)
+    now = time.monotonic()
+    with ai_jobs_lock:
+        for old_id, (old, started) in list(ai_jobs.items()):
+            if now - started > AI_JOB_TTL:
+                ai_search.cancel_natural_query(old)
+                del ai_jobs[old_id]
+        ai_jobs[job_id] = (future, now)
+    return json.dumps({"job": job_id})
+
+
+@app.route("/api/ai-search/status/<job_id>")
+def api_ai_search_status(job_id):
+    response.content_type = "application/json"
+    with ai_jobs_lock:
+        job = ai_jobs.get(job_id)
+        if job is None:
+            return json.dumps({"error": "AI 검색 작업을 찾을 수 없습니다."})
+        if not job[0].done():
+            return json.dumps({"done": False})
+        del ai_jobs[job_id]
+    if job[0].cancelled():
+        return json.dumps({"error": "AI 검색이 취소되었습니다."})
+    return json.dumps(_ai_job_result(job[0]))
+
+
+@app.post("/api/ai-search/cancel/<job_id>")
+def api_ai_search_cancel(job_id):
+    response.content_type = "application/json"
+    with ai_jobs_lock:
+        job = ai_jobs.pop(job_id, None)
+    cancelled = bool(job) and ai_search.cancel_natural_query(job[0])
+    return json.dumps({"cancelled": cancelled})
 
 
 @app.post("/api/sync")
 def api_sync():
-    global sync_state
     print("[동기화] 요청 수신", flush=True)
 
-    if sync_state["running"]:
-        print("[동기화] 이미 진행 중 — 무시", flush=True)
-        response.content_type = "application/json"
-        return json.dumps({"error": "동기화가 이미 진행 중입니다."})
-
     # 필터 파라미터 수신
     filters = {
         "region": request.forms.get("region", ""),
@@ -239,49 +388,100 @@ def api_sync():
         "date_end": request.forms.get("date_end", ""),
         "keyword": request.forms.get("keyword", ""),
     }
+    force_full = request.forms.get("full", "") == "1"
     print(f"[동기화] 필터: {filters}", flush=True)
 
-    sync_state = {"running": True, "page": 0, "total_pages": 0, "fetched": 0, "error": None}
+    # 확인과 시작을 한 번에 해야 동시 요청이 둘 다 통과하지 않는다
+    with sync_lock:
+        if sync_state["running"]:
+            print("[동기화] 이미 진행 중 — 무시", flush=True)
+            response.content_type = "application/json"
+            return json.dumps({"error": "동기화가 이미 진행 중입니다."})
+        sync_state.update(running=True, page=0, total_pages=0, fetched=0, error=None,
+                          resumed=False, skipped_pages=0, mode="")
 
     def run_sync():
-        global sync_state
-        sync_conn = db.get_conn()
         try:
             print("[동기화] 스레드 시작", flush=True)
-            before_count = db.get_sync_stats(sync_conn)["count"]
-
-            def on_progress(page, total_pages, fetched):
-                sync_state["page"] = page
-                sync_state["total_pages"] = total_pages
-                sync_state["fetched"] = fetched
-                print(f"[동기화] 페이지 {page}/{total_pages} ({fetched}건)", flush=True)
-
-            result = scraper.sync_filtered(
-                region=filters["region"],
-                district=filters["district"],
-                category=filters["category"],
-                activity_type=filters["activity_type"],
-                target=filters["target"],
-                status=filters["status"],
-                date_start=filters["date_start"],
-                date_end=filters["date_end"],
-                keyword=filters["keyword"],
-                progress_callback=on_progress,
-            )
-            if result["items"]:
-                db.upsert_activities(sync_conn, result["items"])
-
-            after_count = db.get_sync_stats(sync_conn)["count"]
+            with pool.read() as conn:
+                before_count = db.get_sync_stats(conn)["count"]
+                filter_meta = db.get_filter_sync(conn, filters)
+
+            # 최근에 전체 동기화한 필터는 앞쪽 페이지만 확인하는 증분 동기화.
+            # 포털 정렬 순서를 지정하지 않으므로 누락이 없다는 보장은 FULL_SYNC_INTERVAL의 전체 동기화뿐이다
+            last_full = filter_meta and filter_meta["last_full_sync"]
+            full = (force_full or not last_full
+                    or datetime.now() - datetime.fromisoformat(last_full) > FULL_SYNC_INTERVAL)
+            known_ids = None
+            if not full:
+                def known_ids(ids):
+                    with pool.read() as conn:
+                        return db.known_program_ids(conn, ids)
+            print(f"[동기화] 모드: {'전체' if full else '증분'}", flush=True)
+
+            # 같은 필터의 중단된 작업이 있으면 완료된 페이지는 건너뛴다
+            job = pool.write(db.start_sync_job, filters)
+            if job["resumed"]:
+                print(f"[동기화] 이어받기: {len(job['completed'])}/{job['total_pages']} 페이지 완료됨", flush=True)
+            with sync_lock:
+                sync_state.update(mode="full" if full else "incremental",
+                                  resumed=job["resumed"], skipped_pages=len(job["completed"]),
+                                  page=len(job["completed"]), total_pages=job["total_pages"] or 0)
+
+            # 페이지를 받는 대로 SYNC_BATCH_SIZE건씩 커밋한다.
+            # 메모리에는 한 배치만 남고, 동기화 중에도 이미 받은 활동은 검색된다.
+            # 페이지 완료 기록도 같은 트랜잭션에 들어간다.
+            batch = []
+            batch_pages = []
+            fetched = 0
+            done_pages = len(job["completed"])
+            failed_pages = []
+            total_pages = job["total_pages"]
+            for page in scraper.iter_sync_pages(skip_pages=job["completed"], total=job["total"],
+                                                known_ids=known_ids,
+                                                stop_after_known=INCREMENTAL_STOP_PAGES,
+                                                refresh=force_full, **filters):
+                if page["total_pages"] != total_pages:
+                    total_pages = page["total_pages"]
+                    pool.write(db.set_sync_job_total, job["fingerprint"], page["total"], total_pages)
+                done_pages += 1  # 완료 순서로 오므로 진행률은 받은 페이지 수로 계산
+                if page["error"]:
+                    failed_pages.append(page["page"])
+                else:
+                    batch_pages.append(page["page"])
+                batch.extend(page["items"])
+                fetched += len(page["items"])
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    pool.write(db.write_sync_batch, job["fingerprint"], batch, batch_pages)
+                    batch, batch_pages = [], []
+                with sync_lock:
+                    sync_state.update(page=done_pages, total_pages=total_pages, fetched=fetched)
+                print(f"[동기화] 페이지 {page['page']}/{total_pages} ({fetched}건)", flush=True)
+            if batch or batch_pages:
+                pool.write(db.write_sync_batch, job["fingerprint"], batch, batch_pages)
+            # 실패한 페이지가 남아 있으면 작업을 열어둬 다음 동기화가 그 페이지만 받는다
+            if not failed_pages:
+                pool.write(db.finish_sync_job, job["fingerprint"])
+            # 이어받은 작업이면 이전 실행에서 받은 것까지 합친 수를 기록한다
+            with pool.read() as conn:
+                job_items = db.get_sync_job_items(conn, job["fingerprint"])
+            pool.write(db.record_filter_sync, filters, job_items, full=full)
+
+            with pool.read() as conn:
+                after_count = db.get_sync_stats(conn)["count"]
             new_count = after_count - before_count
-            print(f"[동기화] 완료: API {len(result['items'])}건 중 신규 {new_count}건 추가 (DB 총 {after_count}건)", flush=True)
+            print(f"[동기화] 완료: API {fetched}건 중 신규 {new_count}건 추가 (DB 총 {after_count}건)", flush=True)
+            if failed_pages:
+                print(f"[동기화] 재시도 후에도 실패한 페이지: {sorted(failed_pages)}", flush=True)
         except Exception as e:
-            sync_state["error"] = str(e)
+            with sync_lock:
+                sync_state["error"] = str(e)
             import traceback
             print(f"[동기화] 오류: {e}", flush=True)
             traceback.print_exc()
         finally:
-            sync_conn.close()
-            sync_state["running"] = False
+            with sync_lock:
+                sync_state["running"] = False
 
     thread = threading.Thread(target=run_sync, daemon=True)
     thread.start()
@@ -294,13 +494,19 @@ def api_sync():
 @app.route("/api/sync-status")
 def api_sync_status():
     response.content_type = "application/json"
-    stats = db.get_sync_stats(conn)
+    with pool.read() as conn:
+        stats = db.get_sync_stats(conn)
+    with sync_lock:
+        state = dict(sync_state)
     return json.dumps({
-        "running": sync_state["running"],
-        "page": sync_state["page"],
-        "total_pages": sync_state["total_pages"],
-        "fetched": sync_state["fetched"],
-        "error": sync_state["error"],
+        "running": state["running"],
+        "page": state["page"],
+        "total_pages": state["total_pages"],
+        "fetched": state["fetched"],
+        "error": state["error"],
+        "resumed": state["resumed"],
+        "skipped_pages": state["skipped_pages"],
+        "mode": state["mode"],
         "db_count": stats["count"],
         "last_sync": stats["last_sync"],
     })
@@ -308,14 +514,51 @@ def api_sync_status():
 
 @app.route("/api/districts/<city_code>")
 def api_districts(city_code):
-    # 1365 포털에서 시군구 목록을 가져와 반환
+    # 메모리에 올려둔 시군구 목록을 반환 (처음 보는 시/도만 포털에서 받아 온다)
     response.content_type = "application/json"
+    if city_code not in scraper.REGION_CODES:
+        return json.dumps({"error": "알 수 없는 지역코드입니다."})
     try:
-        districts = scraper.fetch_districts(city_code)
-        return json.dumps(districts, ensure_ascii=False)
+        entry = district_store.get(city_code)
     except Exception as e:
         return json.dumps({"error": str(e)})
 
+    response.set_header("Cache-Control", "public, max-age=3600")
+    response.set_header("ETag", entry["etag"])
+    if request.headers.get("If-None-Match") == entry["etag"]:
+        response.status = 304
+        return ""
+    return entry["body"]
+
+
+# --- 관리 API (서버가 도는 기기에서만) ---
+
+def _local_only():
+    if request.remote_addr not in ("127.0.0.1", "::1"):
+        response.status = 403
+        return json.dumps({"error": "로컬에서만 사용할 수 있습니다."})
+    return None
+
+
+@app.route("/api/admin/ai-cache")
+def api_ai_cache_stats():
+    response.content_type = "application/json"
+    denied = _local_only()
+    if denied:
+        return denied
+    return json.dumps(ai_search.query_cache.snapshot())
+
+
+@app.post("/api/admin/ai-cache/purge")
+def api_ai_cache_purge():
+    # expired=1이면 유효 시간이 지난 항목만 지운다
+    response.content_type = "application/json"
+    denied = _local_only()
+    if denied:
+        return denied
+    removed = ai_search.query_cache.purge(expired_only=request.forms.get("expired") == "1")
+    return json.dumps({"removed": removed})
+
 
 # --- 정적 파일 ---
 
@@ -324,5 +567,39 @@ def serve_static(filepath):
     return static_file(filepath, root=os.path.join(BASE_DIR, "static"))
 
 
+# 다른 WSGI 서버나 스크립트가 모듈로 불러 쓰는 경우
+if __name__ != "__main__":
+    start_services()
+
+
+def shutdown():
+    prefetcher.stop()
+    if ai_search.interpreter_pool:
+        ai_search.interpreter_pool.stop()
+    pool.close()
+
+
 if __name__ == "__main__":
-    app.run(host="localhost", port=8080, debug=True, reloader=True, quiet=True)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="volunteer-finder 웹 서버")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="요청 처리 스레드 수. 0이면 개발 모드 (단일 스레드 + 자동 재시작)")
+    parser.add_argument("--portal", help="1365 포털 대신 쓸 주소 (예: bench/fake_portal.py의 http://127.0.0.1:8765)")
+    args = parser.parse_args()
+
+    if args.portal:
+        scraper.set_base_url(args.portal)
+
+    # 자동 재시작 모드의 부모 프로세스는 파일 변경만 감시한다. 서비스는 자식(BOTTLE_CHILD)에서 띄운다
+    if args.workers > 0 or os.environ.get("BOTTLE_CHILD"):
+        start_services()
+
+    if args.workers > 0:
+        app.run(server=PooledServer(host=args.host, port=args.port,
+                                    workers=args.workers, on_shutdown=shutdown),
+                quiet=True)
+    else:
+        app.run(host=args.host, port=args.port, debug=True, reloader=True, quiet=True)
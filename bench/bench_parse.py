@@ -0,0 +1,155 @@
+"""파서/그룹핑 마이크로 벤치마크 (네트워크 없이 bench/fixtures의 저장된 페이지 사용).
+
+    python bench/bench_parse.py                          # 결과 출력
+    python bench/bench_parse.py --out before.json        # JSON 리포트 저장
+    python bench/bench_parse.py --compare before.json    # 이전 리포트와 비교 (느려지면 종료코드 1)
+
+항목별로 처리량(calls/s, items/s)과 tracemalloc 기준 1회 호출의
+최대 메모리(peak_kb), 호출 뒤 남은 할당 블록 수(retained_blocks)를 잰다.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "bench", "fixtures")
+sys.path.insert(0, ROOT)
+
+import categorizer  # noqa: E402
+import scraper  # noqa: E402
+
+
+def load_fixtures(prefix):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, prefix + "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def measure(fn, items_per_call, min_time):
+    """fn을 min_time초 이상 반복해 처리량을 재고, 한 번 더 돌려 메모리를 잰다."""
+    fn()  # 워밍업 (정규식 컴파일, 지역 캐시 등)
+
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    return {
+        "calls": calls,
+        "seconds": round(elapsed, 4),
+        "calls_per_sec": round(calls / elapsed, 1),
+        "items_per_sec": round(calls * items_per_call / elapsed, 1),
+        "us_per_call": round(elapsed / calls * 1e6, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "retained_blocks": blocks,
+    }
+
+
+def build_cases():
+    lists = load_fixtures("list_")
+    details = load_fixtures("detail_")
+
+    # 그룹키 입력: 저장된 목록 페이지의 제목
+    titles = [a["title"] for html in lists for a in scraper.parse_activities(html, backend="bs4")]
+    item_count = len(titles)
+
+    cases = {}
+    cases["parse_total_count"] = (lambda: [scraper.parse_total_count(h) for h in lists], len(lists))
+    for backend in ("bs4", "fast"):
+        cases[f"parse_activities[{backend}]"] = (
+            lambda b=backend: [scraper.parse_activities(h, backend=b) for h in lists], item_count)
+        cases[f"parse_detail[{backend}]"] = (
+            lambda b=backend: [scraper.parse_detail(h, "0", backend=b) for h in details], len(details))
+    cases["compute_group_key[reference]"] = (
+        lambda: [categorizer.compute_group_key_reference(t) for t in titles], len(titles))
+    # 메모 없이 단일 패스만 (매 호출이 처음 보는 제목인 경우)
+    cases["compute_group_key[fused]"] = (
+        lambda: [categorizer._fused_group_key(t) for t in titles], len(titles))
+    cases["compute_group_keys"] = (lambda: categorizer.compute_group_keys(titles), len(titles))
+    return cases
+
+
+def run(min_time=0.5, only=None):
+    results = {}
+    for name, (fn, items) in build_cases().items():
+        if only and not any(o in name for o in only):
+            continue
+        results[name] = measure(fn, items, min_time)
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "min_time": min_time,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """items/s가 threshold 비율 넘게 줄어든 항목 이름 목록을 돌려준다."""
+    slower = []
+    print(f"\n{'항목':28} {'기준 items/s':>14} {'현재 items/s':>14} {'변화':>8}")
+    for name, cur in report["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        ratio = cur["items_per_sec"] / old["items_per_sec"] if old["items_per_sec"] else 0
+        mark = ""
+        if ratio < 1 - threshold:
+            slower.append(name)
+            mark = "  ← 느려짐"
+        print(f"{name:28} {old['items_per_sec']:>14,.0f} {cur['items_per_sec']:>14,.0f} {ratio:>7.2f}x{mark}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파서/그룹핑 벤치마크")
+    parser.add_argument("--min-time", type=float, default=0.5, help="항목별 최소 측정 시간(초)")
+    parser.add_argument("--only", action="append", help="이름에 이 문자열이 들어간 항목만 (반복 가능)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 JSON 리포트")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="--compare 시 느려짐으로 볼 비율 (기본 0.15 = 15%%)")
+    args = parser.parse_args()
+
+    report = run(args.min_time, args.only)
+
+    print(f"{'항목':28} {'calls/s':>10} {'items/s':>12} {'us/call':>10} {'peak KB':>9} {'blocks':>8}")
+    for name, r in report["results"].items():
+        print(f"{name:28} {r['calls_per_sec']:>10,.0f} {r['items_per_sec']:>12,.0f} "
+              f"{r['us_per_call']:>10,.0f} {r['peak_kb']:>9,.0f} {r['retained_blocks']:>8}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n리포트 저장: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(report, baseline, args.threshold)
+        if slower:
+            print(f"\n느려진 항목: {', '.join(slower)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
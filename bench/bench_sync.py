@@ -0,0 +1,187 @@
+"""가짜 포털(bench/fake_portal.py)을 상대로 전체 동기화를 돌려 처리량을 잰다.
+
+    python bench/bench_sync.py --pages 200 --latency 300 --error-rate 0.05
+    python bench/bench_sync.py --max-workers 3 --initial-workers 3   # 고정 3스레드와 비교
+    python bench/bench_sync.py --out sync.json
+
+가짜 포털은 별도 프로세스로 띄운다 (같은 프로세스면 GIL을 나눠 써서 수치가 왜곡된다).
+app.run_sync()와 같은 흐름(iter_sync_pages → 배치 write_sync_batch)으로 임시 DB에 저장하고
+pages/s, 페이지 요청 지연 p50/p99, DB 쓰기 시간, 최대 RSS를 보고한다.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+import scraper  # noqa: E402
+
+BATCH_SIZE = 200
+
+
+def start_portal(args):
+    cmd = [sys.executable, os.path.join(ROOT, "bench", "fake_portal.py"), "--port", "0",
+           "--pages", str(args.pages), "--latency", str(args.latency), "--jitter", str(args.jitter),
+           "--error-rate", str(args.error_rate), "--rate-limit", str(args.rate_limit)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("PORT "):
+        proc.kill()
+        raise RuntimeError(f"가짜 포털 시작 실패: {line!r}")
+    return proc, f"http://127.0.0.1:{int(line.split()[1])}"
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[k]
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_sync(pool, options):
+    """app.run_sync()의 저장 흐름을 그대로 따라 하며 시간을 잰다."""
+    latencies = []
+    write_times = []
+    lock = threading.Lock()
+
+    fetch_page = scraper.fetch_page
+
+    def timed_fetch(params, refresh=False):
+        start = time.perf_counter()
+        try:
+            return fetch_page(params, refresh)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    def timed_write(conn, fingerprint, batch, pages):
+        start = time.perf_counter()
+        db.write_sync_batch(conn, fingerprint, batch, pages)
+        write_times.append(time.perf_counter() - start)
+
+    filters = {}
+    scraper.fetch_page = timed_fetch
+    try:
+        start = time.perf_counter()
+        job = pool.write(db.start_sync_job, filters)
+        batch, batch_pages, failed = [], [], []
+        pages = items = 0
+        for page in scraper.iter_sync_pages(skip_pages=job["completed"], total=job["total"],
+                                            **options):
+            pages += 1
+            if page["error"]:
+                failed.append(page["page"])
+            else:
+                batch_pages.append(page["page"])
+            batch.extend(page["items"])
+            items += len(page["items"])
+            if len(batch) >= BATCH_SIZE:
+                pool.write(timed_write, job["fingerprint"], batch, batch_pages)
+                batch, batch_pages = [], []
+        if batch or batch_pages:
+            pool.write(timed_write, job["fingerprint"], batch, batch_pages)
+        if not failed:
+            pool.write(db.finish_sync_job, job["fingerprint"])
+        elapsed = time.perf_counter() - start
+    finally:
+        scraper.fetch_page = fetch_page
+
+    return {
+        "pages": pages,
+        "items": items,
+        "failed_pages": sorted(failed),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0,
+        "requests": len(latencies),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "db_write_ms": round(sum(write_times) * 1000, 1),
+        "db_write_batches": len(write_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 포털 대상 동기화 부하 테스트")
+    parser.add_argument("--pages", type=int, default=100, help="포털 목록 페이지 수 (페이지당 10건)")
+    parser.add_argument("--latency", type=float, default=200, help="포털 평균 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=100, help="포털 지연 편차 ± (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="포털 503 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="포털 초당 허용 요청 수 (0=제한 없음)")
+    parser.add_argument("--min-workers", type=int, default=1)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--initial-workers", type=int, default=3)
+    parser.add_argument("--max-rps", type=float, default=6.0, help="클라이언트 초당 요청 상한")
+    parser.add_argument("--backoff", type=float, default=1.0, help="재시도 대기 기준 (초)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args()
+
+    proc, base_url = start_portal(args)
+    tmp = tempfile.mkdtemp(prefix="vf-bench-")
+    pool = None
+    try:
+        scraper.set_base_url(base_url)
+        pool = db.ConnectionPool(os.path.join(tmp, "bench.db"))
+        pool.write(db.init_db)
+
+        options = dict(min_workers=args.min_workers, max_workers=args.max_workers,
+                       initial_workers=args.initial_workers, max_rps=args.max_rps,
+                       backoff=args.backoff)
+        result = run_sync(pool, options)
+        with urllib.request.urlopen(base_url + "/__stats") as resp:
+            portal_stats = json.loads(resp.read())
+    finally:
+        if pool:
+            pool.close()
+        scraper.http_pool.close()
+        proc.terminate()
+        proc.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "portal": {"pages": args.pages, "latency_ms": args.latency, "jitter_ms": args.jitter,
+                   "error_rate": args.error_rate, "rate_limit": args.rate_limit},
+        "options": options,
+        "result": result,
+        "portal_stats": portal_stats,
+    }
+
+    print(f"\n페이지 {result['pages']}개 ({result['items']}건) / {result['seconds']}초 "
+          f"= {result['pages_per_sec']} pages/s")
+    print(f"요청 {result['requests']}회, 지연 p50 {result['latency_p50_ms']}ms / p99 {result['latency_p99_ms']}ms")
+    print(f"DB 쓰기 {result['db_write_ms']}ms ({result['db_write_batches']}배치), 최대 RSS {result['peak_rss_mb']}MB")
+    print(f"포털: 503 {portal_stats['errors_503']}회, 429 {portal_stats['rejected_429']}회, "
+          f"최대 동시 요청 {portal_stats['max_in_flight']}")
+    if result["failed_pages"]:
+        print(f"실패한 페이지: {result['failed_pages']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"리포트 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Claude CLI 대역. AI 검색을 CLI 없이 돌려보거나 ai_workers 풀을 시험할 때 쓴다.
+
+    AI_SEARCH_CLI=bench/fake_claude.py python app.py
+    FAKE_CLAUDE_STARTUP=2 FAKE_CLAUDE_LATENCY=0.5 python ai_workers.py
+
+진짜 CLI처럼 시작 비용(FAKE_CLAUDE_STARTUP초)을 치르고, 표준입력이 닫히면
+질의를 읽어 FAKE_CLAUDE_LATENCY초 뒤 `{"structured_output": {...}}`를 출력한다.
+질의 전체를 keyword로 돌려준다. 명령줄 인자는 무시한다.
+"""
+import json
+import os
+import sys
+import time
+
+time.sleep(float(os.environ.get("FAKE_CLAUDE_STARTUP", "1.0")))
+query = sys.stdin.read().strip()
+time.sleep(float(os.environ.get("FAKE_CLAUDE_LATENCY", "0.2")))
+
+if os.environ.get("FAKE_CLAUDE_FAIL"):
+    print("fake failure", file=sys.stderr)
+    sys.exit(1)
+
+print(json.dumps({
+    "type": "result",
+    "structured_output": {
+        "region": "", "district": "", "category": "", "activity_type": "", "target": "",
+        "status": "0", "keyword": query,
+    },
+}, ensure_ascii=False))
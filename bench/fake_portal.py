@@ -0,0 +1,274 @@
+"""로컬 가짜 1365 포털. 동기화 부하 테스트용.
+
+timeCptn.do(목록/상세)와 volsMberJson.do(시군구 JSON)를 흉내 낸다.
+목록 페이지는 페이지 번호로 결정되는 합성 데이터라 같은 설정이면 항상 같은 결과가 나온다.
+검색 필터는 무시하고 항상 같은 목록을 돌려준다.
+
+    python bench/fake_portal.py --port 8765 --pages 200 --latency 300 --error-rate 0.05
+    python app.py --portal http://127.0.0.1:8765
+
+GET /__stats 로 요청 수/오류 수를 JSON으로 볼 수 있다.
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PATH = "/vols/1572247904127/partcptn/timeCptn.do"
+DISTRICT_PATH = "/vols/P9210/mber/volsMberJson.do"
+PER_PAGE = 10
+FIRST_ID = 3000000
+
+_TITLES = [
+    "{n}일차 유적지 봉사활동",
+    "2026년 설맞이 직거래장터 행사장 운영 지원(오후)",
+    "청소년 활동 보조 및 콘텐츠 관리[09:00~13:00]",
+    "제{n}기 환경정화 봉사",
+    "2026.03.{d:02d} 하천 환경정화 활동",
+    "어르신 말벗 &amp; 식사 보조",
+    "무료급식소 배식 지원 - {n}",
+    "도서관 서가 정리 ({m}/{d})",
+    "온라인 멘토링 - 학습 지원",
+    "오전 경로당 청소",
+]
+_PLACES = [
+    ("서울특별시 구로구", "구로구자원봉사센터"),
+    ("서울특별시 강남구", "강남구청"),
+    ("서울 마포구", "마포구자원봉사센터"),
+    ("부산광역시 해운대구", "해운대구 복지관"),
+    ("경기도 수원시", "수원시자원봉사센터"),
+    ("온라인", "한국청소년활동진흥원"),
+]
+_CATEGORIES = ["교육", "환경·생태계보호", "생활편의", "문화·체육·예술·관광", "보건·의료"]
+DISTRICTS = {
+    "6110000": {"3160000": "구로구", "3220000": "강남구", "3130000": "마포구", "3000000": "종로구"},
+    "6260000": {"3330000": "해운대구", "3250000": "중구"},
+    "6410000": {"3740000": "수원시", "3780000": "성남시"},
+}
+
+
+def _list_item(program_id):
+    rnd = random.Random(program_id)
+    place, org = rnd.choice(_PLACES)
+    title = rnd.choice(_TITLES).format(n=rnd.randint(1, 20), m=rnd.randint(1, 12), d=rnd.randint(1, 28))
+    online = rnd.choice(["오프라인", "온라인", "온라인+오프라인"])
+    start = f"2026.{rnd.randint(3, 6):02d}.{rnd.randint(1, 28):02d}"
+    end = f"2026.{rnd.randint(7, 12):02d}.{rnd.randint(1, 28):02d}"
+    hours = rnd.randint(1, 8)
+    return f"""
+            <li>
+                <input type="hidden" name="progrmRegistNo" value="{program_id}">
+                <div class="ing blue"><ul>
+                    <li>시간인증</li><li>{online}</li><li>{rnd.choice(_CATEGORIES)}</li>
+                </ul></div>
+                <div class="tit_board_list">{title}</div>
+                <div class="vols-location"><span>{place}</span><span>{org}</span></div>
+                <div class="close_dDay"><div class="end">모집중</div></div>
+                <div class="txts_pc_ver">
+                    <div><p>봉사기간</p><span>{start} ~ {end}</span></div>
+                    <div><p>봉사시간</p><span>09:00 ~ {9 + hours:02d}:00</span></div>
+                    <div><p>모집기간</p><span>2026.01.01 ~ {start}</span></div>
+                    <div><p>인정시간</p><span>{hours}시간</span></div>
+                </div>
+                <div class="txts_mo_ver"><div><p>봉사기간</p><span>{start} ~ {end}</span></div></div>
+            </li>"""
+
+
+def list_page(page, total):
+    first = (page - 1) * PER_PAGE
+    ids = range(FIRST_ID + first, FIRST_ID + min(first + PER_PAGE, total))
+    items = "".join(_list_item(pid) for pid in ids)
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="UTF-8"><title>봉사활동 검색 | 1365 자원봉사포털</title></head>
+<body><div class="content">
+<div class="board_top"><p class="total">전체 <em>{total:,}</em>건</p></div>
+<ul class="list_wrap wrap2">{items}
+</ul>
+<div class="paging"><a href="#" class="on">{page}</a></div>
+</div></body></html>
+"""
+
+
+def detail_page(program_id):
+    try:
+        rnd = random.Random(int(program_id))
+    except ValueError:
+        return "<html><body><div class='error'>존재하지 않는 프로그램입니다.</div></body></html>"
+    place, org = rnd.choice(_PLACES)
+    hours = rnd.randint(1, 8)
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="UTF-8"><title>봉사활동 상세</title></head>
+<body><div class="board_view">
+<h3 class="tit_board_view">합성 봉사활동 {program_id} (모집중)</h3>
+<div class="board_data_show">
+    <dl><dt>봉사기간</dt><dd>2026.03.02 ~ 2026.06.30</dd></dl>
+    <dl><dt>봉사시간</dt><dd>10:00 ~ {10 + hours}:00 (최대 {hours}시간 인정)</dd></dl>
+    <dl><dt>모집기간</dt><dd>2026.02.01 ~ 2026.02.28</dd></dl>
+    <dl><dt>활동요일</dt><dd>월, 수, 금</dd></dl>
+    <dl><dt>모집인원</dt><dd>10 명 / 일</dd></dl>
+    <dl><dt>신청인원</dt><dd>{rnd.randint(0, 10)} 명</dd></dl>
+    <dl><dt>봉사분야</dt><dd>{rnd.choice(_CATEGORIES)}</dd></dl>
+    <dl><dt>봉사자유형</dt><dd>성인, 청소년</dd></dl>
+    <dl><dt>모집기관</dt><dd><span class="text-l">{org}</span></dd></dl>
+    <dl><dt>등록기관</dt><dd>{org}</dd></dl>
+    <dl><dt>봉사대상</dt><dd>아동·청소년</dd></dl>
+    <dl><dt>활동구분</dt><dd>오프라인</dd></dl>
+    <dl><dt>봉사장소</dt><dd>{place} 1-1</dd></dl>
+</div>
+<div class="board_body"><p>가짜 포털에서 만든 상세 설명입니다.</p></div>
+</div></body></html>
+"""
+
+
+class PortalState:
+    """설정 + 요청 통계 + 초당 요청 제한(토큰 버킷). 핸들러 스레드들이 공유한다."""
+
+    def __init__(self, pages=100, latency=0.2, jitter=0.1, error_rate=0.0,
+                 rate_limit=0.0, use_gzip=True):
+        self.total = pages * PER_PAGE
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.use_gzip = use_gzip
+        self.lock = threading.Lock()
+        self.tokens = rate_limit
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "list": 0, "detail": 0, "districts": 0,
+                      "errors_503": 0, "rejected_429": 0, "max_in_flight": 0}
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def allow(self):
+        """rate_limit(초당 요청 수)을 넘으면 False. 0이면 제한 없음."""
+        if not self.rate_limit:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.stats["requests"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+            # 동시 요청이 많을수록 느려지는 서버를 흉내 낸다
+            load = self.in_flight
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay * (1 + 0.05 * max(0, load - 4)))
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=UTF-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if self.state.use_gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data, 6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            return self._send(200, json.dumps(stats), "application/json")
+        self._send(404, "not found")
+
+    def do_POST(self):
+        state = self.state
+        length = int(self.headers.get("Content-Length") or 0)
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode("utf-8"))
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+
+        if not state.allow():
+            state.count("rejected_429")
+            return self._send(429, "too many requests")
+
+        delay = state.enter()
+        try:
+            time.sleep(delay)
+            if state.error_rate and random.random() < state.error_rate:
+                state.count("errors_503")
+                return self._send(503, "service unavailable")
+
+            if parts.path == DISTRICT_PATH:
+                state.count("districts")
+                upper = (form.get("upper") or [""])[0]
+                items = [{"code": c, "codeNm": n} for c, n in DISTRICTS.get(upper, {}).items()]
+                return self._send(200, json.dumps({"list": items}, ensure_ascii=False),
+                                  "application/json; charset=UTF-8")
+
+            if parts.path == API_PATH:
+                if (query.get("type") or [""])[0] == "show":
+                    state.count("detail")
+                    return self._send(200, detail_page((query.get("progrmRegistNo") or [""])[0]))
+                state.count("list")
+                page = int((form.get("cPage") or ["1"])[0])
+                return self._send(200, list_page(page, state.total))
+
+            self._send(404, "not found")
+        finally:
+            state.leave()
+
+
+def make_server(host="127.0.0.1", port=0, **options):
+    """서버를 만들어 돌려준다 (serve_forever()는 호출하는 쪽에서). port=0이면 빈 포트."""
+    handler = type("Handler", (_Handler,), {"state": PortalState(**options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 1365 포털 (부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0이면 빈 포트")
+    parser.add_argument("--pages", type=int, default=100, help="목록 페이지 수 (페이지당 10건)")
+    parser.add_argument("--latency", type=float, default=200, help="평균 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=100, help="지연 편차 ± (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="초당 허용 요청 수, 넘으면 429 (0=제한 없음)")
+    parser.add_argument("--no-gzip", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, pages=args.pages, latency=args.latency / 1000,
+                         jitter=args.jitter / 1000, error_rate=args.error_rate,
+                         rate_limit=args.rate_limit, use_gzip=not args.no_gzip)
+    # 하네스가 포트를 읽는다 (첫 줄)
+    print(f"PORT {server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 # 제목에서 제거할 변동 패턴 (날짜, 회차, 시간대 등)
 STRIP_PATTERNS = [
@@ -21,16 +22,76 @@ STRIP_PATTERNS = [
 
 _compiled = [re.compile(p) for p in STRIP_PATTERNS]
 
+# --- 한 번에 훑는 버전 ---
+# STRIP_PATTERNS를 순서대로 하나씩 적용한 결과와 같도록 만든 단일 정규식.
+# 같은 위치에서는 목록 앞쪽 패턴이 이긴다 (alternation 순서). 그 밖에 순차 적용과 달라지는 곳을 맞춘다:
+#   - 날짜 전체 뒤에 "차/기" 등이 붙으면 앞 패턴("11차")이 먼저 지우므로 날짜로 보지 않는다
+#   - 연도(\d{4})는 바로 뒤에서 날짜 전체가 시작하면 양보한다 ("32026.02.11")
+#   - 월 패턴은 앞 패턴들이 먼저 지웠을 부분("2월 3회차", "2월 2026")을 건너뛰고 꼬리를 이어 붙인다
+#   - 괄호 날짜는 "/" 형식만. "(2월15일)"의 안쪽은 순차 적용에서 월 패턴이 먼저 지운다
+# 앞/끝에 고정된 두 패턴은 나머지를 지운 뒤의 문자열에 적용해야 하므로 따로 돈다.
+# 공백으로 나뉜 토큰에서는 같은 결과를 낸다. 어긋나는 경우:
+#   - 다른 패턴 조각이 토큰 안에 끼어 있을 때 ("[09(2/15):00]")
+#   - 숫자 토큰이 공백 없이 붙어 있을 때. 순차 적용은 앞 패턴이 지운 자리에서 숫자가 새로 이어지거나
+#     날짜 꼬리가 먼저 지워져 연도만 남는데, 한 번에 훑을 때는 그런 토큰이 생기지 않는다
+#     ("2026.3.15기" → "3." / 순차 ".3.", "2월2일차 (오전) 10제3차 24시" → "1024시" / 순차 "시")
+_DATE = r"\d{4}[\.\-/]\d{1,2}[\.\-/]\d{1,2}"
+_BEFORE_MONTH = r"\d+일차|\d+회차|제?\d+차|제?\d+기|" + _DATE + r"|\d{4}년?"
+_FUSED_PATTERNS = [
+    r"\d+일차\s*",
+    r"\d+회차\s*",
+    r"제?\d+차\s*",
+    r"제?\d+기\s*",
+    _DATE + r"(?!\d*(?:일차|회차|차|기))\s*",
+    r"(?!\d{0,3}" + _DATE + r")\d{4}년?\s*",
+    r"\d{1,2}월\s*(?:(?:" + _BEFORE_MONTH + r")\s*)*\d{0,2}일?\s*",
+    r"\(\d{1,2}/\d{0,2}[일]?\)\s*",
+    r"\[\d{1,2}:\d{2}~?\d{0,2}:?\d{0,2}\]\s*",
+    r"\(\s*오전\s*\)\s*",
+    r"\(\s*오후\s*\)\s*",
+    r"오전\s*",
+    r"오후\s*",
+]
+# 모든 패턴이 숫자, "제", "(", "[", "오" 중 하나로 시작하므로 다른 글자에서는 대안을 하나씩 시도하지 않게 거른다
+_fused = re.compile(r"(?=[\d제(\[오])(?:" + "|".join(_FUSED_PATTERNS) + ")")
+_anchored = [re.compile(p) for p in STRIP_PATTERNS if p.startswith("^") or p.endswith("$")]
+_spaces = re.compile(r"\s+")
+
+# 그룹키 메모 크기 (제목 수). 동기화마다 같은 제목이 되풀이되므로 대부분 여기서 끝난다.
+GROUP_KEY_CACHE_SIZE = 8192
 
-def compute_group_key(title):
+
+def compute_group_key_reference(title):
+    """기준 구현: STRIP_PATTERNS를 하나씩 순서대로 적용한다. compute_group_key와 결과가 같아야 한다."""
     key = title.strip()
     for pattern in _compiled:
         key = pattern.sub("", key)
-    key = re.sub(r"\s+", " ", key).strip()
+    key = _spaces.sub(" ", key).strip()
     # 빈 문자열이 되면 원래 제목 사용
     return key if key else title.strip()
 
 
+def _fused_group_key(title):
+    key = _fused.sub("", title.strip())
+    for pattern in _anchored:
+        key = pattern.sub("", key)
+    key = _spaces.sub(" ", key).strip()
+    return key if key else title.strip()
+
+
+compute_group_key = lru_cache(maxsize=GROUP_KEY_CACHE_SIZE)(_fused_group_key)
+compute_group_key.__doc__ = "제목 → 그룹키. 정규식 한 번으로 변동 패턴을 지우고 결과를 LRU로 기억한다."
+
+
+def compute_group_keys(titles):
+    """한 페이지(여러 제목)의 그룹키 목록. 같은 제목은 한 번만 계산한다."""
+    seen = {}
+    for title in titles:
+        if title not in seen:
+            seen[title] = compute_group_key(title)
+    return [seen[title] for title in titles]
+
+
 def group_activities(activities):
     groups = {}
     for act in activities:
@@ -61,6 +122,46 @@ if __name__ == "__main__":
         print(f"    -> [{key}]")
         print()
 
+    print("=== 기준 구현과 비교 ===")
+    import random
+    import time
+
+    random.seed(0)
+    words = ["환경정화", "봉사활동", "유적지", "설맞이", "직거래장터", "행사장 운영 지원",
+             "급식 지원", "어르신 말벗", "학습 멘토링", "3단계", "1:1", "2인1조", "24시"]
+    prefixes = ["13일차", "3회차", "제5차", "5차", "제3기", "2026.02.11", "2026-02-13", "2026/3/1",
+                "2026년", "2026", "2월", "12월", "2월15일", "2월 15일", "3. ", "2025~2026"]
+    suffixes = ["(오전)", "(오후)", "(2/15)", "(2월15일)", "[09:00~13:00]", "[9:00~12:00]",
+                "- 3", "오전", "오후", "3회차", "1일차", "2차", "(12/3)", "[13:00]"]
+    corpus = list(test_titles)
+    for _ in range(20000):
+        parts = random.sample(prefixes, random.randint(0, 2)) + random.sample(words, random.randint(1, 4))
+        title = " ".join(parts)
+        for _ in range(random.randint(0, 2)):
+            title += random.choice(["", " "]) + random.choice(suffixes)
+        corpus.append(title)
+    mismatches = [t for t in corpus if _fused_group_key(t) != compute_group_key_reference(t)]
+    print(f"  일치 {len(corpus) - len(mismatches)}/{len(corpus)}")
+    for t in mismatches[:5]:
+        print(f"  불일치: {t!r} -> {_fused_group_key(t)!r} / {compute_group_key_reference(t)!r}")
+
+    # 숫자 토큰을 공백 없이 붙인 제목: 알려진 차이 (위 주석 참고). 얼마나 어긋나는지만 본다
+    glued_tokens = ["13일차", "3회차", "제5차", "5차", "제3기", "2026.02.11", "2026.3.15", "2026",
+                    "2월", "2월2일", "10", "24시", "(오전)", "(2/15)", "[09:00~13:00]", "급식", "기"]
+    glued = ["2026.3.15기", " 2월2일차 (오전) 10제3차 24시"]
+    glued += ["".join(random.sample(glued_tokens, random.randint(2, 4))) for _ in range(5000)]
+    glued_mismatches = [t for t in glued if _fused_group_key(t) != compute_group_key_reference(t)]
+    print(f"  붙여 쓴 숫자 토큰: 일치 {len(glued) - len(glued_mismatches)}/{len(glued)} (차이는 알려진 것)")
+    for t in glued_mismatches[:3]:
+        print(f"  차이: {t!r} -> {_fused_group_key(t)!r} / {compute_group_key_reference(t)!r}")
+    for name, fn in [("기준", compute_group_key_reference), ("단일 패스", _fused_group_key),
+                     ("단일 패스 + 메모 (처음)", compute_group_key), ("단일 패스 + 메모 (반복)", compute_group_key)]:
+        start = time.perf_counter()
+        for t in corpus[:GROUP_KEY_CACHE_SIZE]:
+            fn(t)
+        print(f"  {name}: {(time.perf_counter() - start) / GROUP_KEY_CACHE_SIZE * 1e6:.2f}µs/건")
+    print()
+
     print("=== 그룹핑 테스트 ===")
     acts = [{"title": t, "group_key": compute_group_key(t)} for t in test_titles]
     groups = group_activities(acts)
@@ -0,0 +1,192 @@
+import hashlib
+import operator
+import re
+import struct
+
+from categorizer import compute_group_key
+
+# MinHash 서명 길이와 LSH 밴드 구성 (BANDS * ROWS == NUM_PERM)
+NUM_PERM = 64
+BANDS = 16
+ROWS = 4
+# 서명 일치 비율(자카드 유사도 추정치)이 이 값 이상이면 같은 클러스터
+THRESHOLD = 0.5
+# 문자 n-gram 길이
+NGRAM = 3
+# 서명 방식(shingles/서명/버킷)이 바뀌면 올린다. 저장된 값과 다르면 db.init_clusters가 모두 다시 만든다
+VERSION = 2
+# 새 항목 하나당 비교할 후보 수 상한 (같은 제목이 수백 번 반복되는 프로그램 대비)
+MAX_CANDIDATES = 64
+
+_SIG = struct.Struct(f"<{NUM_PERM}I")
+# 저장된 서명 길이. 다르면 예전 방식의 서명이다 (db.init_clusters가 다시 만든다)
+SIG_BYTES = _SIG.size
+_NOISE_RE = re.compile(r"[\s\W_]+")
+
+
+def shingles(title, organization=""):
+    """제목(날짜/회차를 뺀 그룹키)의 문자 3-gram 집합 + 기관명 원소 하나.
+
+    기관명은 gram으로 쪼개지 않고 한 원소로만 넣는다. 제목이 겹치지 않으면 기관이 같아도
+    자카드 유사도는 많아야 1/3이라 THRESHOLD에 못 미치고, 제목이 비슷할 때만 같은 기관 쪽으로 기운다.
+    제목에서 gram이 안 나오면 빈 집합.
+    """
+    text = _NOISE_RE.sub("", compute_group_key(title).lower()) if title else ""
+    if not text:
+        return set()
+    if len(text) <= NGRAM:
+        grams = {"t" + text}
+    else:
+        grams = {"t" + text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+    org = _NOISE_RE.sub("", (organization or "").lower())
+    if org:
+        grams.add("o" + org)
+    return grams
+
+
+def signature(title, organization=""):
+    """MinHash 서명 (NUM_PERM개 32비트 값의 bytes). gram이 없으면 None.
+
+    gram마다 SHAKE-128로 NUM_PERM개 해시를 한 번에 뽑고 자리별 최솟값을 취한다.
+    """
+    grams = shingles(title, organization)
+    if not grams:
+        return None
+    rows = [_SIG.unpack(hashlib.shake_128(g.encode("utf-8")).digest(4 * NUM_PERM)) for g in grams]
+    return _SIG.pack(*map(min, zip(*rows)))
+
+
+def bucket_keys(sig):
+    """LSH 버킷 키 BANDS개 (밴드 번호 + 밴드 값의 64비트 해시, SQLite INTEGER 범위)."""
+    width = 4 * ROWS
+    return [int.from_bytes(hashlib.blake2b(bytes([band]) + sig[band * width:(band + 1) * width],
+                                           digest_size=8).digest(), "little", signed=True)
+            for band in range(BANDS)]
+
+
+def similarity(sig_a, sig_b):
+    """두 서명의 일치 비율 (자카드 유사도 추정치)."""
+    return sum(map(operator.eq, _SIG.unpack(sig_a), _SIG.unpack(sig_b))) / NUM_PERM
+
+
+def candidate_ids(keys, buckets, limit=MAX_CANDIDATES):
+    """버킷 키들의 후보 program_id (중복 없이 최대 limit개). buckets: 키 -> 오래된 것부터 쌓인 id 목록.
+
+    버킷마다 최근 것부터 본다. cluster_items와 db.assign_clusters가 같은 순서로 후보를 고른다.
+    """
+    seen = {}
+    for key in keys:
+        for other in reversed(buckets.get(key, ())):
+            if len(seen) >= limit:
+                return list(seen)
+            seen.setdefault(other, None)
+    return list(seen)
+
+
+def choose_cluster(sig, candidates):
+    """같은 버킷 후보 [(cluster_id, 서명)] 중 THRESHOLD 이상 비슷한 것들의 클러스터 → (들어갈 id, 합칠 id 집합).
+
+    비슷한 후보가 없으면 (None, 빈 집합). 여러 클러스터와 비슷하면 가장 작은 id로 합친다
+    (새 항목이 두 클러스터를 잇는 경우. 결과는 유사도 그래프의 연결 요소).
+    """
+    mine = _SIG.unpack(sig)
+    need = THRESHOLD * NUM_PERM
+    matched = set()
+    for cid, other in candidates:
+        # 이미 들어가기로 한 클러스터의 다른 후보는 비교할 필요가 없다
+        if cid not in matched and sum(map(operator.eq, mine, _SIG.unpack(other))) >= need:
+            matched.add(cid)
+    if not matched:
+        return None, set()
+    target = min(matched)
+    return target, matched - {target}
+
+
+def cluster_items(items):
+    """메모리에서 한 번에 클러스터링한다 → {program_id: cluster_id}. db.assign_clusters와 같은 규칙.
+
+    items는 program_id, title, organization을 가진 dict. 앞에서부터 하나씩 넣으며
+    같은 버킷 후보(최근 MAX_CANDIDATES개)와 비교해 클러스터를 정한다. 비슷한 것이 없으면
+    자기 program_id가 새 클러스터 id가 된다.
+    """
+    buckets = {}
+    sigs = {}
+    clusters = {}
+    members = {}
+    for item in items:
+        pid = item["program_id"]
+        sig = signature(item.get("title"), item.get("organization"))
+        if sig is None:
+            clusters[pid] = pid
+            continue
+        keys = bucket_keys(sig)
+        candidates = [(clusters[other], sigs[other]) for other in candidate_ids(keys, buckets)]
+        target, merged = choose_cluster(sig, candidates)
+        target = target or pid
+        for cid in merged:
+            moved = members.pop(cid)
+            for other in moved:
+                clusters[other] = target
+            members[target].extend(moved)
+        clusters[pid] = target
+        members.setdefault(target, []).append(pid)
+        sigs[pid] = sig
+        for key in keys:
+            buckets.setdefault(key, []).append(pid)
+    return clusters
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    samples = [
+        ("1", "유적지 봉사활동 (경복궁)", "종로구자원봉사센터"),
+        ("2", "유적지 봉사활동 (창덕궁)", "종로구자원봉사센터"),
+        ("3", "13일차 유적지 봉사활동 [경복궁]", "종로구자원봉사센터"),
+        ("4", "2026년 설맞이 직거래장터 행사장 운영 지원(오후)", "구로구자원봉사센터"),
+        ("5", "설맞이 직거래장터 행사장 운영 지원 - 구로역 광장", "구로구자원봉사센터"),
+        ("6", "어르신 말벗 봉사", "강남노인복지관"),
+        ("7", "초등학생 학습 멘토링", "마포구청소년센터"),
+    ]
+    items = [{"program_id": p, "title": t, "organization": o} for p, t, o in samples]
+    clusters = cluster_items(items)
+    for item in items:
+        print(f"  [{clusters[item['program_id']]}] {item['title']} / {item['organization']}")
+
+    # 같은 기관의 서로 다른 짧은 제목은 기관명만으로 묶이면 안 된다
+    same_org = [{"program_id": f"n{i}", "title": t, "organization": "종로구자원봉사센터"}
+                for i, t in enumerate(["급식 봉사", "방역 봉사", "도서관 정리", "어르신 말벗"])]
+    found = cluster_items(same_org)
+    print(f"  같은 기관, 다른 제목 {len(same_org)}건 → 클러스터 {len(set(found.values()))}개 (기대: {len(same_org)}개)")
+
+    # LSH 후보 찾기가 전수 비교와 얼마나 같은 쌍을 찾는지 (재현율) + 속도
+    random.seed(0)
+    words = ["환경정화", "봉사활동", "유적지", "직거래장터", "행사장", "운영지원", "급식", "어르신",
+             "말벗", "학습", "멘토링", "도서관", "정리", "캠페인", "방역", "안내"]
+    places = ["경복궁", "창덕궁", "구로역", "시청", "한강공원", "복지관", "주민센터", "체육관"]
+    orgs = [f"{w}자원봉사센터" for w in ["종로구", "구로구", "마포구", "강남구", "서초구", "중구"]]
+    bases = [(" ".join(random.sample(words, 3)), random.choice(orgs)) for _ in range(400)]
+    corpus = []
+    for i in range(4000):
+        title, org = random.choice(bases)
+        corpus.append({"program_id": f"{i:05d}", "title": f"{title} ({random.choice(places)})",
+                       "organization": org})
+
+    start = time.perf_counter()
+    sigs = [signature(c["title"], c["organization"]) for c in corpus]
+    sig_time = time.perf_counter() - start
+    start = time.perf_counter()
+    clusters = cluster_items(corpus)
+    lsh_time = time.perf_counter() - start
+    print(f"\n서명 {len(corpus)}건: {sig_time / len(corpus) * 1e6:.0f}µs/건, "
+          f"클러스터링(서명 포함) {lsh_time:.2f}초 → 클러스터 {len(set(clusters.values()))}개")
+
+    sample = random.sample(range(len(corpus)), 100)
+    pairs = found = 0
+    for i in sample:
+        for j in range(len(corpus)):
+            if i != j and similarity(sigs[i], sigs[j]) >= THRESHOLD:
+                pairs += 1
+                found += clusters[corpus[i]["program_id"]] == clusters[corpus[j]["program_id"]]
+    print(f"전수 비교로 찾은 유사 쌍 중 같은 클러스터: {found}/{pairs}")
@@ -1,18 +1,141 @@
 import sqlite3
 import os
+import re
 import json
+import base64
+import hashlib
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+
+import cluster
+from categorizer import compute_group_key
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "data", "volunteer.db")
 
+# 전문검색 대상 컬럼 (activities_fts 컬럼 순서와 동일)
+FTS_COLUMNS = ("title", "organization", "description", "location")
+# bm25 컬럼 가중치: 제목 > 기관 > 장소 > 설명
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+
+_WORD_RE = re.compile(r"[^\W_]+")
 
-def get_conn(db_path=DB_PATH):
-    conn = sqlite3.connect(db_path)
+
+def get_conn(db_path=DB_PATH, check_same_thread=True):
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+class _Reader:
+    # 스레드 로컬에 넣어 두는 상자. 스레드가 끝나 이 상자가 사라지면 연결을 닫는다 (weakref.finalize)
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionPool:
+    """스레드별 읽기 전용 연결 + 단일 쓰기 연결.
+
+    WAL 모드에서는 읽기끼리, 읽기와 쓰기가 서로 막지 않으므로 요청 스레드마다
+    읽기 연결을 하나씩 준다. 스레드가 끝나면 그 연결도 닫는다 (동기화 스레드처럼 잠깐 쓰는 스레드가
+    연결과 mmap을 남기지 않게). 쓰기는 전용 스레드 하나가 큐에서 꺼내 순서대로 실행해
+    SQLITE_BUSY 없이 직렬화된다.
+
+        with pool.read() as conn:
+            rows = db.search_activities(conn, filters)
+        pool.write(db.add_review, program_id, rating, content)
+
+    쓰기 함수 안에서 다시 pool.write()를 부르면 교착되므로 conn 인자만 사용한다.
+    """
+
+    def __init__(self, db_path=DB_PATH, cache_size=-16000, mmap_size=256 * 1024 * 1024):
+        self.db_path = db_path
+        self.cache_size = cache_size  # 음수는 KiB 단위 (-16000 ≈ 16MB)
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._readers = set()
+        self._readers_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+        self._writer.start()
+
+    def reader(self):
+        """현재 스레드의 읽기 전용 연결 (없으면 생성)."""
+        holder = getattr(self._local, "reader", None)
+        if holder is None:
+            # close()나 스레드 종료 시 다른 스레드가 닫을 수 있도록 check_same_thread=False
+            conn = get_conn(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA query_only=ON")
+            conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            holder = self._local.reader = _Reader(conn)
+            with self._readers_lock:
+                self._readers.add(conn)
+            weakref.finalize(holder, self._release, conn)
+        return holder.conn
+
+    def _release(self, conn):
+        with self._readers_lock:
+            self._readers.discard(conn)
+        conn.close()
+
+    @contextmanager
+    def read(self):
+        """한 읽기 트랜잭션(같은 스냅샷) 안에서 여러 쿼리를 실행한다."""
+        conn = self.reader()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.commit()
+
+    def submit(self, fn, *args, **kwargs):
+        """쓰기 작업을 큐에 넣고 Future를 반환한다. fn(conn, *args, **kwargs)"""
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def write(self, fn, *args, **kwargs):
+        """쓰기 작업을 실행하고 결과를 기다린다."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _write_loop(self):
+        conn = get_conn(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                fn, args, kwargs, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = fn(conn, *args, **kwargs)
+                except BaseException as e:
+                    conn.rollback()
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            conn.close()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+
 def init_db(conn):
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS activities (
@@ -38,7 +161,9 @@ def init_db(conn):
             active_days     TEXT,
             volunteer_type  TEXT,
             register_org    TEXT,
-            detail_fetched  INTEGER DEFAULT 0
+            detail_fetched  INTEGER DEFAULT 0,
+            region_code     TEXT,
+            district_code   TEXT
         );
 
         CREATE TABLE IF NOT EXISTS reviews (
@@ -59,8 +184,75 @@ def init_db(conn):
             FOREIGN KEY (program_id) REFERENCES activities(program_id)
         );
 
-        CREATE INDEX IF NOT EXISTS idx_activities_group_key ON activities(group_key);
-        CREATE INDEX IF NOT EXISTS idx_reviews_program_id ON reviews(program_id);
+        CREATE TABLE IF NOT EXISTS sync_meta (
+            id              INTEGER PRIMARY KEY CHECK(id = 1),
+            row_count       INTEGER NOT NULL DEFAULT 0,
+            last_sync       TEXT,
+            cluster_version INTEGER NOT NULL DEFAULT 0   -- 저장된 MinHash 서명의 cluster.VERSION
+        );
+
+        CREATE TABLE IF NOT EXISTS sync_filter_meta (
+            fingerprint     TEXT PRIMARY KEY,
+            filters         TEXT NOT NULL,
+            last_sync       TEXT NOT NULL,
+            item_count      INTEGER NOT NULL DEFAULT 0,
+            last_full_sync  TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS sync_jobs (
+            fingerprint     TEXT PRIMARY KEY,
+            filters         TEXT NOT NULL,
+            total           INTEGER,
+            total_pages     INTEGER,
+            started_at      TEXT NOT NULL,
+            updated_at      TEXT NOT NULL,
+            finished_at     TEXT,
+            item_count      INTEGER NOT NULL DEFAULT 0   -- 이어받은 실행까지 합친 받은 활동 수
+        );
+
+        CREATE TABLE IF NOT EXISTS sync_job_pages (
+            fingerprint     TEXT NOT NULL,
+            page            INTEGER NOT NULL,
+            PRIMARY KEY (fingerprint, page)
+        ) WITHOUT ROWID;
+
+        -- 시/도별 시군구 코드 (포털 volsMberJson.do 응답 보관)
+        CREATE TABLE IF NOT EXISTS districts (
+            region_code     TEXT NOT NULL,
+            code            TEXT NOT NULL,
+            name            TEXT NOT NULL,
+            sort_order      INTEGER NOT NULL DEFAULT 0,  -- 포털 응답 순서 (드롭다운 표시 순서)
+            PRIMARY KEY (region_code, code)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS district_meta (
+            region_code     TEXT PRIMARY KEY,
+            refreshed_at    TEXT NOT NULL
+        );
+
+        -- AI 검색: 정규화한 질의 → 검색 파라미터(JSON)
+        CREATE TABLE IF NOT EXISTS ai_query_cache (
+            query_key       TEXT PRIMARY KEY,
+            query           TEXT NOT NULL,
+            params          TEXT NOT NULL,
+            created_at      TEXT NOT NULL
+        );
+
+        -- 유사 활동 클러스터링: MinHash 서명과 LSH 버킷 (cluster.py)
+        CREATE TABLE IF NOT EXISTS activity_minhash (
+            program_id      TEXT PRIMARY KEY,
+            signature       BLOB NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            bucket          INTEGER NOT NULL,
+            program_id      TEXT NOT NULL,
+            PRIMARY KEY (bucket, program_id)
+        ) WITHOUT ROWID;
+
+        -- 상세 페이지: 활동별 최근 리뷰를 정렬 없이 읽는다 (program_id 단일 인덱스를 대체)
+        CREATE INDEX IF NOT EXISTS idx_reviews_recent ON reviews(program_id, created_at DESC, id DESC);
+        DROP INDEX IF EXISTS idx_reviews_program_id;
     """)
     # 기존 DB 마이그레이션: 새 컬럼 추가
     existing = {row[1] for row in conn.execute("PRAGMA table_info(activities)").fetchall()}
@@ -73,30 +265,411 @@ def init_db(conn):
         ("volunteer_type", "TEXT"),
         ("register_org", "TEXT"),
         ("detail_fetched", "INTEGER DEFAULT 0"),
+        ("region_code", "TEXT"),
+        ("district_code", "TEXT"),
+        ("cluster_id", "TEXT"),
+        ("fts_id", "INTEGER"),
     ]
     for col_name, col_type in new_cols:
         if col_name not in existing:
             conn.execute(f"ALTER TABLE activities ADD COLUMN {col_name} {col_type}")
+    if "fts_id" not in existing:
+        # 예전 색인은 activities의 암묵적 rowid를 썼다 (VACUUM에 바뀔 수 있음) → 새 키로 다시 만든다
+        conn.execute("DROP TABLE IF EXISTS activities_fts")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_fts_id ON activities(fts_id)")
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(sync_filter_meta)").fetchall()}
+    if "last_full_sync" not in existing:
+        conn.execute("ALTER TABLE sync_filter_meta ADD COLUMN last_full_sync TEXT")
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(sync_jobs)").fetchall()}
+    if "item_count" not in existing:
+        conn.execute("ALTER TABLE sync_jobs ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0")
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(sync_meta)").fetchall()}
+    if "cluster_version" not in existing:
+        conn.execute("ALTER TABLE sync_meta ADD COLUMN cluster_version INTEGER NOT NULL DEFAULT 0")
+
+    # 키셋 페이지네이션: (period_start, program_id) 행 값 비교에 NULL이 끼면 안 된다
+    conn.execute("UPDATE activities SET period_start = '' WHERE period_start IS NULL")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activities_period ON activities(period_start DESC, program_id DESC)"
+    )
+    # 지역 필터는 등치 비교 후 바로 같은 순서로 페이지를 읽는다
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_activities_region
+        ON activities(region_code, district_code, period_start DESC, program_id DESC)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_activities_cluster ON activities(cluster_id)")
+    # 묶음 멤버 조회/요약 계산: group_key 등치 후 최근 순 (group_key 단일 인덱스를 대체)
+    conn.execute("DROP INDEX IF EXISTS idx_activities_group_key")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_activities_group
+        ON activities(group_key, period_start DESC, program_id DESC)
+    """)
+    conn.commit()
+
+    init_sync_meta(conn)
+    init_fts(conn)
+    init_groups(conn)
+    init_clusters(conn)
+
+
+def init_sync_meta(conn):
+    """활동 수는 트리거로 유지해 get_sync_stats()가 테이블을 훑지 않게 한다."""
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_activities_count_ins AFTER INSERT ON activities
+        BEGIN
+            UPDATE sync_meta SET row_count = row_count + 1 WHERE id = 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_activities_count_del AFTER DELETE ON activities
+        BEGIN
+            UPDATE sync_meta SET row_count = row_count - 1 WHERE id = 1;
+        END;
+    """)
+    # 기존 DB: 처음 한 번만 집계
+    conn.execute("""
+        INSERT OR IGNORE INTO sync_meta (id, row_count, last_sync)
+        SELECT 1, COUNT(*), MAX(fetched_at) FROM activities
+    """)
+    conn.commit()
+
+
+# --- 전문검색 (FTS5) ---
+#
+# SQLite 내장 토크나이저는 한글 부분 문자열 검색이 안 되므로
+# 단어마다 2-gram으로 쪼갠 텍스트를 색인한다. ("환경정화" → "환경 경정 정화")
+# 검색어도 같은 방식으로 쪼개 구(phrase) 검색하면 LIKE '%환경정%'과 같은 결과를 인덱스로 얻는다.
+
+def ngram_text(text):
+    """색인용 2-gram 텍스트. 한 글자 단어는 그대로 둔다."""
+    if not text:
+        return ""
+    grams = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) < 2:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return " ".join(grams)
+
+
+def build_fts_query(keyword):
+    """검색어 → FTS5 MATCH 식. 한 글자 단어가 있으면 인덱스를 쓸 수 없으므로 None."""
+    words = _WORD_RE.findall(keyword.lower())
+    if not words or any(len(w) < 2 for w in words):
+        return None
+    return " AND ".join(f'"{ngram_text(w)}"' for w in words)
+
+
+def init_fts(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities_fts'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE activities_fts USING fts5(
+            {", ".join(FTS_COLUMNS)}, tokenize = 'unicode61'
+        )
+    """)
+    # 기존 DB: 이미 저장된 활동 전체 색인
+    _assign_fts_ids(conn, [r[0] for r in conn.execute("SELECT program_id FROM activities WHERE fts_id IS NULL")])
+    rows = conn.execute(f"SELECT fts_id, {', '.join(FTS_COLUMNS)} FROM activities").fetchall()
+    conn.executemany(
+        "INSERT INTO activities_fts (rowid, title, organization, description, location) VALUES (?, ?, ?, ?, ?)",
+        [(r[0], *(ngram_text(v) for v in r[1:])) for r in rows]
+    )
+    conn.commit()
+
+
+def _assign_fts_ids(conn, program_ids):
+    """fts_id가 없는 활동에 새 번호를 매긴다. FTS rowid로 쓰는 명시적 정수 키
+    (TEXT 기본키 테이블의 암묵적 rowid는 VACUUM에 바뀔 수 있다)."""
+    if not program_ids:
+        return
+    next_id = conn.execute("SELECT COALESCE(MAX(fts_id), 0) + 1 FROM activities").fetchone()[0]
+    conn.executemany("UPDATE activities SET fts_id = ? WHERE program_id = ?",
+                     [(next_id + i, pid) for i, pid in enumerate(program_ids)])
+
+
+def index_activities(conn, program_ids):
+    """활동 추가/수정 후 FTS 색인 갱신 (커밋은 호출자가 한다)."""
+    if not program_ids:
+        return
+    program_ids = list(program_ids)
+    for i in range(0, len(program_ids), 500):
+        chunk = program_ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        _assign_fts_ids(conn, [r[0] for r in conn.execute(
+            f"SELECT program_id FROM activities WHERE program_id IN ({marks}) AND fts_id IS NULL", chunk
+        )])
+        rows = conn.execute(
+            f"SELECT fts_id, {', '.join(FTS_COLUMNS)} FROM activities WHERE program_id IN ({marks})",
+            chunk
+        ).fetchall()
+        conn.executemany("DELETE FROM activities_fts WHERE rowid = ?", [(r[0],) for r in rows])
+        conn.executemany(
+            "INSERT INTO activities_fts (rowid, title, organization, description, location) VALUES (?, ?, ?, ?, ?)",
+            [(r[0], *(ngram_text(v) for v in r[1:])) for r in rows]
+        )
+
+
+def backfill_region_codes(conn, resolve, region_code=None):
+    """지역/시군구 코드가 비어 있는 활동을 주소로 다시 채운다. resolve(location) -> (지역, 시군구).
+
+    시군구 목록을 받기 전에 저장된 활동은 district_code가 ''로 남으므로 그것도 다시 본다.
+    region_code를 주면 그 지역만 (그 지역 시군구 목록을 새로 받았을 때). 바뀐 행 수를 반환한다.
+    """
+    if region_code:
+        rows = conn.execute(
+            "SELECT program_id, location, region_code, district_code FROM activities "
+            "WHERE region_code = ? AND COALESCE(district_code, '') = ''", (region_code,)
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT program_id, location, region_code, district_code FROM activities "
+            "WHERE region_code IS NULL OR COALESCE(district_code, '') = ''"
+        ).fetchall()
+    changed = []
+    for r in rows:
+        codes = resolve(r["location"])
+        if codes != (r["region_code"], r["district_code"]):
+            changed.append((*codes, r["program_id"]))
+    if not changed:
+        return 0
+    conn.executemany(
+        "UPDATE activities SET region_code = ?, district_code = ? WHERE program_id = ?", changed
+    )
+    conn.commit()
+    return len(changed)
+
+
+# --- 묶음 요약 (groups) ---
+#
+# 검색 결과는 group_key 묶음 단위로 페이지를 나눈다 (search_groups).
+# 묶음마다 전체 멤버 기준 요약을 저장해 두고, 활동이 추가/수정되면 그 묶음만 다시 계산한다.
+# 대표 활동은 모집중인 멤버 중 가장 최근 것 (없으면 가장 최근 멤버).
+
+_GROUP_SUMMARY = """
+    SELECT group_key, COUNT(*), COALESCE(SUM(recruit_status = '모집중'), 0),
+           MIN(period_start), MAX(COALESCE(period_end, '')), MAX(period_start),
+           (SELECT r.program_id FROM activities r WHERE r.group_key = a.group_key
+            ORDER BY r.recruit_status = '모집중' DESC, r.period_start DESC, r.program_id DESC LIMIT 1)
+    FROM activities a
+"""
+
+
+def init_groups(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'groups'"
+    ).fetchone()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS groups (
+            group_key       TEXT PRIMARY KEY,
+            member_count    INTEGER NOT NULL,
+            open_count      INTEGER NOT NULL,            -- 모집중 멤버 수
+            min_period      TEXT NOT NULL,               -- 가장 이른 period_start
+            max_period      TEXT NOT NULL,               -- 가장 늦은 period_end
+            latest_start    TEXT NOT NULL,               -- 가장 늦은 period_start (정렬 키)
+            rep_program_id  TEXT NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_groups_latest ON groups(latest_start DESC, group_key DESC);
+        CREATE INDEX IF NOT EXISTS idx_groups_open
+            ON groups(latest_start DESC, group_key DESC) WHERE open_count > 0;
+    """)
+    if exists:
+        return
+    # 기존 DB: 전체 묶음 한 번에 계산
+    conn.execute(f"INSERT INTO groups {_GROUP_SUMMARY} WHERE group_key IS NOT NULL GROUP BY group_key")
+    conn.commit()
+
+
+def refresh_groups(conn, group_keys):
+    """활동 추가/수정 후 해당 묶음 요약 다시 계산 (커밋은 호출자가 한다)."""
+    group_keys = [k for k in set(group_keys) if k]
+    for i in range(0, len(group_keys), 500):
+        chunk = group_keys[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM groups WHERE group_key IN ({marks})", chunk)
+        conn.execute(f"INSERT INTO groups {_GROUP_SUMMARY} WHERE group_key IN ({marks}) GROUP BY group_key", chunk)
+
+
+# --- 유사 활동 클러스터링 (MinHash/LSH) ---
+#
+# group_key는 날짜/회차를 지운 제목이 글자 그대로 같아야 묶인다.
+# cluster_id는 제목의 3-gram 유사도(기관명은 원소 하나로만 더한다)로 묶어 장소 꼬리표나 괄호 문구만 다른 반복 프로그램도 잡는다.
+# 새 활동은 LSH 버킷이 겹치는 기존 활동(최대 cluster.MAX_CANDIDATES개)하고만 비교한다.
+
+def init_clusters(conn):
+    """저장된 서명이 예전 방식(cluster.VERSION이 다름)이면 지우고 cluster_id를 비운다.
+
+    다시 채우는 것은 서버 시작 시 백그라운드 backfill_clusters가 한다.
+    """
+    version = conn.execute("SELECT cluster_version FROM sync_meta WHERE id = 1").fetchone()[0]
+    if version == cluster.VERSION:
+        return
+    conn.execute("DELETE FROM activity_minhash")
+    conn.execute("DELETE FROM lsh_buckets")
+    conn.execute("UPDATE activities SET cluster_id = NULL WHERE cluster_id IS NOT NULL")
+    conn.execute("UPDATE sync_meta SET cluster_version = ? WHERE id = 1", (cluster.VERSION,))
+    conn.commit()
+
+
+def assign_clusters(conn, program_ids):
+    """활동들의 MinHash 서명/버킷을 저장하고 cluster_id를 정한다 (커밋은 호출자가 한다).
+
+    순서대로 하나씩 넣으므로 같은 배치 안의 앞 활동과도 묶인다.
+    새 활동이 두 클러스터를 이으면 작은 id 쪽으로 합친다.
+    이미 서명이 있는 활동(제목/기관명이 바뀐 경우)은 예전 버킷 행을 지우고 다시 배정한다.
+    후보는 200건마다 한 문장으로 읽는다 (청크의 모든 버킷 키, 버킷마다 최근 MAX_CANDIDATES개).
+    """
+    ids = sorted(program_ids)
+    for i in range(0, len(ids), 200):
+        chunk = ids[i:i + 200]
+        marks = ",".join("?" * len(chunk))
+        rows = conn.execute(f"""
+            SELECT a.program_id, a.title, a.organization, m.signature
+            FROM activities a LEFT JOIN activity_minhash m ON m.program_id = a.program_id
+            WHERE a.program_id IN ({marks})
+            ORDER BY a.program_id
+        """, chunk).fetchall()
+        # 다시 배정하는 활동: 예전 서명으로 버킷 키를 구해 PK로 지운다
+        old = [r[0] for r in rows if r[3] is not None]
+        if old:
+            conn.executemany("DELETE FROM lsh_buckets WHERE bucket = ? AND program_id = ?",
+                             [(key, r[0]) for r in rows if r[3] is not None for key in cluster.bucket_keys(r[3])])
+            conn.executemany("DELETE FROM activity_minhash WHERE program_id = ?", [(pid,) for pid in old])
+
+        items = []
+        for r in rows:
+            sig = cluster.signature(r["title"], r["organization"])
+            items.append((r[0], sig, cluster.bucket_keys(sig) if sig is not None else None))
+        keys = list({key for _, _, item_keys in items if item_keys for key in item_keys})
+        buckets = {}    # 버킷 키 -> program_id 목록 (오래된 것부터)
+        sigs = {}
+        clusters = {}   # program_id -> cluster_id (읽어 온 후보와 이 청크의 활동)
+        members = {}    # cluster_id -> 그 클러스터에 속한 program_id (clusters의 역방향)
+        if keys:
+            # 버킷 행은 PK 순서(bucket, program_id)로 오고, 버킷마다 최근 MAX_CANDIDATES개만 남긴다.
+            # (창 함수로 SQL에서 자르는 것보다 다 읽고 여기서 자르는 편이 빨랐다)
+            for bucket, other in conn.execute(
+                f"SELECT bucket, program_id FROM lsh_buckets WHERE bucket IN ({','.join('?' * len(keys))})", keys
+            ):
+                buckets.setdefault(bucket, []).append(other)
+            for key, found in buckets.items():
+                if len(found) > cluster.MAX_CANDIDATES:
+                    buckets[key] = found[-cluster.MAX_CANDIDATES:]
+            others = list({o for found in buckets.values() for o in found})
+            for j in range(0, len(others), 500):
+                part = others[j:j + 500]
+                for other, sig, cid in conn.execute(f"""
+                    SELECT m.program_id, m.signature, a.cluster_id
+                    FROM activity_minhash m JOIN activities a ON a.program_id = m.program_id
+                    WHERE m.program_id IN ({",".join("?" * len(part))}) AND a.cluster_id IS NOT NULL
+                """, part):
+                    sigs[other] = sig
+                    clusters[other] = cid
+                    members.setdefault(cid, []).append(other)
+
+        merged_into = {}   # 합쳐진 cluster_id -> 합친 cluster_id (DB의 다른 멤버는 청크 끝에 한 번에 옮긴다)
+        new_sigs = []
+        new_buckets = []
+        for program_id, sig, item_keys in items:
+            if sig is None:
+                clusters[program_id] = program_id
+                continue
+            # cluster_id가 아직 없는 후보(백필 전 활동)는 뺀다
+            candidates = [(clusters[o], sigs[o]) for o in cluster.candidate_ids(item_keys, buckets) if o in clusters]
+            target, merged = cluster.choose_cluster(sig, candidates)
+            target = target or program_id
+            for cid in merged:
+                merged_into[cid] = target
+                for other in members.pop(cid, ()):
+                    clusters[other] = target
+                    members.setdefault(target, []).append(other)
+            clusters[program_id] = target
+            members.setdefault(target, []).append(program_id)
+            sigs[program_id] = sig
+            for key in item_keys:
+                buckets.setdefault(key, []).append(program_id)
+            new_sigs.append((program_id, sig))
+            new_buckets.extend((key, program_id) for key in item_keys)
+
+        for cid, target in merged_into.items():
+            while target in merged_into:
+                target = merged_into[target]
+            merged_into[cid] = target
+        conn.executemany("UPDATE activities SET cluster_id = ? WHERE cluster_id = ?",
+                         [(target, cid) for cid, target in merged_into.items()])
+        conn.executemany("INSERT OR REPLACE INTO activity_minhash (program_id, signature) VALUES (?, ?)", new_sigs)
+        conn.executemany("INSERT OR IGNORE INTO lsh_buckets (bucket, program_id) VALUES (?, ?)", new_buckets)
+        conn.executemany("UPDATE activities SET cluster_id = ? WHERE program_id = ?",
+                         [(clusters[pid], pid) for pid, _, _ in items])
+
+
+def backfill_clusters(conn, limit=200):
+    """cluster_id가 없는 기존 활동을 limit개씩 클러스터링한다 → 처리한 수 (0이면 끝).
+
+    빈 제목(상세 페이지에서 만든 임시 레코드)은 건너뛴다.
+    """
+    ids = [r[0] for r in conn.execute(
+        "SELECT program_id FROM activities WHERE cluster_id IS NULL AND COALESCE(title, '') != '' "
+        "ORDER BY program_id LIMIT ?", (limit,)
+    )]
+    assign_clusters(conn, ids)
+    conn.commit()
+    return len(ids)
+
+
+def get_cluster_activities(conn, cluster_id, limit=20):
+    rows = conn.execute(
+        "SELECT * FROM activities WHERE cluster_id = ? ORDER BY period_start DESC, program_id DESC LIMIT ?",
+        (cluster_id, limit)
+    ).fetchall()
+    return [dict(r) for r in rows]
 
 
 def upsert_activities(conn, activities):
     """동기화: 없는 활동만 추가 (기존 데이터 보존)."""
+    existing = _existing_ids(conn, [a["program_id"] for a in activities])
     conn.executemany("""
         INSERT OR IGNORE INTO activities
             (program_id, title, location, organization, category,
              activity_type, recruit_status, recognized_hours,
              period_start, period_end, volunteer_time,
-             recruit_start, recruit_end, group_key, fetched_at)
+             recruit_start, recruit_end, group_key, fetched_at,
+             region_code, district_code)
         VALUES
             (:program_id, :title, :location, :organization, :category,
              :activity_type, :recruit_status, :recognized_hours,
              :period_start, :period_end, :volunteer_time,
-             :recruit_start, :recruit_end, :group_key, :fetched_at)
+             :recruit_start, :recruit_end, :group_key, :fetched_at,
+             :region_code, :district_code)
     """, activities)
+    new_ids = {a["program_id"] for a in activities} - existing
+    index_activities(conn, new_ids)
+    assign_clusters(conn, new_ids)
+    refresh_groups(conn, [a["group_key"] for a in activities if a["program_id"] in new_ids])
+    if activities:
+        conn.execute(
+            "UPDATE sync_meta SET last_sync = MAX(COALESCE(last_sync, ''), ?) WHERE id = 1",
+            (max(a["fetched_at"] for a in activities),)
+        )
     conn.commit()
 
 
-def get_activities(conn, filters=None, page=1, per_page=20):
+def _existing_ids(conn, program_ids):
+    found = set()
+    for i in range(0, len(program_ids), 500):
+        chunk = program_ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        found.update(r[0] for r in conn.execute(
+            f"SELECT program_id FROM activities WHERE program_id IN ({marks})", chunk
+        ))
+    return found
+
+
+def get_activities(conn, filters=None, cursor=None, per_page=20, count_total=False):
     where = []
     params = []
     if filters:
@@ -109,6 +682,12 @@ def get_activities(conn, filters=None, page=1, per_page=20):
         if filters.get("recruit_status"):
             where.append("recruit_status = ?")
             params.append(filters["recruit_status"])
+        if filters.get("region_code"):
+            where.append("region_code = ?")
+            params.append(filters["region_code"])
+        if filters.get("district_code"):
+            where.append("district_code = ?")
+            params.append(filters["district_code"])
         if filters.get("location"):
             where.append("location LIKE ?")
             params.append(f"%{filters['location']}%")
@@ -116,30 +695,22 @@ def get_activities(conn, filters=None, page=1, per_page=20):
             where.append("group_key = ?")
             params.append(filters["group_key"])
 
-    where_clause = " WHERE " + " AND ".join(where) if where else ""
-    offset = (page - 1) * per_page
-
-    count = conn.execute(
-        f"SELECT COUNT(*) FROM activities{where_clause}", params
-    ).fetchone()[0]
-
-    rows = conn.execute(
-        f"SELECT * FROM activities{where_clause} ORDER BY period_start DESC LIMIT ? OFFSET ?",
-        params + [per_page, offset]
-    ).fetchall()
-
-    return {"items": [dict(r) for r in rows], "total": count, "page": page, "per_page": per_page}
+    return _seek_page(conn, "activities a", where, params, _DATE_ORDER,
+                      cursor, per_page, count_total)
 
 
-def search_activities(conn, filters, page=1, per_page=10):
-    """로컬 DB에서 필터 기반 검색."""
+def _search_conditions(filters):
+    """검색 필터 → (활동 조건 목록, 파라미터, FTS MATCH 식 또는 None). 컬럼은 activities a 기준."""
     where = []
     params = []
+    match = None
 
     if filters.get("keyword"):
-        where.append("(title LIKE ? OR organization LIKE ?)")
-        kw = f"%{filters['keyword']}%"
-        params.extend([kw, kw])
+        match = build_fts_query(filters["keyword"])
+        if not match:
+            # 한 글자 검색어는 2-gram 색인으로 찾을 수 없어 LIKE로 대체
+            where.append("(" + " OR ".join(f"{c} LIKE ?" for c in FTS_COLUMNS) + ")")
+            params.extend([f"%{filters['keyword']}%"] * len(FTS_COLUMNS))
     if filters.get("category"):
         where.append("category LIKE ?")
         params.append(f"%{filters['category']}%")
@@ -152,6 +723,12 @@ def search_activities(conn, filters, page=1, per_page=10):
     if filters.get("target"):
         where.append("target LIKE ?")
         params.append(f"%{filters['target']}%")
+    if filters.get("region_code"):
+        where.append("region_code = ?")
+        params.append(filters["region_code"])
+    if filters.get("district_code"):
+        where.append("district_code = ?")
+        params.append(filters["district_code"])
     if filters.get("location"):
         where.append("location LIKE ?")
         params.append(f"%{filters['location']}%")
@@ -161,28 +738,357 @@ def search_activities(conn, filters, page=1, per_page=10):
     if filters.get("date_end"):
         where.append("period_start <= ?")
         params.append(filters["date_end"])
+    return where, params, match
 
-    where_clause = " WHERE " + " AND ".join(where) if where else ""
-    offset = (page - 1) * per_page
 
-    count = conn.execute(
-        f"SELECT COUNT(*) FROM activities{where_clause}", params
-    ).fetchone()[0]
+def search_activities(conn, filters, cursor=None, per_page=10, count_total=False):
+    """로컬 DB에서 필터 기반 검색. cursor는 이전 결과의 next_cursor/prev_cursor."""
+    where, params, match = _search_conditions(filters)
+    if match:
+        # FTS 매칭 결과를 bm25 점수순으로 정렬 (점수가 낮을수록 관련도 높음)
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        source = f"""
+            (SELECT rowid AS fts_rowid, bm25(activities_fts, {weights}) AS score
+             FROM activities_fts WHERE activities_fts MATCH ?) m
+            JOIN activities a ON a.fts_id = m.fts_rowid"""
+        params = [match] + params
+        return _seek_page(conn, source, where, params, _RANK_ORDER,
+                          cursor, per_page, count_total)
+
+    return _seek_page(conn, "activities a", where, params, _DATE_ORDER,
+                      cursor, per_page, count_total)
+
+
+def search_groups(conn, filters, cursor=None, per_page=10, count_total=False):
+    """search_activities와 같은 필터로 group_key 묶음 단위 페이지.
+
+    조건에 맞는 멤버가 하나라도 있는 묶음을 고른다. 항목은 대표 활동 행에
+    묶음 요약(member_count, open_count, min_period, max_period)을 붙인 것.
+    필터가 있으면 대표 활동도 조건에 맞는 멤버 중에서 고른다.
+    """
+    where, params, match = _search_conditions(filters)
+    select = "r.*, g.member_count, g.open_count, g.min_period, g.max_period"
+    if match:
+        # 묶음 순위는 멤버 중 가장 좋은 bm25 점수, 대표는 그 멤버 (MIN()과 함께 고른 열은 그 행의 값).
+        # bm25()는 집계 안에서 못 쓰므로 LIMIT -1로 FTS 하위 쿼리가 펼쳐지지 않게 한다.
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        member_where = "".join(f" AND {w}" for w in where)
+        source = f"""
+            (SELECT a.group_key, MIN(m.score) AS score, a.program_id AS rep
+             FROM (SELECT rowid AS fts_rowid, bm25(activities_fts, {weights}) AS score
+                   FROM activities_fts WHERE activities_fts MATCH ? LIMIT -1) m
+             JOIN activities a ON a.fts_id = m.fts_rowid
+             WHERE a.group_key IS NOT NULL{member_where}
+             GROUP BY a.group_key) s
+            JOIN groups g ON g.group_key = s.group_key
+            JOIN activities r ON r.program_id = s.rep"""
+        return _seek_page(conn, source, [], [match] + params, _GROUP_RANK_ORDER,
+                          cursor, per_page, count_total, select)
+
+    if not where:
+        source, outer = "groups g JOIN activities r ON r.program_id = g.rep_program_id", []
+    elif where == ["recruit_status = ?"] and params == ["모집중"]:
+        # 기본 검색(모집중만)은 요약 컬럼으로 판정한다 (idx_groups_open)
+        source, outer, params = "groups g JOIN activities r ON r.program_id = g.rep_program_id", \
+            ["g.open_count > 0"], []
+    else:
+        # 조건에 맞는 대표 멤버가 없으면 조인이 안 되어 묶음이 빠진다
+        rep = f"""
+            JOIN activities r ON r.program_id = (
+                SELECT a.program_id FROM activities a
+                WHERE a.group_key = g.group_key AND {' AND '.join(where)}
+                ORDER BY a.recruit_status = '모집중' DESC, a.period_start DESC, a.program_id DESC
+                LIMIT 1)"""
+        if filters.get("region_code") or filters.get("district_code"):
+            # 지역 조건은 드물게 맞는 경우가 많다. 묶음을 최근 순으로 훑으며 대표를 찾으면
+            # 거의 모든 묶음을 봐야 하므로, idx_activities_region으로 조건에 맞는 활동의 묶음부터 모은다
+            source = f"""
+                (SELECT DISTINCT a.group_key FROM activities a
+                 WHERE a.group_key IS NOT NULL AND {' AND '.join(where)}) s
+                JOIN groups g ON g.group_key = s.group_key{rep}"""
+            params = params * 2
+        else:
+            # 날짜/모집 상태처럼 넓은 조건은 최근 묶음부터 보면 금방 한 페이지가 찬다
+            source = "groups g" + rep
+        outer = []
+    return _seek_page(conn, source, outer, params, _GROUP_DATE_ORDER,
+                      cursor, per_page, count_total, select)
+
+
+def get_group_members(conn, group_key, limit=3):
+    """묶음의 최근 멤버 limit개 (검색 결과 미리보기)."""
+    rows = conn.execute(
+        "SELECT * FROM activities WHERE group_key = ? ORDER BY period_start DESC, program_id DESC LIMIT ?",
+        (group_key, limit)
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+# --- 키셋 페이지네이션 ---
+#
+# OFFSET 대신 마지막 행의 정렬 키 다음부터 읽는다. 정렬 키는 항상 program_id(묶음은 group_key)로 끝나 유일하다.
+# 커서에는 정렬 키와 함께 페이지 번호, 첫 페이지에서 센 전체 건수를 담아
+# 다음 페이지부터는 COUNT(*)를 다시 돌리지 않는다.
+# 키워드 검색의 bm25 점수는 색인 전체 통계에 따라 달라지므로, 페이지를 넘기는 사이 동기화로
+# 활동이 추가되면 점수가 바뀌어 몇 행이 빠지거나 반복될 수 있다 (다음 검색부터는 정상).
+
+_DATE_ORDER = (("a.period_start", "a.program_id"), "DESC")
+_RANK_ORDER = (("m.score", "a.program_id"), "ASC")
+_GROUP_DATE_ORDER = (("g.latest_start", "g.group_key"), "DESC")
+_GROUP_RANK_ORDER = (("s.score", "g.group_key"), "ASC")
+
+
+def encode_cursor(state):
+    raw = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
 
+def decode_cursor(cursor):
+    """잘못된 커서는 None (첫 페이지로 취급)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(state, dict) or not isinstance(state.get("k"), list):
+        return None
+    return state
+
+
+def _valid_cursor(state, key_count):
+    """조작/손상된 커서 거르기: 정렬 키 개수와 타입, 페이지 번호, 건수, 방향."""
+    return (len(state["k"]) == key_count
+            and all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in state["k"])
+            and type(state.get("p", 1)) is int and state.get("p", 1) >= 1
+            and (state.get("t") is None or (type(state["t"]) is int and state["t"] >= 0))
+            and state.get("d", "next") in ("next", "prev"))
+
+
+def _seek_page(conn, source, where, params, order, cursor, per_page, count_total, select="a.*"):
+    key_cols, direction = order
+    state = decode_cursor(cursor) if cursor else None
+    if state and not _valid_cursor(state, len(key_cols)):
+        state = None
+    page = state.get("p", 1) if state else 1
+    total = state.get("t") if state else None
+
+    where = list(where)
+    params = list(params)
+    if total is None and count_total:
+        where_clause = " WHERE " + " AND ".join(where) if where else ""
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM {source}{where_clause}", params
+        ).fetchone()[0]
+
+    backward = bool(state) and state.get("d") == "prev"
+    # 정방향: DESC면 키보다 작은 행, ASC면 큰 행. 역방향은 반대.
+    descending = (direction == "DESC") != backward
+    if state:
+        marks = ", ".join("?" * len(key_cols))
+        where.append(f"({', '.join(key_cols)}) {'<' if descending else '>'} ({marks})")
+        params.extend(state["k"])
+
+    where_clause = " WHERE " + " AND ".join(where) if where else ""
+    order_by = ", ".join(f"{c} {'DESC' if descending else 'ASC'}" for c in key_cols)
+    keys = ", ".join(f"{c} AS _k{i}" for i, c in enumerate(key_cols))
     rows = conn.execute(
-        f"SELECT * FROM activities{where_clause} ORDER BY period_start DESC LIMIT ? OFFSET ?",
-        params + [per_page, offset]
+        f"SELECT {select}, {keys} FROM {source}{where_clause} ORDER BY {order_by} LIMIT ?",
+        params + [per_page + 1]
     ).fetchall()
 
-    return {"items": [dict(r) for r in rows], "total": count, "page": page}
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    items = []
+    row_keys = []
+    for r in rows:
+        item = dict(r)
+        row_keys.append([item.pop(f"_k{i}") for i in range(len(key_cols))])
+        items.append(item)
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        # 역방향으로 왔으면 다음 페이지는 항상 있다
+        if more or backward:
+            next_cursor = encode_cursor({"k": row_keys[-1], "d": "next", "p": page + 1, "t": total})
+        if page > 1:
+            prev_cursor = encode_cursor({"k": row_keys[0], "d": "prev", "p": page - 1, "t": total})
+
+    return {"items": items, "total": total, "page": page, "per_page": per_page,
+            "next_cursor": next_cursor, "prev_cursor": prev_cursor}
 
 
 def get_sync_stats(conn):
     """동기화 통계: 총 활동 수, 마지막 동기화 시간."""
-    count = conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
-    row = conn.execute("SELECT MAX(fetched_at) FROM activities").fetchone()
-    last_sync = row[0] if row[0] else None
-    return {"count": count, "last_sync": last_sync}
+    row = conn.execute("SELECT row_count, last_sync FROM sync_meta WHERE id = 1").fetchone()
+    if not row:
+        return {"count": 0, "last_sync": None}
+    return {"count": row["row_count"], "last_sync": row["last_sync"] or None}
+
+
+def filter_fingerprint(filters):
+    """동기화 필터 식별자. 빈 값은 빼고 키 순서와 무관하게 만든다."""
+    canonical = json.dumps({k: v for k, v in sorted(filters.items()) if v},
+                           ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def record_filter_sync(conn, filters, item_count, synced_at=None, full=True):
+    """필터별 마지막 동기화 기록. full=False(증분 동기화)면 마지막 전체 동기화 시각은 그대로 둔다."""
+    synced_at = synced_at or datetime.now().isoformat()
+    conn.execute("""
+        INSERT INTO sync_filter_meta (fingerprint, filters, last_sync, item_count, last_full_sync)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(fingerprint) DO UPDATE SET
+            last_sync = excluded.last_sync, item_count = excluded.item_count,
+            last_full_sync = COALESCE(excluded.last_full_sync, last_full_sync)
+    """, (filter_fingerprint(filters), json.dumps(filters, ensure_ascii=False),
+          synced_at, item_count, synced_at if full else None))
+    conn.execute(
+        "UPDATE sync_meta SET last_sync = MAX(COALESCE(last_sync, ''), ?) WHERE id = 1",
+        (synced_at,)
+    )
+    conn.commit()
+
+
+def known_program_ids(conn, program_ids):
+    """이미 DB에 있는 program_id 집합."""
+    return _existing_ids(conn, list(program_ids))
+
+
+def get_filter_sync(conn, filters):
+    row = conn.execute(
+        "SELECT * FROM sync_filter_meta WHERE fingerprint = ?", (filter_fingerprint(filters),)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+# --- 이어받기 가능한 동기화 작업 ---
+#
+# 필터별로 작업 한 건(sync_jobs)과 완료된 페이지 목록(sync_job_pages)을 둔다.
+# 페이지는 그 페이지의 활동이 커밋되는 같은 트랜잭션에서 완료로 기록되므로
+# 중간에 프로세스가 죽어도 "완료"인데 데이터가 없는 페이지는 생기지 않는다.
+
+def start_sync_job(conn, filters, resume_within_hours=24):
+    """동기화 작업 시작. 같은 필터의 끝나지 않은 작업이 최근 것이면 이어받는다.
+
+    반환: {"fingerprint", "total", "total_pages", "completed": set(페이지), "resumed": bool}
+    """
+    fingerprint = filter_fingerprint(filters)
+    now = datetime.now()
+    row = conn.execute("SELECT * FROM sync_jobs WHERE fingerprint = ?", (fingerprint,)).fetchone()
+    if row and not row["finished_at"] and row["total_pages"] is not None:
+        age = now - datetime.fromisoformat(row["started_at"])
+        if age.total_seconds() < resume_within_hours * 3600:
+            completed = {r[0] for r in conn.execute(
+                "SELECT page FROM sync_job_pages WHERE fingerprint = ?", (fingerprint,)
+            )}
+            conn.execute("UPDATE sync_jobs SET updated_at = ? WHERE fingerprint = ?",
+                         (now.isoformat(), fingerprint))
+            conn.commit()
+            return {"fingerprint": fingerprint, "total": row["total"],
+                    "total_pages": row["total_pages"], "completed": completed,
+                    "resumed": bool(completed)}
+
+    # 새 작업 (오래됐거나 끝난 작업은 덮어쓴다)
+    conn.execute("DELETE FROM sync_job_pages WHERE fingerprint = ?", (fingerprint,))
+    conn.execute("""
+        INSERT OR REPLACE INTO sync_jobs (fingerprint, filters, total, total_pages, started_at, updated_at, item_count)
+        VALUES (?, ?, NULL, NULL, ?, ?, 0)
+    """, (fingerprint, json.dumps(filters, ensure_ascii=False), now.isoformat(), now.isoformat()))
+    conn.commit()
+    return {"fingerprint": fingerprint, "total": None, "total_pages": None,
+            "completed": set(), "resumed": False}
+
+
+def set_sync_job_total(conn, fingerprint, total, total_pages):
+    conn.execute(
+        "UPDATE sync_jobs SET total = ?, total_pages = ? WHERE fingerprint = ?",
+        (total, total_pages, fingerprint)
+    )
+    conn.commit()
+
+
+def write_sync_batch(conn, fingerprint, activities, pages):
+    """활동 배치 저장과 페이지 완료 기록을 한 트랜잭션으로 커밋한다."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO sync_job_pages (fingerprint, page) VALUES (?, ?)",
+        [(fingerprint, p) for p in pages]
+    )
+    conn.execute("UPDATE sync_jobs SET updated_at = ?, item_count = item_count + ? WHERE fingerprint = ?",
+                 (datetime.now().isoformat(), len(activities), fingerprint))
+    upsert_activities(conn, activities)  # 여기서 커밋
+
+
+def get_sync_job_items(conn, fingerprint):
+    """작업이 지금까지 받은 활동 수 (이어받은 실행 포함). record_filter_sync에 넘긴다."""
+    row = conn.execute("SELECT item_count FROM sync_jobs WHERE fingerprint = ?", (fingerprint,)).fetchone()
+    return row[0] if row else 0
+
+
+def finish_sync_job(conn, fingerprint):
+    conn.execute("UPDATE sync_jobs SET finished_at = ? WHERE fingerprint = ?",
+                 (datetime.now().isoformat(), fingerprint))
+    conn.execute("DELETE FROM sync_job_pages WHERE fingerprint = ?", (fingerprint,))
+    conn.commit()
+
+
+def save_districts(conn, region_code, districts, refreshed_at=None):
+    """시/도 하나의 시군구 목록({코드: 이름})을 통째로 바꾼다."""
+    conn.execute("DELETE FROM districts WHERE region_code = ?", (region_code,))
+    conn.executemany(
+        "INSERT INTO districts (region_code, code, name, sort_order) VALUES (?, ?, ?, ?)",
+        [(region_code, code, name, i) for i, (code, name) in enumerate(districts.items())]
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO district_meta (region_code, refreshed_at) VALUES (?, ?)",
+        (region_code, refreshed_at or datetime.now().isoformat())
+    )
+    conn.commit()
+
+
+def get_all_districts(conn):
+    """{시/도 코드: {"districts": {코드: 이름}, "refreshed_at": 시각}} (저장된 시/도만)"""
+    result = {row["region_code"]: {"districts": {}, "refreshed_at": row["refreshed_at"]}
+              for row in conn.execute("SELECT region_code, refreshed_at FROM district_meta")}
+    for row in conn.execute("SELECT region_code, code, name FROM districts ORDER BY region_code, sort_order"):
+        if row["region_code"] in result:
+            result[row["region_code"]]["districts"][row["code"]] = row["name"]
+    return result
+
+
+def get_ai_query(conn, query_key, min_created_at):
+    """min_created_at 이후에 저장된 AI 검색 파라미터 → (dict, 저장 시각). 없으면 None."""
+    row = conn.execute(
+        "SELECT params, created_at FROM ai_query_cache WHERE query_key = ? AND created_at >= ?",
+        (query_key, min_created_at)
+    ).fetchone()
+    return (json.loads(row["params"]), row["created_at"]) if row else None
+
+
+def put_ai_query(conn, query_key, query, params, created_at=None):
+    conn.execute(
+        "INSERT OR REPLACE INTO ai_query_cache (query_key, query, params, created_at) VALUES (?, ?, ?, ?)",
+        (query_key, query, json.dumps(params, ensure_ascii=False), created_at or datetime.now().isoformat())
+    )
+    conn.commit()
+
+
+def purge_ai_queries(conn, before=None):
+    """before(ISO 시각)보다 먼저 저장된 항목을 지운다. None이면 전부. 지운 개수 반환."""
+    if before is None:
+        cur = conn.execute("DELETE FROM ai_query_cache")
+    else:
+        cur = conn.execute("DELETE FROM ai_query_cache WHERE created_at < ?", (before,))
+    conn.commit()
+    return cur.rowcount
+
+
+def count_ai_queries(conn):
+    return conn.execute("SELECT COUNT(*) FROM ai_query_cache").fetchone()[0]
 
 
 def get_activity(conn, program_id):
@@ -192,18 +1098,97 @@ def get_activity(conn, program_id):
     return dict(row) if row else None
 
 
+# 상세 페이지 관련 목록에 넣는 열
+_VIEW_ITEM_COLUMNS = "program_id, title, recruit_status, period_start, period_end"
+
+
+def get_activity_view(conn, program_id, review_limit=20, related_limit=20):
+    """상세 페이지에 필요한 것을 한 번에 읽는다. 활동이 없으면 None.
+
+    pool.read() 안에서 부르면 한 스냅샷에서 최대 3개 문장으로 끝난다.
+    - 활동 + 저장 여부 + 리뷰 수/평균 + 묶음 크기
+    - 최근 리뷰 review_limit개 (리뷰가 있을 때만)
+    - 같은 묶음의 다른 활동(다가오는 것 먼저 기간 순, 그다음 지난 것 최근 순) / 같은 클러스터의 다른 묶음 활동(최근 순) 각각 related_limit개, 필요한 열만
+    """
+    row = conn.execute("""
+        SELECT a.*,
+               EXISTS (SELECT 1 FROM saved_activities s WHERE s.program_id = a.program_id) AS _saved,
+               (SELECT COUNT(*) FROM reviews r WHERE r.program_id = a.program_id) AS _review_count,
+               (SELECT COALESCE(AVG(rating), 0) FROM reviews r WHERE r.program_id = a.program_id) AS _avg_rating,
+               (SELECT member_count FROM groups g WHERE g.group_key = a.group_key) AS _group_size
+        FROM activities a WHERE a.program_id = ?
+    """, (program_id,)).fetchone()
+    if row is None:
+        return None
+    activity = dict(row)
+    saved = bool(activity.pop("_saved"))
+    stats = {"count": activity.pop("_review_count"), "avg_rating": round(activity.pop("_avg_rating"), 1)}
+    group_size = activity.pop("_group_size") or 0
+
+    reviews = []
+    if stats["count"]:
+        reviews = [dict(r) for r in conn.execute(
+            "SELECT * FROM reviews WHERE program_id = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+            (program_id, review_limit)
+        )]
+
+    related = []
+    similar = []
+    if activity.get("group_key") or activity.get("cluster_id"):
+        today = datetime.now().strftime("%Y-%m-%d")
+        rows = conn.execute(f"""
+            SELECT * FROM (
+                SELECT 0 AS _kind, {_VIEW_ITEM_COLUMNS} FROM activities
+                WHERE group_key = ? AND program_id != ?
+                ORDER BY period_start < ?, CASE WHEN period_start >= ? THEN period_start END,
+                         period_start DESC, program_id LIMIT ?)
+            UNION ALL
+            SELECT * FROM (
+                SELECT 1 AS _kind, {_VIEW_ITEM_COLUMNS} FROM activities
+                WHERE cluster_id = ? AND program_id != ? AND group_key IS NOT ?
+                ORDER BY period_start DESC, program_id DESC LIMIT ?)
+        """, (activity.get("group_key"), program_id, today, today, related_limit,
+              activity.get("cluster_id"), program_id, activity.get("group_key"), related_limit)).fetchall()
+        for r in rows:
+            item = dict(r)
+            (similar if item.pop("_kind") else related).append(item)
+        # UNION ALL은 하위 쿼리 순서를 보장하지 않는다
+        upcoming = sorted((a for a in related if (a["period_start"] or "") >= today),
+                          key=lambda a: (a["period_start"], a["program_id"]))
+        past = sorted((a for a in related if (a["period_start"] or "") < today), key=lambda a: a["program_id"])
+        past.sort(key=lambda a: a["period_start"] or "", reverse=True)
+        related = upcoming + past
+        similar.sort(key=lambda a: (a["period_start"] or "", a["program_id"]), reverse=True)
+
+    return {"activity": activity, "saved": saved, "stats": stats, "reviews": reviews,
+            "related": related, "related_total": max(group_size - 1, len(related)), "similar": similar}
+
+
 def update_activity_detail(conn, detail):
-    """상세 페이지에서 가져온 정보로 활동 업데이트."""
+    """상세 페이지에서 가져온 정보로 활동 업데이트.
+
+    제목이 빈 임시 레코드(ensure_activity_exists)는 상세 제목과 그 group_key로 채운다.
+    제목/기관명이 바뀌었거나 아직 클러스터가 없으면 클러스터를 다시 정한다.
+    """
+    before = conn.execute(
+        "SELECT title, organization, cluster_id FROM activities WHERE program_id = ?", (detail["program_id"],)
+    ).fetchone()
+    title = detail.get("title") or ""
     conn.execute("""
         UPDATE activities SET
+            title = CASE WHEN COALESCE(title, '') = '' THEN ? ELSE title END,
+            group_key = CASE WHEN COALESCE(group_key, '') = '' AND ? != '' THEN ? ELSE group_key END,
             description = ?, recruit_count = ?, apply_count = ?,
             target = ?, active_days = ?, volunteer_type = ?,
             register_org = ?, location = ?, organization = ?,
             recruit_status = ?, volunteer_time = ?, recognized_hours = ?,
             period_start = ?, period_end = ?, recruit_start = ?, recruit_end = ?,
-            category = ?, activity_type = ?, detail_fetched = 1
+            category = ?, activity_type = ?, detail_fetched = 1,
+            region_code = COALESCE(NULLIF(?, ''), region_code),
+            district_code = COALESCE(NULLIF(?, ''), district_code)
         WHERE program_id = ?
     """, (
+        title, title, compute_group_key(title) if title else "",
         detail.get("description", ""), detail.get("recruit_count", ""),
         detail.get("apply_count", ""), detail.get("target", ""),
         detail.get("active_days", ""), detail.get("volunteer_type", ""),
@@ -213,8 +1198,20 @@ def update_activity_detail(conn, detail):
         detail.get("period_start", ""), detail.get("period_end", ""),
         detail.get("recruit_start", ""), detail.get("recruit_end", ""),
         detail.get("category", ""), detail.get("activity_type", ""),
+        detail.get("region_code", ""), detail.get("district_code", ""),
         detail["program_id"],
     ))
+    index_activities(conn, [detail["program_id"]])
+    after = conn.execute(
+        "SELECT title, organization, group_key FROM activities WHERE program_id = ?", (detail["program_id"],)
+    ).fetchone()
+    if after is None:
+        conn.commit()
+        return
+    if before["cluster_id"] is None or tuple(before)[:2] != tuple(after)[:2]:
+        assign_clusters(conn, [detail["program_id"]])
+    # 모집 상태/기간이 바뀌었을 수 있다 (임시 레코드는 방금 묶음에 들어갔을 수 있다)
+    refresh_groups(conn, [after["group_key"]])
     conn.commit()
 
 
@@ -225,9 +1222,10 @@ def ensure_activity_exists(conn, program_id, fetched_at):
     ).fetchone()
     if not existing:
         conn.execute(
-            "INSERT INTO activities (program_id, title, fetched_at) VALUES (?, '', ?)",
+            "INSERT INTO activities (program_id, title, period_start, fetched_at) VALUES (?, '', '', ?)",
             (program_id, fetched_at)
         )
+        index_activities(conn, [program_id])
         conn.commit()
 
 
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import db
+import scraper
+
+
+class DistrictStore:
+    """시/도별 시군구 목록을 DB(districts 테이블)와 메모리에 보관한다.
+
+    /api/districts가 드롭다운을 바꿀 때마다 포털에 요청하지 않도록
+    시작할 때 DB에서 읽어 메모리에 올리고, 없거나 max_age보다 오래된 시/도는
+    백그라운드에서 포털로부터 새로 받아 DB에 저장한다.
+    읽어 들인 목록은 scraper.set_districts()로도 넘겨 주소 → 시군구코드 해석에 쓴다.
+
+        store = DistrictStore(pool)
+        store.warm()
+        entry = store.get("6110000")   # {"body": JSON bytes, "etag": ..., "refreshed_at": ...}
+    """
+
+    # 갱신에 실패한 시/도는 이 시간(초) 동안 다시 시도하지 않는다
+    RETRY_AFTER = 300
+
+    def __init__(self, pool, max_age=timedelta(days=7), fetch=None):
+        self.pool = pool
+        self.max_age = max_age
+        self.fetch = fetch or (lambda code: scraper.fetch_districts(code, refresh=True))
+        self._entries = {}     # 시/도 코드 -> {"body", "etag", "refreshed_at"}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._failed_at = {}   # 시/도 코드 -> 마지막 갱신 실패 시각 (monotonic)
+
+    def warm(self):
+        """DB에 저장된 목록을 메모리에 올리고, 없거나 오래된 시/도를 백그라운드로 갱신한다."""
+        with self.pool.read() as conn:
+            stored = db.get_all_districts(conn)
+        for code, row in stored.items():
+            self._set(code, row["districts"], row["refreshed_at"])
+        self.refresh_stale()
+
+    def _set(self, code, districts, refreshed_at):
+        body = json.dumps(districts, ensure_ascii=False).encode("utf-8")
+        entry = {
+            "body": body,
+            "etag": '"%s"' % hashlib.sha1(body).hexdigest()[:16],
+            "refreshed_at": refreshed_at,
+        }
+        with self._lock:
+            self._entries[code] = entry
+        scraper.set_districts(code, districts)
+        return entry
+
+    def _stale(self, entry):
+        if entry is None:
+            return True
+        try:
+            return datetime.now() - datetime.fromisoformat(entry["refreshed_at"]) > self.max_age
+        except (TypeError, ValueError):
+            return True
+
+    def get(self, code):
+        """메모리의 목록을 반환한다. 오래됐으면 백그라운드 갱신을 걸고 기존 값을 그대로 준다.
+
+        아직 한 번도 받지 못한 시/도는 포털에서 바로 받아 온다 (실패하면 예외).
+        """
+        with self._lock:
+            entry = self._entries.get(code)
+        if entry is None:
+            return self.refresh(code)
+        if self._stale(entry):
+            self.refresh_stale([code])
+        return entry
+
+    def refresh(self, code):
+        """포털에서 받아 DB와 메모리를 갱신한다."""
+        districts = self.fetch(code)
+        refreshed_at = datetime.now().isoformat()
+        self.pool.write(db.save_districts, code, districts, refreshed_at)
+        entry = self._set(code, districts, refreshed_at)
+        # 목록이 없을 때 저장돼 시군구 코드가 빈 활동을 다시 해석한다
+        self.pool.write(db.backfill_region_codes, scraper.resolve_region, code)
+        return entry
+
+    def refresh_stale(self, codes=None):
+        """없거나 오래된 시/도를 백그라운드 스레드 하나에서 차례로 갱신한다."""
+        now = time.monotonic()
+        with self._lock:
+            todo = [c for c in (codes or scraper.REGION_CODES)
+                    if c not in self._refreshing and self._stale(self._entries.get(c))
+                    and now - self._failed_at.get(c, float("-inf")) >= self.RETRY_AFTER]
+            self._refreshing.update(todo)
+        if not todo:
+            return
+
+        def run():
+            done = 0
+            for code in todo:
+                try:
+                    self.refresh(code)
+                    done += 1
+                except Exception as e:
+                    # 기존 값(있으면)을 계속 쓰고 RETRY_AFTER초 뒤에 다시 시도한다
+                    print(f"[시군구] {code} 갱신 실패: {e}", flush=True)
+                    with self._lock:
+                        self._failed_at[code] = time.monotonic()
+                finally:
+                    with self._lock:
+                        self._refreshing.discard(code)
+            print(f"[시군구] 시/도 목록 갱신 {done}/{len(todo)}개", flush=True)
+
+        threading.Thread(target=run, name="districts", daemon=True).start()
@@ -0,0 +1,365 @@
+"""1365 목록/상세 페이지에서 필요한 필드만 뽑는 스트리밍 파서.
+
+BeautifulSoup은 페이지마다 전체 트리를 만들고 select_one/find_all로 여러 번 훑는다.
+여기서는 html.parser.HTMLParser 이벤트를 한 번만 따라가면서, scraper의 bs4 파서가
+쓰는 선택자와 같은 요소의 텍스트만 모은다. 결과 가공(날짜, 지역코드 등)은 scraper가
+두 백엔드에 공통으로 한다.
+
+텍스트 규칙은 bs4와 같다: 태그 사이 문자열 하나가 텍스트 노드이고,
+get_text(strip=True)는 노드별로 strip한 뒤 빈 것을 빼고 이어 붙인다.
+script/style 내용은 bs4처럼 텍스트에서 제외한다. 엔티티는 html.unescape 규칙으로 풀기 때문에
+세미콜론이 빠진 깨진 엔티티(&gtabc 등)에서만 bs4와 결과가 다를 수 있다.
+"""
+from html.parser import HTMLParser
+
+# 닫는 태그 없이 바로 닫히는 요소 (bs4 html.parser 빌더와 같은 목록)
+_VOID = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer",
+}
+_NO_TEXT = {"script", "style"}
+
+
+def text_of(pieces, strip=True):
+    """모아둔 텍스트 노드 목록을 get_text()/get_text(strip=True)와 같은 규칙으로 합친다."""
+    if pieces is None:
+        return None
+    if not strip:
+        return "".join(pieces)
+    return "".join(s for s in (p.strip() for p in pieces) if s)
+
+
+class _Scanner(HTMLParser):
+    """열린 요소 스택과 텍스트 수집만 담당한다. 필드 추출은 하위 클래스의 _open/_close에서."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._stack = []      # [tag, marks, capture]
+        self._buf = []
+        self._captures = []   # 지금 열려 있는 수집 대상 (텍스트 조각 리스트)
+
+    def _flush(self):
+        if not self._buf:
+            return
+        text = "".join(self._buf)
+        self._buf = []
+        if self._captures and not (self._stack and self._stack[-1][0] in _NO_TEXT):
+            for cap in self._captures:
+                cap.append(text)
+
+    def capture(self):
+        cap = []
+        self._captures.append(cap)
+        return cap
+
+    def handle_data(self, data):
+        self._buf.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        attrs = dict(attrs)
+        cls = attrs.get("class")
+        classes = set(cls.split()) if cls else ()
+        marks, cap = self._open(tag, classes, attrs)
+        if tag in _VOID:
+            # 자식이 없으므로 곧바로 닫는다
+            self._pop(marks, cap)
+        else:
+            self._stack.append([tag, marks, cap])
+
+    def handle_endtag(self, tag):
+        self._flush()
+        # bs4처럼 가장 가까운 같은 이름의 요소까지 닫는다. 없으면 무시.
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            _, marks, cap = self._stack.pop()
+            self._pop(marks, cap)
+
+    def _pop(self, marks, cap):
+        if cap is not None:
+            for j in range(len(self._captures) - 1, -1, -1):
+                if self._captures[j] is cap:
+                    del self._captures[j]
+                    break
+        for mark in marks:
+            self._close(mark)
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._stack:
+            _, marks, cap = self._stack.pop()
+            self._pop(marks, cap)
+
+    def _open(self, tag, classes, attrs):
+        return (), None
+
+    def _close(self, mark):
+        pass
+
+
+class _ListScanner(_Scanner):
+    """ul.list_wrap.wrap2 > li 마다 scraper._list_item()에 넘길 원시 필드를 모은다."""
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        self._list_state = 0  # 0: 아직, 1: 목록 안, 2: 끝 (첫 번째 목록만 본다)
+        self._list_depth = 0
+        self._li = None
+        self._ing_blue = 0
+        self._close_dday = 0
+        self._in_badges = False
+        self._in_loc = False
+        self._in_pc = False
+        self._pc_divs = []
+
+    def _open(self, tag, classes, attrs):
+        marks = []
+        cap = None
+        li = self._li
+
+        if tag == "div":
+            if "ing" in classes and "blue" in classes:
+                self._ing_blue += 1
+                marks.append("ing_blue")
+            if "close_dDay" in classes:
+                self._close_dday += 1
+                marks.append("close_dday")
+
+        if li is None:
+            if tag == "ul" and self._list_state == 0 and "list_wrap" in classes and "wrap2" in classes:
+                self._list_state = 1
+                self._list_depth = len(self._stack)
+                marks.append("list")
+            elif tag == "li" and self._list_state == 1 and len(self._stack) == self._list_depth + 1:
+                self._li = {
+                    "program_id": None, "badges": None, "title": None,
+                    "spans": None, "status": None, "pc": None,
+                }
+                marks.append("li")
+            return marks, cap
+
+        if tag == "input":
+            if li["program_id"] is None and attrs.get("name") == "progrmRegistNo":
+                li["program_id"] = attrs.get("value") or ""
+        elif tag == "ul":
+            if li["badges"] is None and self._ing_blue:
+                li["badges"] = []
+                self._in_badges = True
+                marks.append("badges")
+        elif tag == "li":
+            if self._in_badges:
+                cap = self.capture()
+                li["badges"].append(cap)
+        elif tag == "span":
+            if self._in_loc:
+                cap = self.capture()
+                li["spans"].append(cap)
+            if self._pc_divs:
+                cap = cap if cap is not None else self.capture()
+                for entry in self._pc_divs:
+                    if entry[1] is None:
+                        entry[1] = cap
+        elif tag == "p":
+            if self._pc_divs:
+                cap = self.capture()
+                for entry in self._pc_divs:
+                    if entry[0] is None:
+                        entry[0] = cap
+
+        if tag == "div":
+            if self._in_pc:
+                entry = [None, None]
+                li["pc"].append(entry)
+                self._pc_divs.append(entry)
+                marks.append("pc_div")
+            if li["title"] is None and "tit_board_list" in classes:
+                cap = cap if cap is not None else self.capture()
+                li["title"] = cap
+            if li["spans"] is None and "vols-location" in classes:
+                li["spans"] = []
+                self._in_loc = True
+                marks.append("loc")
+            if li["status"] is None and "end" in classes and self._close_dday:
+                cap = cap if cap is not None else self.capture()
+                li["status"] = cap
+            if li["pc"] is None and "txts_pc_ver" in classes:
+                li["pc"] = []
+                self._in_pc = True
+                marks.append("pc")
+
+        return marks, cap
+
+    def _close(self, mark):
+        if mark == "ing_blue":
+            self._ing_blue -= 1
+        elif mark == "close_dday":
+            self._close_dday -= 1
+        elif mark == "badges":
+            self._in_badges = False
+        elif mark == "loc":
+            self._in_loc = False
+        elif mark == "pc":
+            self._in_pc = False
+        elif mark == "pc_div":
+            self._pc_divs.pop()
+        elif mark == "li":
+            if self._li["program_id"] is not None:
+                self.items.append(self._li)
+            self._li = None
+        elif mark == "list":
+            self._list_state = 2
+
+
+class _DetailScanner(_Scanner):
+    """div.board_view 안의 제목, dl(dt/dd) 쌍, 본문을 모은다."""
+
+    def __init__(self):
+        super().__init__()
+        self.found = False
+        self.title = None
+        self.body = None
+        self.dls = None
+        self._in_view = False
+        self._in_show = False
+        self._open_dls = []
+        self._open_dds = []
+
+    def _open(self, tag, classes, attrs):
+        marks = []
+        cap = None
+
+        if not self._in_view:
+            if not self.found and tag == "div" and "board_view" in classes:
+                self.found = True
+                self._in_view = True
+                marks.append("view")
+            return marks, cap
+
+        if tag == "h3" and self.title is None and "tit_board_view" in classes:
+            cap = self.title = self.capture()
+        elif tag == "div":
+            if self.dls is None and "board_data_show" in classes:
+                self.dls = []
+                self._in_show = True
+                marks.append("show")
+            elif self.body is None and "board_body" in classes:
+                cap = self.body = self.capture()
+        elif self._in_show:
+            if tag == "dl":
+                entry = [None, None]
+                self.dls.append(entry)
+                self._open_dls.append(entry)
+                marks.append("dl")
+            elif tag == "dt" and self._open_dls:
+                cap = self.capture()
+                for entry in self._open_dls:
+                    if entry[0] is None:
+                        entry[0] = cap
+            elif tag == "dd" and self._open_dls:
+                cap = self.capture()
+                dd = [cap, None]
+                for entry in self._open_dls:
+                    if entry[1] is None:
+                        entry[1] = dd
+                self._open_dds.append(dd)
+                marks.append("dd")
+
+        if tag == "span" and self._open_dds and "text-l" in classes:
+            cap = cap if cap is not None else self.capture()
+            for dd in self._open_dds:
+                if dd[1] is None:
+                    dd[1] = cap
+
+        return marks, cap
+
+    def _close(self, mark):
+        if mark == "view":
+            self._in_view = False
+        elif mark == "show":
+            self._in_show = False
+        elif mark == "dl":
+            self._open_dls.pop()
+        elif mark == "dd":
+            self._open_dds.pop()
+
+
+def scan_activities(html):
+    """목록 페이지 → [{program_id, badges, title, location, organization, status, pc_fields}]
+
+    값은 모두 get_text(strip=True) 기준 문자열이고, pc_fields는 (라벨, 값) 목록이다.
+    """
+    scanner = _ListScanner()
+    scanner.feed(html)
+    scanner.close()
+
+    results = []
+    for li in scanner.items:
+        spans = li["spans"] or []
+        results.append({
+            "program_id": li["program_id"],
+            "badges": [text_of(b) for b in li["badges"] or []],
+            "title": text_of(li["title"]) or "",
+            "location": text_of(spans[0]) if len(spans) > 0 else "",
+            "organization": text_of(spans[1]) if len(spans) > 1 else "",
+            "status": text_of(li["status"]) or "",
+            "pc_fields": [(text_of(p), text_of(s)) for p, s in li["pc"] or [] if p is not None and s is not None],
+        })
+    return results
+
+
+def scan_detail(html):
+    """상세 페이지 → {title, fields: {라벨: (get_text(), get_text(strip=True), span.text-l)}, body}
+
+    div.board_view가 없으면 None.
+    """
+    scanner = _DetailScanner()
+    scanner.feed(html)
+    scanner.close()
+    if not scanner.found:
+        return None
+
+    fields = {}
+    for dt, dd in scanner.dls or []:
+        if dt is None or dd is None:
+            continue
+        fields[text_of(dt)] = (text_of(dd[0], strip=False), text_of(dd[0]), text_of(dd[1]))
+    return {
+        "title": text_of(scanner.title),
+        "fields": fields,
+        "body": text_of(scanner.body),
+    }
+
+
+if __name__ == "__main__":
+    # bench/fixtures의 저장된 페이지로 bs4 파서와 결과가 같은지 확인한다
+    import glob
+    import os
+    import scraper
+
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "fixtures")
+    for path in sorted(glob.glob(os.path.join(fixtures, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        name = os.path.basename(path)
+        if name.startswith("list_"):
+            ref = scraper.parse_activities(html, backend="bs4")
+            fast = scraper.parse_activities(html, backend="fast")
+        else:
+            ref = scraper.parse_detail(html, "0", backend="bs4")
+            fast = scraper.parse_detail(html, "0", backend="fast")
+        status = "OK" if ref == fast else "MISMATCH"
+        count = len(ref) if isinstance(ref, list) else (1 if ref else 0)
+        print(f"{status:8} {name} ({count}건)")
+        assert ref == fast, (ref, fast)
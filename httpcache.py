@@ -0,0 +1,179 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import zlib
+
+# 엔드포인트별 유효 시간 (초)
+DEFAULT_TTLS = {
+    "list": 5 * 60,           # 목록 페이지: 새 활동이 계속 올라오므로 짧게
+    "detail": 6 * 3600,       # 상세 페이지
+    "districts": 7 * 86400,   # 시군구 목록: 거의 안 바뀜
+}
+
+
+class HTTPCache:
+    """포털 응답을 zlib으로 압축해 디스크에 저장하는 캐시 (스레드 안전).
+
+    키는 method + URL + 요청 본문의 sha256이고, 파일 이름이 곧 키다.
+    엔드포인트마다 TTL이 다르며, 전체 크기가 max_bytes를 넘으면
+    가장 오래 안 쓴 항목부터 지운다 (LRU). 저장 시각은 파일 mtime이다.
+
+        cache = HTTPCache("data/http_cache")
+        body = cache.get("list", "POST", url, data)
+        if body is None:
+            body = ...
+            cache.put("list", "POST", url, data, body)
+    """
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self._index = None   # 키 -> [압축 크기, 마지막 사용 시각]
+        self._size = 0
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def key(method, url, body=None):
+        h = hashlib.sha256()
+        h.update(method.upper().encode("ascii"))
+        h.update(b"\0")
+        h.update(url.encode("utf-8"))
+        h.update(b"\0")
+        h.update(body or b"")
+        return h.hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def _load_index(self):
+        # 처음 쓸 때 디렉터리를 한 번 훑는다 (_lock 안에서 호출)
+        if self._index is not None:
+            return
+        self._index = {}
+        self._size = 0
+        if not os.path.isdir(self.path):
+            return
+        for shard in os.listdir(self.path):
+            shard_dir = os.path.join(self.path, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if name.startswith("."):
+                    continue
+                try:
+                    st = os.stat(os.path.join(shard_dir, name))
+                except OSError:
+                    continue
+                self._index[name] = [st.st_size, st.st_mtime]
+                self._size += st.st_size
+
+    def get(self, endpoint, method, url, body=None):
+        """유효한 캐시 응답(bytes)을 반환한다. 없거나 만료됐으면 None."""
+        key = self.key(method, url, body)
+        path = self._file(key)
+        with self._lock:
+            self._load_index()
+            entry = self._index.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+        try:
+            stored_at = os.stat(path).st_mtime
+            if time.time() - stored_at > self.ttls.get(endpoint, 0):
+                with self._lock:
+                    self.stats["expired"] += 1
+                return None
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            with self._lock:
+                self._drop(key)
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            entry[1] = time.time()
+            self.stats["hits"] += 1
+        return data
+
+    def put(self, endpoint, method, url, body, data):
+        if endpoint not in self.ttls:
+            return
+        key = self.key(method, url, body)
+        path = self._file(key)
+        compressed = zlib.compress(data, 6)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 스레드가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔치기
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._load_index()
+            old = self._index.get(key)
+            if old:
+                self._size -= old[0]
+            self._index[key] = [len(compressed), time.time()]
+            self._size += len(compressed)
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _evict(self):
+        # _lock 안에서 호출
+        if self._size <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._size <= self.max_bytes * 0.9:
+                break
+            self._drop(key)
+            self.stats["evictions"] += 1
+
+    def _drop(self, key):
+        entry = self._index.pop(key, None)
+        if entry:
+            self._size -= entry[0]
+        try:
+            os.unlink(self._file(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._drop(key)
+
+    def snapshot(self):
+        with self._lock:
+            self._load_index()
+            return dict(self.stats, entries=len(self._index), bytes=self._size)
+
+
+if __name__ == "__main__":
+    import shutil
+
+    tmp = tempfile.mkdtemp()
+    cache = HTTPCache(tmp, max_bytes=1000, ttls={"list": 1})
+    url = "https://www.1365.go.kr/vols/1572247904127/partcptn/timeCptn.do"
+    page = ("<li>봉사활동</li>" * 200).encode("utf-8")
+
+    cache.put("list", "POST", url, b"cPage=1", page)
+    print("같은 요청:", cache.get("list", "POST", url, b"cPage=1") == page)
+    print("다른 본문:", cache.get("list", "POST", url, b"cPage=2"))
+    for i in range(2, 40):
+        cache.put("list", "POST", url, f"cPage={i}".encode(), page + str(i).encode() * i * 20)
+    print("LRU 정리 후:", cache.snapshot())
+    time.sleep(1.1)
+    print("만료:", cache.get("list", "POST", url, b"cPage=39"))
+    print("재시작 후 인덱스:", HTTPCache(tmp).snapshot()["entries"], "개")
+    shutil.rmtree(tmp)
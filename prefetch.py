@@ -0,0 +1,275 @@
+import copy
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+import db
+import scraper
+
+# 낮을수록 먼저 받는다
+PRIORITY_SAVED = 0    # 저장한 활동
+PRIORITY_SEARCH = 1   # 검색 결과에 보인 활동
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 한 번의 실행으로 합친다.
+
+    먼저 온 호출이 fn()을 실행하고, 그동안 같은 키로 온 호출은 그 결과(또는 예외)를 함께 받는다.
+    실패는 error_ttl초, None 결과(없는 페이지)는 missing_ttl초 동안 기억해 다시 실행하지 않는다.
+    """
+
+    def __init__(self, error_ttl=30, missing_ttl=600, max_negative=1000):
+        self.error_ttl = error_ttl
+        self.missing_ttl = missing_ttl
+        self.max_negative = max_negative
+        self._lock = threading.Lock()
+        self._inflight = {}   # key -> Future
+        self._negative = {}   # key -> (만료 시각, 예외 또는 None)
+        self.stats = {"calls": 0, "shared": 0, "negative_hits": 0}
+
+    def do(self, key, fn):
+        now = time.monotonic()
+        with self._lock:
+            self.stats["calls"] += 1
+            negative = self._negative.get(key)
+            if negative and negative[0] > now:
+                self.stats["negative_hits"] += 1
+                if negative[1] is not None:
+                    raise _fresh(negative[1]) from negative[1]
+                return None
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["shared"] += 1
+        if not leader:
+            error = future.exception()
+            if error is not None:
+                raise _fresh(error) from error
+            return future.result()
+
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, future, self.error_ttl, e)
+            future.set_exception(e)
+            raise
+        self._finish(key, future, self.missing_ttl if result is None else 0, None)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key, future, ttl, error):
+        with self._lock:
+            del self._inflight[key]
+            if ttl:
+                if len(self._negative) >= self.max_negative:
+                    now = time.monotonic()
+                    self._negative = {k: v for k, v in self._negative.items() if v[0] > now}
+                    if len(self._negative) >= self.max_negative:
+                        self._negative.pop(next(iter(self._negative)))
+                self._negative[key] = (time.monotonic() + ttl, error)
+
+
+def _fresh(error):
+    # 같은 예외 객체를 여러 스레드에서 raise하면 __traceback__이 서로 덮어쓰이므로 호출마다 복사한다
+    try:
+        return copy.copy(error)
+    except Exception:
+        return RuntimeError(str(error))
+
+
+class DetailPrefetcher:
+    """상세 페이지를 백그라운드에서 미리 받아 DB에 저장한다.
+
+    검색 결과/저장 목록에 보인 활동을 enqueue()로 넣어두면 워커 스레드가
+    우선순위 순으로 scraper.fetch_detail()을 호출하고 db.update_activity_detail로 저장한다.
+    사용자가 상세 페이지를 처음 열 때 포털 왕복을 기다리지 않게 하려는 것.
+
+    - 같은 program_id는 큐에 한 번만 들어간다. 더 높은 우선순위로 다시 넣으면 앞당겨진다.
+    - 같은 우선순위에서는 최근에 넣은 것(방금 본 검색 결과)이 먼저, 한 번에 넣은 것끼리는 넣은 순서대로.
+    - 큐는 max_queue개까지. 가득 차면 가장 뒤의 항목을 버린다.
+    - 포털 요청은 초당 rate회를 넘지 않는다.
+    - 상세 페이지 라우트도 load()를 쓴다. 같은 활동을 여러 요청/워커가 동시에 받으려 하면
+      포털 요청과 DB 쓰기는 한 번만 일어나고 나머지는 그 결과를 기다린다 (SingleFlight).
+
+        prefetcher = DetailPrefetcher(pool)
+        prefetcher.start()
+        prefetcher.enqueue(["1234567", "1234568"])
+    """
+
+    def __init__(self, pool, workers=2, max_queue=500, rate=2.0, fetch=None):
+        self.pool = pool
+        self.workers = workers
+        self.max_queue = max_queue
+        self.fetch = fetch or scraper.fetch_detail
+        self.flight = SingleFlight()
+        self._rate_limiter = scraper.RateLimiter(rate, burst=workers)
+        self._heap = []        # (priority, -batch, index, program_id)
+        self._queued = {}      # program_id -> 큐에 있는 현재 키 (이전 키로 남은 항목은 꺼낼 때 무시)
+        self._running = set()  # 받는 중인 program_id
+        self._batch = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+        self.stats = {"enqueued": 0, "fetched": 0, "skipped": 0, "failed": 0, "dropped": 0}
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"prefetch-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def enqueue(self, program_ids, priority=PRIORITY_SEARCH):
+        """program_id 목록을 큐에 넣는다 (목록 순서대로 받는다). 넣은 개수를 반환."""
+        added = 0
+        with self._cond:
+            if self._stopped:
+                return 0
+            batch = -next(self._batch)
+            for index, program_id in enumerate(program_ids):
+                if not program_id or program_id in self._running:
+                    continue
+                key = (priority, batch, index)
+                current = self._queued.get(program_id)
+                if current is not None and current[0] <= priority:
+                    continue
+                if current is None and len(self._queued) >= self.max_queue and not self._evict(key):
+                    self.stats["dropped"] += 1
+                    continue
+                self._queued[program_id] = key
+                heapq.heappush(self._heap, (*key, program_id))
+                added += 1
+            self.stats["enqueued"] += added
+            if added:
+                self._cond.notify(added)
+        return added
+
+    def _evict(self, key):
+        # 큐에서 가장 뒤의 항목이 새 항목보다 뒤면 버린다 (_cond 안에서 호출)
+        live = [e for e in self._heap if self._queued.get(e[3]) == e[:3]]
+        worst = max(live)
+        if worst[:3] <= key:
+            return False
+        del self._queued[worst[3]]
+        self._heap = live
+        self._heap.remove(worst)
+        heapq.heapify(self._heap)
+        self.stats["dropped"] += 1
+        return True
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while self._heap:
+                    *key, program_id = heapq.heappop(self._heap)
+                    if self._queued.get(program_id) == tuple(key):
+                        del self._queued[program_id]
+                        self._running.add(program_id)
+                        return program_id
+                if self._stopped:
+                    return None
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            program_id = self._next()
+            if program_id is None:
+                return
+            try:
+                self._prefetch(program_id)
+            finally:
+                with self._cond:
+                    self._running.discard(program_id)
+
+    def load(self, program_id):
+        """상세 정보를 받아 DB에 저장한다. 저장돼 있거나 저장했으면 True, 포털에 없으면 False.
+
+        포털 오류는 예외로 올라온다. 실패/없는 페이지는 SingleFlight가 잠시 기억한다.
+        """
+        return bool(self.flight.do(program_id, lambda: self._load(program_id)))
+
+    def _load(self, program_id):
+        # 먼저 끝난 다른 요청이 이미 저장했으면 다시 받지 않는다
+        with self.pool.read() as conn:
+            activity = db.get_activity(conn, program_id)
+        if activity and activity.get("detail_fetched"):
+            return True
+        detail = self.fetch(program_id)
+        if not detail:
+            return None
+        self.pool.write(db.update_activity_detail, detail)
+        self._count("fetched")
+        return True
+
+    def _prefetch(self, program_id):
+        # 큐에 있는 동안 사용자가 먼저 열었으면 건너뛴다
+        with self.pool.read() as conn:
+            activity = db.get_activity(conn, program_id)
+        if not activity or activity.get("detail_fetched"):
+            self._count("skipped")
+            return
+        # 속도 제한은 SingleFlight 밖에서 기다린다. 안에서 기다리면 같은 활동을 연 사용자 요청이
+        # 미리받기의 토큰 대기 뒤에 줄을 서게 된다. 기다리는 사이 열렸으면 load()가 DB를 보고 끝낸다.
+        self._rate_limiter.acquire()
+        try:
+            self.load(program_id)
+        except Exception as e:
+            print(f"[상세 미리받기] {program_id} 실패: {e}", flush=True)
+            self._count("failed")
+
+    def _count(self, key):
+        with self._cond:
+            self.stats[key] += 1
+
+    def snapshot(self):
+        with self._cond:
+            stats = dict(self.stats, queued=len(self._queued), running=len(self._running))
+        stats.update(self.flight.stats)
+        return stats
+
+    def stop(self, timeout=5):
+        """새 작업을 받지 않고, 받는 중인 요청이 끝나면 워커를 멈춘다. 큐에 남은 항목은 버린다."""
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._queued.clear()
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    # 가짜 fetch로 우선순위/중복 제거 확인
+    tmp = tempfile.mkdtemp()
+    pool = db.ConnectionPool(os.path.join(tmp, "prefetch.db"))
+    pool.write(db.init_db)
+    for pid in ["A", "B", "C", "D", "S"]:
+        pool.write(db.ensure_activity_exists, pid, "2026-01-01T00:00:00")
+
+    order = []
+
+    def fake_fetch(program_id):
+        order.append(program_id)
+        time.sleep(0.01)
+        return {"program_id": program_id, "title": f"활동 {program_id}"}
+
+    prefetcher = DetailPrefetcher(pool, workers=1, rate=100, fetch=fake_fetch)
+    prefetcher.enqueue(["A", "B"])
+    prefetcher.enqueue(["C", "D", "A"])            # A는 중복
+    prefetcher.enqueue(["S"], PRIORITY_SAVED)
+    prefetcher.start()
+    while prefetcher.snapshot()["queued"] or prefetcher.snapshot()["running"]:
+        time.sleep(0.02)
+    prefetcher.stop()
+    print("받은 순서:", order)   # S(저장) → C, D(최근 검색) → A, B
+    print("통계:", prefetcher.snapshot())
+    with pool.read() as conn:
+        print("detail_fetched:", [db.get_activity(conn, p)["detail_fetched"] for p in "ABCDS"])
+    pool.close()
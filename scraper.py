@@ -1,11 +1,27 @@
-import urllib.request
+import urllib.error
 import urllib.parse
+import http.client
+import gzip
+import random
 import re
 import ssl
+import threading
+import time
 from bs4 import BeautifulSoup
 
-API_URL = "https://www.1365.go.kr/vols/1572247904127/partcptn/timeCptn.do"
-DISTRICT_URL = "https://www.1365.go.kr/vols/P9210/mber/volsMberJson.do"
+import htmlscan
+
+PORTAL_URL = "https://www.1365.go.kr"
+API_PATH = "/vols/1572247904127/partcptn/timeCptn.do"
+DISTRICT_PATH = "/vols/P9210/mber/volsMberJson.do"
+API_URL = PORTAL_URL + API_PATH
+DISTRICT_URL = PORTAL_URL + DISTRICT_PATH
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+FORM_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "User-Agent": USER_AGENT,
+}
 
 REGION_CODES = {
     "6110000": "서울특별시",
@@ -27,6 +43,27 @@ REGION_CODES = {
     "6500000": "제주특별자치도",
 }
 
+# 주소 앞머리에 쓰이는 시/도 약칭·옛 이름 → 지역코드
+REGION_ALIASES = {
+    "서울": "6110000", "서울시": "6110000",
+    "부산": "6260000", "부산시": "6260000",
+    "대구": "6270000", "대구시": "6270000",
+    "인천": "6280000", "인천시": "6280000",
+    "광주": "6290000",  # "광주시"는 경기도 광주시와 겹쳐 넣지 않는다
+    "대전": "6300000", "대전시": "6300000",
+    "울산": "6310000", "울산시": "6310000",
+    "세종": "5690000", "세종시": "5690000",
+    "경기": "6410000",
+    "강원": "6420000", "강원도": "6420000",
+    "충북": "6430000",
+    "충남": "6440000",
+    "전북": "6450000", "전라북도": "6450000",
+    "전남": "6460000",
+    "경북": "6470000",
+    "경남": "6480000",
+    "제주": "6500000", "제주도": "6500000",
+}
+
 CATEGORY_CODES = {
     "0100": "생활편의",
     "0200": "주거환경",
@@ -63,16 +100,200 @@ TARGET_CODES = {
     "99": "기타",
 }
 
+# HTML 파서 백엔드. "fast"는 htmlscan의 스트리밍 파서, "bs4"는 BeautifulSoup 기준 구현.
+PARSER_BACKEND = "fast"
+
+
+class HTTPPool:
+    """호스트별 keep-alive 연결 풀 (스레드 안전).
+
+    요청마다 TCP+TLS 핸드셰이크를 새로 하지 않도록 응답을 다 읽은 연결을 다시 쓴다.
+    호스트당 동시 연결 수는 max_per_host로 제한한다. 재사용한 연결이 서버 쪽에서
+    이미 끊겨 있으면(응답 바이트를 받기 전) 새 연결로 한 번 다시 보낸다. 3xx는 따라간다.
+    """
+
+    def __init__(self, max_per_host=8):
+        self.max_per_host = max_per_host
+        self._idle = {}    # (scheme, host, port) -> [연결]
+        self._slots = {}   # (scheme, host, port) -> BoundedSemaphore
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    # 따라갈 리디렉션 상태 코드와 최대 횟수 (urlopen과 같은 규칙)
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 5
+
+    def request(self, method, url, body=None, headers=None, timeout=20):
+        """응답 본문(bytes)을 반환한다. gzip 응답은 풀어서 돌려준다. 4xx/5xx는 HTTPError.
+
+        3xx는 Location을 따라간다. 301/302/303은 본문 없이 GET으로, 307/308은 같은 메서드와 본문으로.
+        """
+        headers = dict(headers or {})
+        headers.setdefault("User-Agent", USER_AGENT)
+        headers.setdefault("Accept-Encoding", "gzip")
+        headers.setdefault("Connection", "keep-alive")
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            resp, data = self._send(method, url, body, headers, timeout)
+            if resp.status not in self.REDIRECT_CODES:
+                break
+            location = resp.getheader("Location")
+            if not location:
+                raise urllib.error.HTTPError(url, resp.status, "redirect without Location", resp.headers, None)
+            url = urllib.parse.urljoin(url, location)
+            if resp.status in (301, 302, 303) and method != "HEAD":
+                method, body = "GET", None
+                headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+        else:
+            raise urllib.error.HTTPError(url, resp.status, "too many redirects", resp.headers, None)
+
+        if (resp.getheader("Content-Encoding") or "").lower() == "gzip":
+            data = gzip.decompress(data)
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return data
+
+    def _send(self, method, url, body, headers, timeout):
+        """요청 한 번 → (응답, 본문 bytes).
+
+        재사용한 연결이 서버 쪽에서 이미 끊긴 경우(보내다 끊김, 응답 첫 바이트 전에 끊김)에만
+        새 연결로 한 번 다시 보낸다. 서버가 요청을 처리하지 않은 것이 확실한 경우라 POST도 안전하다.
+        응답을 받기 시작한 뒤의 오류나 타임아웃은 다시 보내지 않는다.
+        한 연결이 끊겨 있었으면 같이 쉬던 연결도 끊겼을 가능성이 크므로 그 호스트의 쉬는 연결을
+        모두 버리고, 다시 보낼 때는 새로 연 연결을 쓴다.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        with self._slot(key):
+            for attempt in range(2):
+                conn, reused = self._checkout(key, timeout, fresh=attempt > 0)
+                stale = reused and attempt == 0
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                except (BrokenPipeError, ConnectionResetError):
+                    conn.close()
+                    if stale:
+                        self._drop_idle(key)
+                        continue
+                    raise
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    raise
+                try:
+                    resp = conn.getresponse()
+                except http.client.RemoteDisconnected:
+                    conn.close()
+                    if stale:
+                        self._drop_idle(key)
+                        continue
+                    raise
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    raise
+                try:
+                    data = resp.read()
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    raise
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._checkin(key, conn)
+                return resp, data
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _checkout(self, key, timeout, fresh=False):
+        """쉬는 연결을 꺼내거나 새로 연다 → (연결, 재사용 여부). fresh=True면 항상 새로 연다."""
+        conn = None
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _drop_idle(self, key):
+        with self._lock:
+            conns = self._idle.pop(key, [])
+        for conn in conns:
+            conn.close()
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+http_pool = HTTPPool()
+
+# 응답 캐시 (httpcache.HTTPCache). None이면 항상 포털에 요청한다. app.py가 설정한다.
+http_cache = None
+
+
+def _post(endpoint, url, data, timeout, refresh=False):
+    """포털에 POST하고 (응답 본문 bytes, 캐시에서 읽었는지)를 반환한다. http_cache가 있으면 먼저 찾아본다.
+
+    refresh=True면 캐시를 읽지 않고 새로 받는다. 받은 응답은 여기서 캐시에 넣지 않는다.
+    포털은 오류 페이지도 200으로 주므로, 호출한 쪽이 파싱에 성공한 응답만 _remember()로 넣는다.
+    """
+    cache = http_cache
+    if cache is not None and not refresh:
+        body = cache.get(endpoint, "POST", url, data)
+        if body is not None:
+            return body, True
+    return http_pool.request("POST", url, body=data, headers=FORM_HEADERS, timeout=timeout), False
+
+
+def _remember(endpoint, url, data, body):
+    cache = http_cache
+    if cache is not None:
+        cache.put(endpoint, "POST", url, data, body)
+
+
+def set_base_url(base_url):
+    """포털 주소를 바꾼다. 로컬 가짜 포털(bench/fake_portal.py)로 부하 테스트할 때 쓴다.
+
+        scraper.set_base_url("http://127.0.0.1:8765")
+    """
+    global API_URL, DISTRICT_URL
+    base_url = base_url.rstrip("/")
+    API_URL = base_url + API_PATH
+    DISTRICT_URL = base_url + DISTRICT_PATH
+
 
-def fetch_page(params):
+def fetch_page(params, refresh=False):
     data = urllib.parse.urlencode(params, doseq=True).encode("utf-8")
-    req = urllib.request.Request(API_URL, data=data, headers={
-        "Content-Type": "application/x-www-form-urlencoded",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-    })
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=20, context=ctx) as resp:
-        return resp.read().decode("utf-8")
+    body, cached = _post("list", API_URL, data, 20, refresh)
+    html = body.decode("utf-8")
+    # 전체 건수 표시가 없으면 목록 페이지가 아니다 (포털 오류 페이지). 캐시에 넣지 않는다
+    if not cached and _TOTAL_COUNT.search(html):
+        _remember("list", API_URL, data, body)
+    return html
 
 
 def build_params(region="", district="", category="", activity_type="",
@@ -100,14 +321,29 @@ def build_params(region="", district="", category="", activity_type="",
     return params
 
 
+_TOTAL_COUNT = re.compile(r'전체\s*<em>([\d,]+)</em>\s*건')
+
+
 def parse_total_count(html):
-    match = re.search(r'전체\s*<em>([\d,]+)</em>\s*건', html)
+    match = _TOTAL_COUNT.search(html)
     if match:
         return int(match.group(1).replace(",", ""))
     return 0
 
 
-def parse_activities(html):
+def parse_activities(html, backend=None):
+    """목록 페이지 HTML에서 봉사활동 목록을 추출한다. backend: "fast"(기본) 또는 "bs4"."""
+    if (backend or PARSER_BACKEND) == "bs4":
+        return _parse_activities_bs4(html)
+    return [
+        _list_item(raw["program_id"], raw["badges"], raw["title"], raw["location"],
+                   raw["organization"], raw["status"], raw["pc_fields"])
+        for raw in htmlscan.scan_activities(html)
+    ]
+
+
+def _parse_activities_bs4(html):
+    # 기준 구현. htmlscan의 결과는 항상 이것과 같아야 한다.
     soup = BeautifulSoup(html, "html.parser")
     results = []
 
@@ -116,13 +352,10 @@ def parse_activities(html):
         return results
 
     for li in list_wrap.find_all("li", recursive=False):
-        item = {}
-
         # 프로그램 ID
         hidden = li.find("input", {"name": "progrmRegistNo"})
         if not hidden:
             continue
-        item["program_id"] = hidden.get("value", "")
 
         # 분야 뱃지 (시간인증, 온/오프라인, 분야명)
         badges = []
@@ -130,99 +363,180 @@ def parse_activities(html):
         if badge_ul:
             badges = [b.get_text(strip=True) for b in badge_ul.find_all("li")]
 
-        # 활동구분 파싱
-        activity_type = ""
-        for b in badges:
-            if "온라인" in b and "오프라인" in b:
-                activity_type = "온라인+오프라인"
-                break
-            elif "오프라인" in b:
-                activity_type = "오프라인"
-                break
-            elif "온라인" in b:
-                activity_type = "온라인"
-                break
-        item["activity_type"] = activity_type
-
-        # 분야 (시간인증, 온라인/오프라인 제외한 나머지)
-        skip = {"시간인증", "온라인", "오프라인", "온라인+오프라인"}
-        category_badges = [b for b in badges if b not in skip]
-        item["category"] = category_badges[0] if category_badges else ""
-
         # 제목
         title_div = li.select_one("div.tit_board_list")
-        item["title"] = title_div.get_text(strip=True) if title_div else ""
+        title = title_div.get_text(strip=True) if title_div else ""
 
         # 위치, 기관
+        location = organization = ""
         loc_div = li.select_one("div.vols-location")
         if loc_div:
             spans = loc_div.find_all("span")
-            item["location"] = spans[0].get_text(strip=True) if len(spans) > 0 else ""
-            item["organization"] = spans[1].get_text(strip=True) if len(spans) > 1 else ""
-        else:
-            item["location"] = ""
-            item["organization"] = ""
+            location = spans[0].get_text(strip=True) if len(spans) > 0 else ""
+            organization = spans[1].get_text(strip=True) if len(spans) > 1 else ""
 
         # 모집상태
         status_div = li.select_one("div.close_dDay div.end")
-        item["recruit_status"] = status_div.get_text(strip=True) if status_div else ""
+        status = status_div.get_text(strip=True) if status_div else ""
 
-        # PC용 상세정보 영역에서 기간/시간 파싱 (모바일 중복 무시)
+        # PC용 상세정보 영역 (모바일 중복 무시)
+        pc_fields = []
         pc_section = li.select_one("div.txts_pc_ver")
-        item["period_start"] = ""
-        item["period_end"] = ""
-        item["volunteer_time"] = ""
-        item["recruit_start"] = ""
-        item["recruit_end"] = ""
-        item["recognized_hours"] = ""
-
         if pc_section:
             for div in pc_section.find_all("div", recursive=True):
                 p = div.find("p")
                 span = div.find("span")
-                if not p or not span:
-                    continue
-                label = p.get_text(strip=True)
-                value = span.get_text(strip=True)
-
-                if label == "봉사기간":
-                    dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", value)
-                    if len(dates) >= 2:
-                        item["period_start"] = dates[0].replace(".", "-")
-                        item["period_end"] = dates[1].replace(".", "-")
-                elif label == "봉사시간":
-                    item["volunteer_time"] = re.sub(r"\s+", " ", value)
-                elif label == "모집기간":
-                    dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", value)
-                    if len(dates) >= 2:
-                        item["recruit_start"] = dates[0].replace(".", "-")
-                        item["recruit_end"] = dates[1].replace(".", "-")
-                elif label == "인정시간":
-                    item["recognized_hours"] = value
-
-        results.append(item)
+                if p and span:
+                    pc_fields.append((p.get_text(strip=True), span.get_text(strip=True)))
+
+        results.append(_list_item(hidden.get("value", ""), badges, title, location,
+                                  organization, status, pc_fields))
 
     return results
 
 
-def fetch_districts(city_code):
+def _list_item(program_id, badges, title, location, organization, status, pc_fields):
+    """파서에서 뽑은 텍스트로 목록 항목 dict를 만든다 (두 백엔드 공통)."""
+    item = {"program_id": program_id}
+
+    # 활동구분 파싱
+    activity_type = ""
+    for b in badges:
+        if "온라인" in b and "오프라인" in b:
+            activity_type = "온라인+오프라인"
+            break
+        elif "오프라인" in b:
+            activity_type = "오프라인"
+            break
+        elif "온라인" in b:
+            activity_type = "온라인"
+            break
+    item["activity_type"] = activity_type
+
+    # 분야 (시간인증, 온라인/오프라인 제외한 나머지)
+    skip = {"시간인증", "온라인", "오프라인", "온라인+오프라인"}
+    category_badges = [b for b in badges if b not in skip]
+    item["category"] = category_badges[0] if category_badges else ""
+
+    item["title"] = title
+    item["location"] = location
+    item["organization"] = organization
+    item["region_code"], item["district_code"] = resolve_region(location)
+    item["recruit_status"] = status
+
+    # 기간/시간
+    item["period_start"] = ""
+    item["period_end"] = ""
+    item["volunteer_time"] = ""
+    item["recruit_start"] = ""
+    item["recruit_end"] = ""
+    item["recognized_hours"] = ""
+
+    for label, value in pc_fields:
+        if label == "봉사기간":
+            dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", value)
+            if len(dates) >= 2:
+                item["period_start"] = dates[0].replace(".", "-")
+                item["period_end"] = dates[1].replace(".", "-")
+        elif label == "봉사시간":
+            item["volunteer_time"] = re.sub(r"\s+", " ", value)
+        elif label == "모집기간":
+            dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", value)
+            if len(dates) >= 2:
+                item["recruit_start"] = dates[0].replace(".", "-")
+                item["recruit_end"] = dates[1].replace(".", "-")
+        elif label == "인정시간":
+            item["recognized_hours"] = value
+
+    return item
+
+
+# 지역코드 → [(시군구명, 코드)] (긴 이름 우선). load_districts()로 채운다.
+_district_names = {}
+_district_lock = threading.Lock()
+
+# 긴 이름부터 비교해야 "광주"가 "광주광역시"를 가로채지 않는다
+_region_prefixes = sorted(
+    [(name, code) for code, name in REGION_CODES.items()] + list(REGION_ALIASES.items()),
+    key=lambda x: -len(x[0])
+)
+
+
+def load_districts(city_code):
+    """시군구 목록을 한 번만 가져와 주소 해석용으로 보관한다. 실패하면 빈 목록."""
+    with _district_lock:
+        if city_code in _district_names:
+            return
+    try:
+        districts = fetch_districts(city_code)
+    except Exception as e:
+        print(f"[시군구] {city_code} 목록 조회 실패: {e}", flush=True)
+        return
+    set_districts(city_code, districts)
+
+
+def set_districts(city_code, districts):
+    names = sorted(((name.replace(" ", ""), code) for code, name in districts.items()),
+                   key=lambda x: -len(x[0]))
+    with _district_lock:
+        _district_names[city_code] = names
+
+
+def resolve_region(location):
+    """주소 텍스트 → (지역코드, 시군구코드). 모르면 빈 문자열.
+
+    시/도는 주소 맨 앞에서만 찾는다. 본문에 다른 도시 이름이 나와도 잘못 매칭되지 않는다.
+    시군구는 load_districts()로 목록을 받아둔 지역만 해석된다.
+    """
+    text = (location or "").strip()
+    region_code = ""
+    rest = text
+    for name, code in _region_prefixes:
+        # 약칭 바로 뒤에 "시"가 오면 같은 이름의 다른 시 ("광주시" = 경기도 광주시)
+        if text.startswith(name) and not text.startswith("시", len(name)):
+            region_code = code
+            rest = text[len(name):]
+            break
+    if not region_code:
+        return "", ""
+
+    with _district_lock:
+        names = _district_names.get(region_code, [])
+    compact = rest.replace(" ", "")
+    for name, code in names:
+        if compact.startswith(name):
+            return region_code, code
+    return region_code, ""
+
+
+def find_districts(name, region_code=""):
+    """시군구 이름 → [(지역코드, 시군구코드)]. region_code가 없으면 목록을 받아둔 모든 지역에서 찾는다.
+
+    "중구"처럼 여러 지역에 있는 이름은 여러 개가 나온다.
+    """
+    compact = name.replace(" ", "")
+    with _district_lock:
+        regions = [region_code] if region_code else list(_district_names)
+        return [(region, code) for region in regions
+                for district, code in _district_names.get(region, []) if district == compact]
+
+
+def fetch_districts(city_code, refresh=False):
     import json as _json
     data = urllib.parse.urlencode({
         "type": "hopeAreaList",
         "upper": city_code,
         "engnSe": "4",
     }).encode("utf-8")
-    req = urllib.request.Request(DISTRICT_URL, data=data, headers={
-        "Content-Type": "application/x-www-form-urlencoded",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-    })
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=10, context=ctx) as resp:
-        result = _json.loads(resp.read().decode("utf-8"))
-    return {item["code"]: item["codeNm"] for item in result.get("list", [])}
+    raw, cached = _post("districts", DISTRICT_URL, data, 10, refresh)
+    result = _json.loads(raw.decode("utf-8"))
+    districts = {item["code"]: item["codeNm"] for item in result.get("list", [])}
+    if not cached:
+        _remember("districts", DISTRICT_URL, data, raw)
+    return districts
 
 
-def fetch_detail(program_id):
+def fetch_detail(program_id, refresh=False):
     """상세 페이지 HTML을 가져와 파싱한다."""
     url = API_URL + "?" + urllib.parse.urlencode({
         "type": "show",
@@ -238,40 +552,34 @@ def fetch_detail(program_id):
         "progrmRegistNo": program_id,
     }
     data = urllib.parse.urlencode(params).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers={
-        "Content-Type": "application/x-www-form-urlencoded",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-    })
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=20, context=ctx) as resp:
-        html = resp.read().decode("utf-8")
-    return parse_detail(html, program_id)
+    body, cached = _post("detail", url, data, 20, refresh)
+    item = parse_detail(body.decode("utf-8"), program_id)
+    # 없는 페이지/오류 페이지(None)는 캐시에 넣지 않는다 (없는 페이지는 SingleFlight가 잠시 기억)
+    if item is not None and not cached:
+        _remember("detail", url, data, body)
+    return item
 
 
-def parse_detail(html, program_id):
-    """상세 페이지 HTML에서 봉사활동 정보를 추출한다."""
+def parse_detail(html, program_id, backend=None):
+    """상세 페이지 HTML에서 봉사활동 정보를 추출한다. backend: "fast"(기본) 또는 "bs4"."""
+    if (backend or PARSER_BACKEND) == "bs4":
+        return _parse_detail_bs4(html, program_id)
+    raw = htmlscan.scan_detail(html)
+    if raw is None:
+        return None
+    return _detail_item(program_id, raw["title"], raw["fields"], raw["body"])
+
+
+def _parse_detail_bs4(html, program_id):
+    # 기준 구현. htmlscan의 결과는 항상 이것과 같아야 한다.
     soup = BeautifulSoup(html, "html.parser")
 
     board_view = soup.select_one("div.board_view")
     if not board_view:
         return None
 
-    item = {"program_id": program_id}
-
-    # 제목 + 모집상태
     tit = board_view.select_one("h3.tit_board_view")
-    if tit:
-        full = tit.get_text(strip=True)
-        m = re.search(r"\(([^)]+)\)\s*$", full)
-        if m:
-            item["recruit_status"] = m.group(1)
-            item["title"] = full[:m.start()].strip()
-        else:
-            item["title"] = full
-            item["recruit_status"] = ""
-    else:
-        item["title"] = ""
-        item["recruit_status"] = ""
+    title = tit.get_text(strip=True) if tit else None
 
     # dl > dt + dd 쌍 파싱
     data_show = board_view.select_one("div.board_data_show")
@@ -281,12 +589,42 @@ def parse_detail(html, program_id):
             dt = dl.find("dt")
             dd = dl.find("dd")
             if dt and dd:
-                fields[dt.get_text(strip=True)] = dd
+                span = dd.select_one("span.text-l")
+                fields[dt.get_text(strip=True)] = (
+                    dd.get_text(), dd.get_text(strip=True),
+                    span.get_text(strip=True) if span else None,
+                )
+
+    board_body = board_view.select_one("div.board_body")
+    body = board_body.get_text(strip=True) if board_body else None
+
+    return _detail_item(program_id, title, fields, body)
+
+
+def _detail_item(program_id, title, fields, body):
+    """상세 페이지에서 뽑은 텍스트로 항목 dict를 만든다 (두 백엔드 공통).
+
+    fields: {dt 라벨: (dd.get_text(), dd.get_text(strip=True), span.text-l 텍스트 또는 None)}
+    """
+    item = {"program_id": program_id}
+
+    # 제목 + 모집상태
+    if title is not None:
+        m = re.search(r"\(([^)]+)\)\s*$", title)
+        if m:
+            item["recruit_status"] = m.group(1)
+            item["title"] = title[:m.start()].strip()
+        else:
+            item["title"] = title
+            item["recruit_status"] = ""
+    else:
+        item["title"] = ""
+        item["recruit_status"] = ""
 
     # 봉사기간
     period_dd = fields.get("봉사기간")
     if period_dd:
-        dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", period_dd.get_text())
+        dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", period_dd[0])
         item["period_start"] = dates[0].replace(".", "-") if len(dates) >= 1 else ""
         item["period_end"] = dates[1].replace(".", "-") if len(dates) >= 2 else ""
     else:
@@ -295,12 +633,12 @@ def parse_detail(html, program_id):
 
     # 봉사시간
     time_dd = fields.get("봉사시간")
-    item["volunteer_time"] = re.sub(r"\s+", " ", time_dd.get_text(strip=True)) if time_dd else ""
+    item["volunteer_time"] = re.sub(r"\s+", " ", time_dd[1]) if time_dd else ""
 
     # 모집기간
     recruit_dd = fields.get("모집기간")
     if recruit_dd:
-        dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", recruit_dd.get_text())
+        dates = re.findall(r"(\d{4}\.\d{2}\.\d{2})", recruit_dd[0])
         item["recruit_start"] = dates[0].replace(".", "-") if len(dates) >= 1 else ""
         item["recruit_end"] = dates[1].replace(".", "-") if len(dates) >= 2 else ""
     else:
@@ -318,93 +656,310 @@ def parse_detail(html, program_id):
         ("activity_type", "활동구분"),
     ]:
         dd = fields.get(label)
-        item[key] = re.sub(r"\s+", " ", dd.get_text(strip=True)) if dd else ""
+        item[key] = re.sub(r"\s+", " ", dd[1]) if dd else ""
 
     # 모집기관 (span.text-l 에 이름)
     org_dd = fields.get("모집기관")
     if org_dd:
-        span = org_dd.select_one("span.text-l")
-        item["organization"] = span.get_text(strip=True) if span else org_dd.get_text(strip=True)
+        item["organization"] = org_dd[2] if org_dd[2] is not None else org_dd[1]
     else:
         item["organization"] = ""
 
     # 등록기관
     reg_dd = fields.get("등록기관")
-    item["register_org"] = reg_dd.get_text(strip=True) if reg_dd else ""
+    item["register_org"] = reg_dd[1] if reg_dd else ""
 
     # 봉사장소
     place_dd = fields.get("봉사장소")
-    item["location"] = place_dd.get_text(strip=True) if place_dd else ""
+    item["location"] = place_dd[1] if place_dd else ""
+    item["region_code"], item["district_code"] = resolve_region(item["location"])
 
     # 인정시간 (봉사시간 텍스트에서 추출)
     hours_match = re.search(r"최대\s*(\d+)시간\s*인정", item.get("volunteer_time", ""))
     item["recognized_hours"] = f"{hours_match.group(1)}시간" if hours_match else ""
 
     # 활동 설명
-    board_body = board_view.select_one("div.board_body")
-    item["description"] = board_body.get_text(strip=True) if board_body else ""
+    item["description"] = body if body is not None else ""
 
     return item
 
 
 def search(region="", district="", category="", activity_type="",
            target="", status="0", date_start="", date_end="",
-           keyword="", page=1):
+           keyword="", page=1, refresh=False):
     params = build_params(region, district, category, activity_type,
                           target, status, date_start, date_end, keyword, page)
-    html = fetch_page(params)
+    html = fetch_page(params, refresh)
     total = parse_total_count(html)
     activities = parse_activities(html)
     return {"items": activities, "total": total, "page": page}
 
 
-def sync_filtered(region="", district="", category="", activity_type="",
-                   target="", status="0", date_start="", date_end="",
-                   keyword="", progress_callback=None):
-    """필터링된 검색 결과의 모든 페이지를 가져온다.
-    3개 스레드로 병렬 요청. progress_callback(page, total_pages, fetched)가 호출된다.
+class RateLimiter:
+    """토큰 버킷: 초당 rate개, 최대 burst개까지 몰아서 허용. rate가 0 이하면 제한 없음."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """AIMD 동시성 제어.
+
+    성공하면 한도를 1/한도씩 늘리고 (한도만큼 성공하면 +1), 오류가 나거나 응답 지연이
+    최소 지연의 latency_factor배를 넘으면 한도를 줄인다. 한 번 몰려온 실패로 한도가
+    바닥까지 떨어지지 않도록 감소는 최근 지연 시간에 한 번만 한다.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from categorizer import compute_group_key
+
+    def __init__(self, initial=3, min_limit=1, max_limit=8, latency_factor=2.0, latency_floor=1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor  # 이보다 빠르면 지연으로 줄이지 않음 (초)
+        self.avg_latency = None
+        self.min_latency = None
+        self.errors = 0
+        self.requests = 0
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency, ok):
+        with self._cond:
+            self._in_flight -= 1
+            self.requests += 1
+            if ok:
+                self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+                self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+                slow = (self.avg_latency > self.latency_floor
+                        and self.avg_latency > self.min_latency * self.latency_factor)
+                if slow:
+                    self._decrease(0.75)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.errors += 1
+                self._decrease(0.5)
+            self._cond.notify_all()
+
+    def _decrease(self, factor):
+        now = time.monotonic()
+        if now - self._last_decrease < (self.avg_latency or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+
+
+def _retryable(e):
+    if isinstance(e, urllib.error.HTTPError):
+        return e.code == 429 or e.code >= 500
+    return isinstance(e, (urllib.error.URLError, http.client.HTTPException, OSError))
+
+
+def _fetch_with_retry(fetch, limiter, rate_limiter, retries, backoff):
+    """limiter/rate_limiter를 거쳐 fetch()를 호출한다. 일시적 오류는 지터 백오프로 재시도."""
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            result = fetch()
+        except Exception as e:
+            limiter.release(time.monotonic() - started, ok=False)
+            if attempt >= retries or not _retryable(e):
+                raise
+            # full jitter: 0 ~ backoff * 2^attempt 초 (대기 중에는 동시성 슬롯을 내놓는다)
+            time.sleep(random.uniform(0, backoff * (2 ** attempt)))
+            continue
+        limiter.release(time.monotonic() - started, ok=True)
+        return result
+
+
+def iter_sync_pages(region="", district="", category="", activity_type="",
+                    target="", status="0", date_start="", date_end="",
+                    keyword="", min_workers=1, max_workers=8, initial_workers=3,
+                    max_rps=6.0, retries=3, backoff=1.0, skip_pages=(), total=None,
+                    known_ids=None, stop_after_known=3, refresh=False):
+    """필터링된 검색 결과의 모든 페이지를 받는 대로 하나씩 내보내는 제너레이터.
+
+    {"page", "total_pages", "total", "items", "error"}를 완료 순서로 yield한다.
+    (error는 재시도까지 실패한 페이지의 오류 메시지, 성공이면 None)
+    동시 요청 수는 AdaptiveLimiter가 응답 지연/오류에 따라 min_workers~max_workers 사이에서 조절하고,
+    초당 요청 수는 max_rps를 넘지 않는다. 페이지별로 최대 retries번 재시도한다.
+    아직 소비되지 않은 페이지는 max_workers * 2개까지만 미리 받아 메모리 사용량이 일정하다.
+
+    이어받기: skip_pages의 페이지는 요청하지 않는다. 이전 작업의 전체 건수(total)를
+    알고 있고 1페이지도 끝났다면 1페이지 요청도 건너뛴다.
+
+    증분 동기화: known_ids(program_id 목록) -> 이미 DB에 있는 id 집합 을 주면
+    포털 목록을 앞에서부터 보다가 모든 활동이 이미 알려진 페이지가
+    stop_after_known개 연속되면 남은 페이지를 요청하지 않고 끝낸다.
+    build_params는 정렬 순서를 지정하지 않는다. 포털 기본 순서가 최신 등록순이라는
+    가정에 기대는 추정이므로, 뒤쪽 페이지에 끼어든 새 활동은 다음 전체 동기화 전까지 빠질 수 있다.
+    이 모드에서는 앞쪽 페이지를 먼저 보도록 미리 받는 페이지 수를 현재 동시성만큼으로 줄인다.
+
+    refresh=True면 응답 캐시(http_cache)를 건너뛰고 모든 페이지를 포털에서 새로 받는다.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from categorizer import compute_group_keys
     from datetime import datetime as _dt
 
-    # 첫 페이지: total_pages 파악용 (순차)
-    result = search(region=region, district=district, category=category,
-                    activity_type=activity_type, target=target, status=status,
-                    date_start=date_start, date_end=date_end, keyword=keyword, page=1)
-    total = result["total"]
-    total_pages = (total + 9) // 10
+    limiter = AdaptiveLimiter(initial=initial_workers, min_limit=min_workers, max_limit=max_workers)
+    rate_limiter = RateLimiter(max_rps)
+
+    # 주소 → 시군구코드 해석용 목록 (프로세스당 한 번)
+    for code in ([region] if region else REGION_CODES):
+        load_districts(code)
 
     now = _dt.now().isoformat()
-    all_items = []
 
-    for item in result["items"]:
-        item["group_key"] = compute_group_key(item["title"])
+    def finish(item, group_key):
+        item["group_key"] = group_key
         item["fetched_at"] = now
-    all_items.extend(result["items"])
-
-    if progress_callback:
-        progress_callback(1, total_pages, len(all_items))
-
-    # 나머지 페이지: 3개 스레드로 병렬 요청
-    if total_pages > 1:
-        def fetch_one(pg):
-            return pg, search(region=region, district=district, category=category,
-                              activity_type=activity_type, target=target, status=status,
-                              date_start=date_start, date_end=date_end, keyword=keyword, page=pg)
-
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {executor.submit(fetch_one, pg): pg for pg in range(2, total_pages + 1)}
-            for future in as_completed(futures):
-                pg, res = future.result()
-                for item in res["items"]:
-                    item["group_key"] = compute_group_key(item["title"])
-                    item["fetched_at"] = now
-                all_items.extend(res["items"])
-                if progress_callback:
-                    progress_callback(pg, total_pages, len(all_items))
-
-    return {"items": all_items, "total": total, "pages": total_pages}
+        # 주소로 해석이 안 되면 동기화 필터 값을 쓴다 (포털이 이미 걸러준 결과)
+        if region and not item["region_code"]:
+            item["region_code"] = region
+        if district and item["region_code"] == region and not item["district_code"]:
+            item["district_code"] = district
+
+    def fetch_one(pg):
+        result = _fetch_with_retry(
+            lambda: search(region=region, district=district, category=category,
+                           activity_type=activity_type, target=target, status=status,
+                           date_start=date_start, date_end=date_end, keyword=keyword, page=pg,
+                           refresh=refresh),
+            limiter, rate_limiter, retries, backoff)
+        group_keys = compute_group_keys([item["title"] for item in result["items"]])
+        for item, group_key in zip(result["items"], group_keys):
+            finish(item, group_key)
+        return result
+
+    skip_pages = set(skip_pages)
+    # 증분 모드: 페이지별 "전부 알려짐" 여부. 앞에서부터 연속 구간만 판정에 쓴다.
+    # 이어받기로 건너뛰는 페이지는 새 활동이 있었을 수 있으므로 연속 구간을 끊는 것으로 본다.
+    page_known = {pg: False for pg in skip_pages}
+    frontier = 1
+    streak = 0
+
+    if total is None or 1 not in skip_pages:
+        # 첫 페이지: total_pages 파악용 (순차)
+        result = fetch_one(1)
+        total = result["total"]
+        # 증분 판정은 yield 전에 한다 (소비자가 yield 뒤에 이 페이지를 저장하므로)
+        if known_ids:
+            page_known[1] = _all_known(result["items"], known_ids)
+        yield {"page": 1, "total_pages": (total + 9) // 10, "total": total,
+               "items": result["items"], "error": None}
+    total_pages = (total + 9) // 10
+
+    def should_stop():
+        nonlocal frontier, streak
+        while frontier in page_known:
+            streak = streak + 1 if page_known.pop(frontier) else 0
+            frontier += 1
+            if streak >= stop_after_known:
+                return True
+        return False
+
+    if total_pages > 1 and not (known_ids and should_stop()):
+        remaining = (pg for pg in range(2, total_pages + 1) if pg not in skip_pages)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            stopped = False
+            try:
+                while True:
+                    window = int(limiter.limit) + 1 if known_ids else max_workers * 2
+                    if not stopped:
+                        for pg in remaining:
+                            pending[executor.submit(fetch_one, pg)] = pg
+                            if len(pending) >= window:
+                                break
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pg = pending.pop(future)
+                        try:
+                            res = future.result()
+                        except Exception as e:
+                            # 재시도까지 실패한 페이지는 건너뛰고 나머지는 계속 받는다
+                            print(f"[동기화] 페이지 {pg} 실패: {e}", flush=True)
+                            page_known[pg] = False
+                            yield {"page": pg, "total_pages": total_pages, "total": total,
+                                   "items": [], "error": str(e)}
+                            continue
+                        if known_ids:
+                            page_known[pg] = _all_known(res["items"], known_ids)
+                        yield {"page": pg, "total_pages": total_pages, "total": total,
+                               "items": res["items"], "error": None}
+                    if known_ids and not stopped and should_stop():
+                        print(f"[동기화] 증분: {frontier - 1}페이지까지 확인, "
+                              f"알려진 페이지 {stop_after_known}개 연속 — 나머지 생략", flush=True)
+                        stopped = True
+                        for future in pending:
+                            future.cancel()
+                        pending = {f: p for f, p in pending.items() if not f.cancelled()}
+            finally:
+                # 소비자가 중간에 멈추면 아직 시작하지 않은 요청은 취소
+                for future in pending:
+                    future.cancel()
+
+    print(f"[동기화] 요청 {limiter.requests}회, 오류 {limiter.errors}회, "
+          f"최종 동시성 {limiter.limit:.1f}", flush=True)
+
+
+def _all_known(items, known_ids):
+    ids = [item["program_id"] for item in items]
+    return bool(ids) and len(known_ids(ids)) == len(ids)
+
+
+def sync_filtered(region="", district="", category="", activity_type="",
+                   target="", status="0", date_start="", date_end="",
+                   keyword="", progress_callback=None, **options):
+    """iter_sync_pages()의 결과를 모두 모아 반환한다. (options는 iter_sync_pages로 전달)
+    progress_callback(page, total_pages, fetched)가 호출된다.
+    """
+    all_items = []
+    failed_pages = []
+    total = total_pages = 0
+    for page in iter_sync_pages(region=region, district=district, category=category,
+                                activity_type=activity_type, target=target, status=status,
+                                date_start=date_start, date_end=date_end, keyword=keyword,
+                                **options):
+        total, total_pages = page["total"], page["total_pages"]
+        if page["error"]:
+            failed_pages.append(page["page"])
+            continue
+        all_items.extend(page["items"])
+        if progress_callback:
+            progress_callback(page["page"], total_pages, len(all_items))
+
+    return {"items": all_items, "total": total, "pages": total_pages,
+            "failed_pages": sorted(failed_pages)}
 
 
 if __name__ == "__main__":
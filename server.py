@@ -0,0 +1,87 @@
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
+
+from bottle import ServerAdapter
+
+
+class _Handler(WSGIRequestHandler):
+    quiet = True
+
+    def address_string(self):
+        # 역방향 DNS 조회 방지
+        return self.client_address[0]
+
+    def log_request(self, *args, **kw):
+        if not self.quiet:
+            super().log_request(*args, **kw)
+
+
+class PooledWSGIServer(WSGIServer):
+    """요청을 고정 크기 스레드 풀에서 처리하는 wsgiref 서버.
+
+    기본 wsgiref 서버는 요청을 하나씩 처리하므로 느린 요청(상세 조회, AI 검색)이
+    다른 사용자를 모두 막는다. 연결을 받는 스레드는 하나, 처리는 workers개 스레드가 한다.
+    """
+    request_queue_size = 128
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers=8):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # 처리 중인 요청은 끝까지 마친다
+        self._executor.shutdown(wait=True)
+
+
+class PooledServer(ServerAdapter):
+    """Bottle 서버 어댑터. SIGINT/SIGTERM을 받으면 새 연결을 멈추고 처리 중인 요청을 마친 뒤 종료한다.
+
+        app.run(server=PooledServer(host="0.0.0.0", port=8080, workers=8, on_shutdown=pool.close))
+    """
+
+    def run(self, app):
+        workers = self.options.get("workers", 8)
+        on_shutdown = self.options.get("on_shutdown")
+
+        server_cls = PooledWSGIServer
+        if ":" in self.host:
+            class server_cls(PooledWSGIServer):
+                address_family = socket.AF_INET6
+
+        _Handler.quiet = self.quiet
+        self.srv = server_cls((self.host, self.port), _Handler, workers=workers)
+        self.srv.set_app(app)
+        self.port = self.srv.server_port
+
+        def stop(signum, frame):
+            print(f"[서버] 종료 신호({signum}) 수신 — 처리 중인 요청을 마치고 종료합니다", flush=True)
+            # serve_forever()와 같은 스레드에서 shutdown()을 부르면 교착된다
+            threading.Thread(target=self.srv.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        print(f"[서버] http://{self.host}:{self.port} (요청 스레드 {workers}개)", flush=True)
+        try:
+            self.srv.serve_forever()
+        finally:
+            self.srv.server_close()
+            if on_shutdown:
+                on_shutdown()
+            print("[서버] 종료됨", flush=True)
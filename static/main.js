@@ -67,7 +67,7 @@ document.addEventListener("DOMContentLoaded", function () {
                         var progress = data.total_pages
                             ? Math.round(data.page / data.total_pages * 100)
                             : 0;
-                        syncBtn.textContent = "동기화 중... " + progress + "%";
+                        syncBtn.textContent = (data.resumed ? "이어서 동기화 중... " : "동기화 중... ") + progress + "%";
                         var countEl = document.getElementById("syncCount");
                         if (countEl) countEl.textContent = data.fetched;
                         setTimeout(pollSync, 2000);
@@ -83,6 +83,61 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // AI 검색: 요청을 넣고 결과를 폴링한다 (스크립트가 없으면 폼 POST로 동작)
+    var aiForm = document.querySelector(".ai-search-form");
+    if (aiForm) {
+        var aiBtn = aiForm.querySelector("button");
+        var aiJob = null;
+
+        aiForm.addEventListener("submit", function (e) {
+            e.preventDefault();
+            if (aiBtn.disabled) return;
+            aiBtn.disabled = true;
+            aiBtn.textContent = "해석 중...";
+
+            fetch("/api/ai-search/start", {
+                method: "POST",
+                headers: { "Content-Type": "application/x-www-form-urlencoded" },
+                body: new URLSearchParams(new FormData(aiForm)).toString(),
+            })
+                .then(function (r) { return r.json(); })
+                .then(handleAi);
+        });
+
+        function handleAi(data) {
+            if (data.url) {
+                location.href = data.url;
+            } else if (data.job) {
+                aiJob = data.job;
+                setTimeout(pollAi, 500);
+            } else {
+                aiJob = null;
+                alert(data.error || "AI 검색 오류");
+                aiBtn.disabled = false;
+                aiBtn.textContent = "AI 검색";
+            }
+        }
+
+        function pollAi() {
+            if (!aiJob) return;
+            fetch("/api/ai-search/status/" + aiJob)
+                .then(function (r) { return r.json(); })
+                .then(function (data) {
+                    if (data.done === false) {
+                        setTimeout(pollAi, 500);
+                    } else {
+                        aiJob = null;
+                        handleAi(data);
+                    }
+                });
+        }
+
+        // 결과를 기다리다 페이지를 떠나면 작업을 취소한다
+        window.addEventListener("pagehide", function () {
+            if (aiJob) navigator.sendBeacon("/api/ai-search/cancel/" + aiJob);
+        });
+    }
+
     // 저장 버튼
     var saveBtn = document.getElementById("saveBtn");
     if (saveBtn) {
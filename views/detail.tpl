@@ -57,7 +57,7 @@
 
     % if related:
     <div class="related-section">
-        <h3>같은 그룹의 활동 ({{len(related)}}건)</h3>
+        <h3>같은 그룹의 활동 ({{related_total}}건{{', %d건만 표시' % len(related) if related_total > len(related) else ''}})</h3>
         <div class="related-list">
             % for r in related:
             <a href="/activity/{{r['program_id']}}" class="related-card">
@@ -70,6 +70,21 @@
     </div>
     % end
 
+    % if similar:
+    <div class="related-section">
+        <h3>비슷한 활동 ({{len(similar)}}건)</h3>
+        <div class="related-list">
+            % for r in similar:
+            <a href="/activity/{{r['program_id']}}" class="related-card">
+                <span class="badge badge-status {{'badge-open' if r['recruit_status'] == '모집중' else 'badge-closed'}}">{{r['recruit_status']}}</span>
+                <span>{{r['title']}}</span>
+                <span class="related-period">{{r['period_start']}} ~ {{r['period_end']}}</span>
+            </a>
+            % end
+        </div>
+    </div>
+    % end
+
     <div class="reviews-section">
         <h3>리뷰
             % if stats and stats['count'] > 0:
@@ -113,6 +128,9 @@
                 <p class="review-content">{{review['content']}}</p>
             </div>
             % end
+            % if stats['count'] > len(reviews):
+            <p class="review-more">최근 리뷰 {{len(reviews)}}개만 표시합니다.</p>
+            % end
         </div>
         % else:
         <p class="empty-state">아직 리뷰가 없습니다.</p>
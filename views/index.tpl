@@ -115,16 +115,18 @@
 % if results is not None:
 <section class="results-section">
     <div class="results-header">
-        <span class="results-count">검색결과 <strong>{{total}}</strong>건</span>
+        <span class="results-count">검색결과 <strong>{{total}}</strong>개 묶음</span>
     </div>
 
-    % if groups:
-        % for group_key, items in groups.items():
-            % if len(items) > 1:
+    % if results:
+        % for group in results:
+            % if group['member_count'] > 1:
+            % items = members.get(group['group_key'], [])
             <div class="group-card">
                 <div class="group-header">
-                    <span class="group-badge">{{len(items)}}건 묶음</span>
-                    <span class="group-title">{{group_key}}</span>
+                    <span class="group-badge">{{group['member_count']}}건 묶음</span>
+                    <span class="group-title">{{group['group_key']}}</span>
+                    <span class="group-summary">모집중 {{group['open_count']}}건 · {{group['min_period']}} ~ {{group['max_period']}}</span>
                 </div>
                 <div class="group-items">
                     % for act in items:
@@ -145,10 +147,13 @@
                             </div>
                         </a>
                     % end
+                    % if group['member_count'] > len(items):
+                        <a href="/activity/{{group['program_id']}}" class="group-more">외 {{group['member_count'] - len(items)}}건 더 보기</a>
+                    % end
                 </div>
             </div>
             % else:
-                % act = items[0]
+                % act = group
                 <a href="/activity/{{act['program_id']}}" class="activity-card">
                     <div class="card-badges">
                         <span class="badge badge-status {{'badge-open' if act['recruit_status'] == '모집중' else 'badge-closed'}}">{{act['recruit_status']}}</span>
@@ -171,27 +176,19 @@
         <div class="empty-state">검색 결과가 없습니다.</div>
     % end
 
-    % if total > 10:
+    % if next_cursor or prev_cursor:
     <div class="pagination">
-        <%
-        per_page = 10
-        pages = (total + per_page - 1) // per_page
-        %>
-        % current = page
         % import urllib.parse as _up
         <%
         base_params = {k: v for k, v in filters.items() if v}
+        pages = (total + 9) // 10 if total else 0
         %>
-        % for p in range(1, min(pages + 1, 20)):
-            <%
-            base_params['page'] = str(p)
-            qs = _up.urlencode(base_params)
-            %>
-            % if p == current:
-                <span class="page-btn active">{{p}}</span>
-            % else:
-                <a href="/search?{{qs}}" class="page-btn">{{p}}</a>
-            % end
+        % if prev_cursor:
+            <a href="/search?{{_up.urlencode(dict(base_params, cursor=prev_cursor))}}" class="page-btn">이전</a>
+        % end
+        <span class="page-btn active">{{page}}{{' / %d' % pages if pages else ''}}</span>
+        % if next_cursor:
+            <a href="/search?{{_up.urlencode(dict(base_params, cursor=next_cursor))}}" class="page-btn">다음</a>
         % end
     </div>
     % end